@@ -1,10 +1,27 @@
-from flask import Blueprint, render_template, redirect, url_for, flash, request
+from datetime import datetime, timedelta
+from flask import (
+    Blueprint,
+    render_template,
+    redirect,
+    url_for,
+    flash,
+    request,
+    current_app,
+    stream_with_context,
+    jsonify,
+)
 from flask_login import login_required, current_user
 from app.models.user import User
 from app.auth.forms import CreateUserForm
 from app.extensions import db
 from app.admin.utils import generate_temp_password, send_welcome_email
 from app.auth.decorators import admin_required
+from app.errors.exceptions import ValidationError
+from app.services.blob_storage import BlobStorageService
+from app.services.bulk_export import bulk_export_query, stream_transcript_archive
+from app.services.fair_scheduler import get_fair_scheduler
+from app.services.rate_limiter import speech_rate_limiter
+from app.services.circuit_breaker import circuit_health
 import logging
 
 logger = logging.getLogger(__name__)
@@ -151,3 +168,80 @@ def reset_password(user_id):
         "success",
     )
     return redirect(url_for("admin.user_list"))
+
+
+def _parse_date(name):
+    value = request.args.get(name, "").strip()
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        raise ValidationError(f"{name} must be a date (YYYY-MM-DD)", field=name)
+
+
+@admin_bp.route("/exports/transcripts")
+@login_required
+@admin_required
+def export_transcripts():
+    """Stream a ZIP archive of every transcript matching the filters"""
+    date_from = _parse_date("date_from")
+    date_to = _parse_date("date_to")
+    if date_to:
+        date_to += timedelta(days=1)
+    files = bulk_export_query(
+        date_from=date_from,
+        date_to=date_to,
+        status=request.args.get("status", "completed") or None,
+        model=request.args.get("model") or None,
+    ).yield_per(100)
+    blob_service = BlobStorageService(
+        connection_string=current_app.config["AZURE_STORAGE_CONNECTION_STRING"],
+        container_name=current_app.config["AZURE_STORAGE_CONTAINER"],
+    )
+    archive = stream_transcript_archive(
+        blob_service,
+        files,
+        include_audio=bool(request.args.get("include_audio")),
+        workers=current_app.config["BULK_EXPORT_WORKERS"],
+        chunk_size=current_app.config["BULK_EXPORT_CHUNK_BYTES"],
+    )
+    logger.info(f"User {current_user.username} started a bulk transcript export")
+    response = current_app.response_class(
+        stream_with_context(archive), mimetype="application/zip"
+    )
+    filename = f"transcripts-{datetime.utcnow().strftime('%Y%m%d-%H%M%S')}.zip"
+    response.headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
+@admin_bp.route("/capacity")
+@login_required
+@admin_required
+def transcription_capacity():
+    """Azure Speech job capacity and the depth of the transcription queue"""
+    scheduler = get_fair_scheduler(current_app)
+    if scheduler is None:
+        return jsonify({"enabled": False})
+    return jsonify(dict(scheduler.capacity(), enabled=True))
+
+
+@admin_bp.route("/rate-limits")
+@login_required
+@admin_required
+def speech_rate_limits():
+    """Calls, waits and throttling seen by the shared Speech API rate limit"""
+    subscription_key = current_app.config["AZURE_SPEECH_KEY"]
+    region = current_app.config["AZURE_SPEECH_REGION"]
+    if not subscription_key or not region:
+        return jsonify({"enabled": False})
+    limiter = speech_rate_limiter(current_app, subscription_key, region)
+    return jsonify(dict(limiter.metrics(), enabled=True))
+
+
+@admin_bp.route("/circuits")
+@login_required
+@admin_required
+def circuit_breakers():
+    """State, rolling window and counters of the Azure circuit breakers"""
+    return jsonify(circuit_health(current_app))
@@ -80,6 +80,13 @@ class TranscriptionError(ServiceError):
     error_code = "transcription_error"
 
 
+class RateLimitError(ServiceError):
+    """Exception raised when a call would exceed an external rate limit."""
+
+    status_code = 429
+    error_code = "rate_limited"
+
+
 class DatabaseError(AppError):
     """Exception raised for database errors."""
 
@@ -2,6 +2,7 @@ import logging
 import functools
 import traceback
 import time
+import random
 from datetime import datetime
 from app.errors.exceptions import ServiceError
 from app.errors.logger import log_exception
@@ -9,7 +10,9 @@ from app.errors.logger import log_exception
 logger = logging.getLogger("app.services")
 
 
-def retry_on_error(max_retries=3, retry_delay=1, exceptions=(Exception,), logger=None):
+def retry_on_error(
+    max_retries=3, retry_delay=1, exceptions=(Exception,), logger=None, jitter=0.2
+):
     """
     Decorator to retry a function on specific exceptions.
 
@@ -18,6 +21,11 @@ def retry_on_error(max_retries=3, retry_delay=1, exceptions=(Exception,), logger
         retry_delay: Initial delay between retries in seconds (doubles with each retry)
         exceptions: Tuple of exceptions to catch and retry on
         logger: Logger to use (defaults to app.services)
+        jitter: Up to this fraction of each delay is added at random, so
+            callers that failed together do not retry together
+
+    An AppError carrying retry_after in its payload (e.g. from a 429's
+    Retry-After header) waits at least that long before the next attempt.
 
     Returns:
         Decorator function
@@ -42,7 +50,9 @@ def retry_on_error(max_retries=3, retry_delay=1, exceptions=(Exception,), logger
                         logger.warning(
                             f"Retry {retry_count}/{max_retries} for {func.__name__} due to: {str(e)}"
                         )
-                        time.sleep(delay)
+                        payload = getattr(e, "payload", None) or {}
+                        wait = max(delay, payload.get("retry_after") or 0)
+                        time.sleep(wait * (1 + random.uniform(0, jitter)))
                         delay *= 2
                     else:
                         logger.error(
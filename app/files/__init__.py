@@ -3,3 +3,4 @@ from flask import Blueprint
 files_bp = Blueprint("files", __name__)
 from app.files.routes import *
 from app.files.progress import *
+from app.files.audio import *
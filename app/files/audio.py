@@ -0,0 +1,206 @@
+import os
+import json
+import time
+import logging
+import threading
+from flask import Response, current_app, request
+from flask_login import login_required, current_user
+from app.extensions import db
+from app.files import files_bp
+from app.models.file import File
+from app.services.blob_storage import (
+    BlobStorageService,
+    blob_path_from_url,
+    content_type_for,
+)
+from app.services.audio_cache import get_segment_cache
+from app.services.redis_client import get_redis
+from app.errors.exceptions import ResourceNotFoundError, AuthorizationError
+from app.auth.decorators import approval_required
+
+logger = logging.getLogger(__name__)
+AUDIO_GRANT_KEY_PREFIX = "audio_grant"
+# Process-local grants when Redis is not configured: key -> (grant, expiry)
+_local_grants = {}
+_local_grants_lock = threading.Lock()
+
+
+def _grant_key(user_id, file_id):
+    return f"{AUDIO_GRANT_KEY_PREFIX}:{user_id}:{file_id}"
+
+
+def _load_grant(key):
+    redis = get_redis(current_app)
+    if redis is None:
+        with _local_grants_lock:
+            grant, expires = _local_grants.get(key, (None, 0))
+        return grant if expires > time.monotonic() else None
+    try:
+        value = redis.get(key)
+    except Exception as e:
+        logger.warning(f"Could not read audio grant: {str(e)}")
+        return None
+    return json.loads(value) if value else None
+
+
+def _store_grant(key, grant):
+    ttl = current_app.config["AUDIO_GRANT_TTL"]
+    redis = get_redis(current_app)
+    if redis is None:
+        now = time.monotonic()
+        with _local_grants_lock:
+            if len(_local_grants) >= 1024:
+                for stale in [k for k, (_, exp) in _local_grants.items() if exp <= now]:
+                    del _local_grants[stale]
+            _local_grants[key] = (grant, now + ttl)
+        return
+    try:
+        redis.set(key, json.dumps(grant), ex=ttl)
+    except Exception as e:
+        logger.warning(f"Could not store audio grant: {str(e)}")
+
+
+def revoke_audio_grant(user_id, file_id):
+    """Forget a file's audio grant, e.g. once the file is deleted."""
+    key = _grant_key(user_id, file_id)
+    redis = get_redis(current_app)
+    if redis is None:
+        with _local_grants_lock:
+            _local_grants.pop(key, None)
+        return
+    try:
+        redis.delete(key)
+    except Exception as e:
+        logger.warning(f"Could not revoke audio grant: {str(e)}")
+
+
+def _audio_grant(file_id):
+    """
+    Resolve the audio blob for a file. Ownership is checked against the
+    database on first play and the result kept server-side for
+    AUDIO_GRANT_TTL seconds, so the range requests that follow skip the
+    lookup without growing the session cookie.
+    """
+    key = _grant_key(current_user.id, file_id)
+    grant = _load_grant(key)
+    if grant is not None:
+        return grant
+    file = db.session.query(File).filter(File.id == file_id).first()
+    if file is None or not file.blob_url:
+        raise ResourceNotFoundError(f"Audio for file with ID {file_id} not found")
+    if file.user_id != current_user.id:
+        raise AuthorizationError("You do not have permission to play this file.")
+    grant = {
+        "blob_path": blob_path_from_url(
+            file.blob_url, current_app.config["AZURE_STORAGE_CONTAINER"]
+        ),
+        "filename": file.filename,
+    }
+    _store_grant(key, grant)
+    return grant
+
+
+class _SegmentReader:
+    """Reads fixed-size blob segments through the local segment cache."""
+
+    def __init__(self, app, blob_path):
+        self.blob_path = blob_path
+        self.cache = get_segment_cache(app)
+        self.segment_size = self.cache.segment_size
+        self._connection_string = app.config["AZURE_STORAGE_CONNECTION_STRING"]
+        self._container_name = app.config["AZURE_STORAGE_CONTAINER"]
+        self._blob_service = None
+
+    @property
+    def blob_service(self):
+        if self._blob_service is None:
+            self._blob_service = BlobStorageService(
+                connection_string=self._connection_string,
+                container_name=self._container_name,
+            )
+        return self._blob_service
+
+    def meta(self):
+        meta = self.cache.get_meta(self.blob_path)
+        if meta is None:
+            meta = self.blob_service.get_blob_properties(self.blob_path)
+            self.cache.put_meta(self.blob_path, meta)
+        return meta
+
+    def segment(self, index, size, version):
+        data = self.cache.get(self.blob_path, index, version)
+        if data is None:
+            offset = index * self.segment_size
+            length = min(self.segment_size, size - offset)
+            data = self.blob_service.download_range(self.blob_path, offset, length)
+            self.cache.put(self.blob_path, index, data, version)
+        return data
+
+    def iter_range(self, start, stop, size, version):
+        for index in range(
+            start // self.segment_size, (stop - 1) // self.segment_size + 1
+        ):
+            segment_start = index * self.segment_size
+            data = self.segment(index, size, version)
+            yield data[max(start - segment_start, 0) : stop - segment_start]
+
+
+@files_bp.route("/files/<file_id>/audio")
+@login_required
+@approval_required
+def stream_audio(file_id):
+    """
+    Stream a file's audio with HTTP Range support.
+
+    Ranges are served from fixed-size segments cached on local disk, so
+    seeking only touches the segments around the new position and keeps
+    working after the upload's SAS URL has expired.
+    """
+    grant = _audio_grant(file_id)
+    app = current_app._get_current_object()
+    reader = _SegmentReader(app, grant["blob_path"])
+    meta = reader.meta()
+    size = meta["size"]
+    etag = meta.get("etag")
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Cache-Control": f"private, max-age={app.config['AUDIO_CACHE_MAX_AGE']}",
+    }
+    if etag:
+        headers["ETag"] = f'"{etag}"'
+    if request.args.get("download"):
+        headers["Content-Disposition"] = (
+            f'attachment; filename="{os.path.basename(grant["filename"])}"'
+        )
+    content_type = content_type_for(grant["filename"])
+    if content_type == "application/octet-stream":
+        content_type = meta.get("content_type", content_type)
+    byte_range = request.range
+    # RFC 9110 lets a server ignore a Range it will not serve, so a
+    # multi-range request gets the whole body rather than a 416
+    if byte_range is not None and len(byte_range.ranges) != 1:
+        byte_range = None
+    if byte_range is not None:
+        bounds = byte_range.range_for_length(size)
+        if bounds is None:
+            headers["Content-Range"] = f"bytes */{size}"
+            return Response(status=416, headers=headers)
+        start, stop = bounds
+        stop = min(stop, start + app.config["AUDIO_MAX_RANGE_BYTES"])
+        headers["Content-Range"] = f"bytes {start}-{stop - 1}/{size}"
+        status = 206
+    else:
+        if etag and request.if_none_match.contains(etag):
+            return Response(status=304, headers=headers)
+        start, stop = 0, size
+        status = 200
+    headers["Content-Length"] = str(stop - start)
+    if stop <= start:
+        return Response(status=status, headers=headers, content_type=content_type)
+    return Response(
+        reader.iter_range(start, stop, size, etag or ""),
+        status=status,
+        headers=headers,
+        content_type=content_type,
+        direct_passthrough=True,
+    )
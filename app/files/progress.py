@@ -2,8 +2,9 @@ import os
 import time
 import logging
 from flask import jsonify, url_for, current_app
+from flask_login import login_required, current_user
 from app.files import files_bp
-from app.tasks.upload_tasks import UploadProgressTracker
+from app.tasks.upload_tasks import UploadProgressTracker, batch_key
 from app.services.blob_storage import BlobStorageService
 from celery.result import AsyncResult
 from app.errors.exceptions import ResourceNotFoundError, ServiceError, ValidationError
@@ -133,6 +134,71 @@ def upload_progress(upload_id):
         return (jsonify({"status": "error", "error": f"Server error: {str(e)}"}), 500)
 
 
+def _upload_summary(upload_id, filename, progress_info):
+    """Condense one upload's tracked progress into a status line for the upload page"""
+    summary = {
+        "upload_id": upload_id,
+        "filename": filename,
+        "status": "uploading",
+        "progress": 0,
+        "stage": "azure_pending",
+    }
+    if not progress_info:
+        return summary
+    status = progress_info.get("status")
+    if status == "error":
+        summary["status"] = "error"
+        summary["error"] = progress_info.get("error", "Unknown error during upload")
+    elif status == "completed":
+        file_id = progress_info.get("file_id")
+        summary.update(
+            {
+                "status": "completed",
+                "progress": 100,
+                "stage": "complete",
+                "file_id": file_id,
+                "redirect_url": (
+                    url_for("files.file_detail", file_id=file_id)
+                    if file_id
+                    else url_for("files.file_list")
+                ),
+            }
+        )
+    elif progress_info.get("azure_status") != "pending":
+        summary["progress"] = progress_info.get("progress", 0)
+        summary["stage"] = progress_info.get("stage", "azure_upload")
+    return summary
+
+
+@files_bp.route("/upload/batch/<batch_id>/progress")
+@login_required
+def upload_batch_progress(batch_id):
+    """Progress of every upload in a batch, so one poller serves the whole queue"""
+    try:
+        progress_tracker = UploadProgressTracker(current_app._get_current_object())
+        entries = progress_tracker.get_batch_progress(
+            batch_key(current_user.id, batch_id)
+        )
+    except Exception as e:
+        log_exception(e, logger)
+        return ({"status": "error", "error": f"Server error: {str(e)}"}, 500)
+    if not entries:
+        return ({"status": "error", "error": f"Upload batch {batch_id} not found"}, 404)
+    uploads = [_upload_summary(*entry) for entry in entries]
+    completed = sum(1 for upload in uploads if upload["status"] == "completed")
+    failed = sum(1 for upload in uploads if upload["status"] == "error")
+    return jsonify(
+        {
+            "batch_id": batch_id,
+            "total": len(uploads),
+            "completed": completed,
+            "failed": failed,
+            "pending": len(uploads) - completed - failed,
+            "uploads": uploads,
+        }
+    )
+
+
 @files_bp.route("/task/status/<task_id>")
 @csrf.exempt
 def task_status(task_id):
@@ -15,13 +15,28 @@ from flask import (
 from flask_login import login_required, current_user
 from werkzeug.utils import secure_filename
 from urllib.parse import urlparse
+from celery import group
 from app.extensions import db, csrf
 from app.models.file import File
+from app.models.transcript_segment import TranscriptSegment
 from app.files import files_bp
-from app.tasks.transcription_tasks import transcribe_file
+from app.tasks.transcription_tasks import queue_transcription, end_pipeline
 from app.services.blob_storage import BlobStorageService
+from app.services.audio_cache import get_segment_cache
+from app.files.audio import revoke_audio_grant
+from app.services.audio_processing import estimate_audio_seconds
+from app.services.transcript_cache import get_transcript_cache
+from app.services.progress_store import get_progress_store, merge_live_progress
+from app.services.fair_scheduler import get_fair_scheduler
 from app.services.batch_transcription_service import BatchTranscriptionService
-from app.tasks.upload_tasks import upload_to_azure_task, UploadProgressTracker
+from app.services.rate_limiter import speech_rate_limiter
+from app.tasks.upload_tasks import (
+    upload_to_azure_task,
+    UploadProgressTracker,
+    prepare_submission_audio,
+    batch_key,
+    upload_blob_path,
+)
 from app.errors.exceptions import (
     ResourceNotFoundError,
     ServiceError,
@@ -31,6 +46,11 @@ from app.errors.exceptions import (
     UploadError,
 )
 from app.errors.logger import log_exception
+from app.services.transcript_artifacts import (
+    artifact_blob_path,
+    legacy_artifact_blob_path,
+    DERIVED_ARTIFACTS,
+)
 from app.auth.decorators import approval_required
 
 logger = logging.getLogger(__name__)
@@ -82,17 +102,42 @@ def start_transcription(file_id):
     model_name = request.form.get("model_name", "Default")
     model_locale = request.form.get("model_locale")
     if model_id:
+        if model_id != file.model_id:
+            # A job for another model must not be reused by the retry
+            file.transcription_id = None
         file.model_id = model_id
         file.model_name = model_name
     file.status = "processing"
     file.current_stage = "queued"
     file.progress_percent = 0.0
+    file.transcription_started_at = datetime.utcnow()
     db.session.commit()
-    result = transcribe_file.delay(file_id, model_locale=model_locale)
+    queue_transcription(
+        file_id,
+        current_user.id,
+        model_locale=model_locale,
+        estimated_seconds=file.estimated_seconds,
+    )
     flash("Transcription started", "success")
     return redirect(url_for("files.file_detail", file_id=file_id))
 
 
+def _shares_legacy_artifacts(file):
+    """
+    Whether another file maps to the same filename-keyed artifact paths, in
+    which case those legacy blobs may belong to it and must be kept.
+    """
+    base_name = os.path.splitext(os.path.basename(file.filename))[0]
+    others = (
+        db.session.query(File.filename)
+        .filter(File.id != file.id, File.filename.contains(base_name, autoescape=True))
+        .all()
+    )
+    return any(
+        os.path.splitext(os.path.basename(name))[0] == base_name for (name,) in others
+    )
+
+
 @files_bp.route("/delete/<file_id>", methods=["POST"])
 @login_required
 @approval_required
@@ -116,9 +161,20 @@ def delete_file(file_id):
                 container_name = current_app.config["AZURE_STORAGE_CONTAINER"]
                 blob_name = path.split(f"/{container_name}/")[-1].split("?")[0]
                 blob_service.delete_blob(blob_name)
+                get_segment_cache(current_app).invalidate(blob_name)
                 logger.info(f"Deleted audio blob: {blob_name}")
             except Exception as e:
                 logger.error(f"Error deleting audio blob: {str(e)}")
+        if file.submission_blob_url:
+            try:
+                parsed_url = urlparse(file.submission_blob_url)
+                path = parsed_url.path
+                container_name = current_app.config["AZURE_STORAGE_CONTAINER"]
+                blob_name = path.split(f"/{container_name}/")[-1].split("?")[0]
+                blob_service.delete_blob(blob_name)
+                logger.info(f"Deleted compacted audio blob: {blob_name}")
+            except Exception as e:
+                logger.error(f"Error deleting compacted audio blob: {str(e)}")
         if file.transcript_url:
             try:
                 parsed_url = urlparse(file.transcript_url)
@@ -129,8 +185,28 @@ def delete_file(file_id):
                 logger.info(f"Deleted transcript blob: {blob_name}")
             except Exception as e:
                 logger.error(f"Error deleting transcript blob: {str(e)}")
+        artifact_paths = [
+            artifact_blob_path(file.id, artifact) for artifact in DERIVED_ARTIFACTS
+        ]
+        if not _shares_legacy_artifacts(file):
+            artifact_paths += [
+                legacy_artifact_blob_path(file.filename, artifact)
+                for artifact in DERIVED_ARTIFACTS
+            ]
+        for artifact_path in artifact_paths:
+            try:
+                blob_service.delete_blob(artifact_path)
+            except Exception as e:
+                logger.error(f"Error deleting {artifact_path} blob: {str(e)}")
+        revoke_audio_grant(current_user.id, file_id)
+        db.session.query(TranscriptSegment).filter(
+            TranscriptSegment.file_id == file_id
+        ).delete(synchronize_session=False)
         db.session.delete(file)
         db.session.commit()
+        get_transcript_cache(current_app).invalidate(file_id)
+        # Drop it from the transcription queue or free its slot
+        end_pipeline(file_id)
         flash("File and associated transcription deleted successfully", "success")
     except Exception as e:
         db.session.rollback()
@@ -144,6 +220,31 @@ def delete_file(file_id):
     return redirect(url_for("files.file_list"))
 
 
+def _live_file_dicts(files):
+    """
+    Serialize files with their live progress, and with the estimated
+    queue_position of any waiting behind the fair-share scheduler.
+    """
+    file_dicts = merge_live_progress(
+        get_progress_store(current_app), [file.to_dict() for file in files]
+    )
+    queued = [
+        data
+        for data in file_dicts
+        if data.get("status") == "processing" and data.get("current_stage") == "queued"
+    ]
+    scheduler = get_fair_scheduler(current_app) if queued else None
+    if scheduler is not None:
+        try:
+            positions = scheduler.queue_positions(current_user.id)
+        except Exception as e:
+            logger.warning(f"Could not read queue positions: {str(e)}")
+            positions = {}
+        for data in queued:
+            data["queue_position"] = positions.get(data["id"])
+    return file_dicts
+
+
 @files_bp.route("/api/files")
 @login_required
 @approval_required
@@ -156,7 +257,7 @@ def api_file_list():
         .order_by(File.upload_time.desc())
         .all()
     )
-    return jsonify([file.to_dict() for file in files])
+    return jsonify(_live_file_dicts(files))
 
 
 @files_bp.route("/api/files/<file_id>")
@@ -173,7 +274,7 @@ def api_file_detail(file_id):
             jsonify({"error": "You do not have permission to view this file."}),
             403,
         )
-    return jsonify(file.to_dict())
+    return jsonify(_live_file_dicts([file])[0])
 
 
 @files_bp.route("/api/models")
@@ -197,7 +298,12 @@ def api_models():
                 ),
                 500,
             )
-        service = BatchTranscriptionService(subscription_key, region)
+        service = BatchTranscriptionService(
+            subscription_key,
+            region,
+            rate_limiter=speech_rate_limiter(current_app, subscription_key, region),
+            request_deadline=current_app.config["SPEECH_REQUEST_DEADLINE"],
+        )
         base_models = []
         try:
             base_models_response = service.list_models(model_type="base")
@@ -308,8 +414,8 @@ def upload():
         try:
             tmp_path = os.path.join(current_app.config["UPLOAD_FOLDER"], filename)
             file.save(tmp_path)
+            upload_id = str(uuid.uuid4())
             if request.headers.get("X-Requested-With") == "XMLHttpRequest":
-                upload_id = str(uuid.uuid4())
                 app = current_app._get_current_object()
                 progress_tracker = UploadProgressTracker(app)
                 try:
@@ -349,16 +455,30 @@ def upload():
                     ],
                     container_name=current_app.config["AZURE_STORAGE_CONTAINER"],
                 )
-                blob_url = blob_service.upload_file(tmp_path, filename, upload_id=None)
+                blob_url = blob_service.upload_file(
+                    tmp_path, upload_blob_path(upload_id, filename)
+                )
             except StorageError as e:
                 raise UploadError(f"Storage error: {str(e)}", filename=filename)
+            submission_blob_url, silence_map = prepare_submission_audio(
+                current_app._get_current_object(),
+                blob_service,
+                tmp_path,
+                filename,
+                upload_id,
+            )
+            estimated_seconds = estimate_audio_seconds(tmp_path)
             try:
                 file_record = File(
                     filename=filename,
+                    estimated_seconds=estimated_seconds,
                     blob_url=blob_url,
+                    submission_blob_url=submission_blob_url,
+                    silence_map=silence_map,
                     status="processing",
                     current_stage="queued",
                     progress_percent=0.0,
+                    transcription_started_at=datetime.utcnow(),
                     user_id=current_user.id,
                     model_id=model_id,
                     model_name=model_name if model_name else "Default",
@@ -373,9 +493,12 @@ def upload():
             except Exception as e:
                 logger.error(f"Error removing temporary file: {str(e)}")
             try:
-                from app.tasks.transcription_tasks import transcribe_file
-
-                transcribe_file.delay(file_record.id, model_locale=model_locale)
+                queue_transcription(
+                    file_record.id,
+                    current_user.id,
+                    model_locale=model_locale,
+                    estimated_seconds=estimated_seconds,
+                )
             except Exception as e:
                 log_exception(e, logger)
                 flash(
@@ -410,15 +533,25 @@ def upload():
 @login_required
 @approval_required
 def start_upload():
-    """Handle AJAX upload start"""
+    """
+    Handle AJAX upload start for one or more files.
+
+    Each file is saved locally under its own upload ID and registered in
+    the request's upload batch, then all Azure uploads are dispatched as a
+    single Celery group. The upload page polls the batch progress endpoint
+    for every file at once.
+    """
     if request.method == "POST":
         if "file" not in request.files:
             raise ValidationError("No file part in request", field="file")
-        file = request.files["file"]
-        if file.filename == "":
+        files = [file for file in request.files.getlist("file") if file.filename]
+        if not files:
             raise ValidationError("No file selected", field="file")
-        if not file.filename.lower().endswith((".mp3", ".wav")):
-            raise ValidationError("Only .MP3 and .WAV files are allowed", field="file")
+        for file in files:
+            if not file.filename.lower().endswith((".mp3", ".wav")):
+                raise ValidationError(
+                    "Only .MP3 and .WAV files are allowed", field="file"
+                )
         model_id = request.form.get("model_id")
         model_name = request.form.get("model_name")
         model_locale = request.form.get("model_locale")
@@ -426,42 +559,71 @@ def start_upload():
             logger.info(
                 f"Model selected - ID: {model_id}, Name: {model_name}, Locale: {model_locale}"
             )
-        filename = secure_filename(file.filename)
         try:
-            tmp_path = os.path.join(current_app.config["UPLOAD_FOLDER"], filename)
-            file.save(tmp_path)
-            upload_id = str(uuid.uuid4())
-            progress_tracker = UploadProgressTracker()
+            batch_id = request.form.get("batch_id") or str(uuid.uuid4())
             try:
-                progress_tracker.update_progress(
-                    upload_id,
-                    {
-                        "file_path": tmp_path,
-                        "filename": filename,
-                        "status": "local_complete",
-                        "azure_status": "pending",
-                        "progress": 0,
-                        "start_time": time.time(),
-                        "model_id": model_id,
-                        "model_name": model_name,
-                        "model_locale": model_locale,
-                    },
+                batch_id = str(uuid.UUID(batch_id))
+            except ValueError:
+                raise ValidationError("Invalid upload batch ID", field="batch_id")
+            progress_tracker = UploadProgressTracker()
+            uploads = []
+            signatures = []
+            for file in files:
+                filename = secure_filename(file.filename)
+                upload_id = str(uuid.uuid4())
+                # Unique local name, so files with the same name can upload together
+                tmp_path = os.path.join(
+                    current_app.config["UPLOAD_FOLDER"], f"{upload_id}_{filename}"
                 )
-            except Exception as e:
-                log_exception(e, logger)
-                logger.warning(f"Failed to update progress tracker: {str(e)}")
-            task_kwargs = {
-                "tmp_path": tmp_path,
-                "filename": filename,
-                "upload_id": upload_id,
-                "user_id": current_user.id,
-            }
-            if model_id:
-                task_kwargs["model_id"] = model_id
-                task_kwargs["model_name"] = model_name
-                task_kwargs["model_locale"] = model_locale
-            task = upload_to_azure_task.delay(**task_kwargs)
-            return jsonify({"upload_id": upload_id, "task_id": task.id})
+                file.save(tmp_path)
+                try:
+                    progress_tracker.update_progress(
+                        upload_id,
+                        {
+                            "file_path": tmp_path,
+                            "filename": filename,
+                            "status": "local_complete",
+                            "azure_status": "pending",
+                            "progress": 0,
+                            "start_time": time.time(),
+                            "model_id": model_id,
+                            "model_name": model_name,
+                            "model_locale": model_locale,
+                        },
+                    )
+                    progress_tracker.add_to_batch(
+                        batch_key(current_user.id, batch_id), upload_id, filename
+                    )
+                except Exception as e:
+                    log_exception(e, logger)
+                    logger.warning(f"Failed to update progress tracker: {str(e)}")
+                task_kwargs = {
+                    "tmp_path": tmp_path,
+                    "filename": filename,
+                    "upload_id": upload_id,
+                    "user_id": current_user.id,
+                }
+                if model_id:
+                    task_kwargs["model_id"] = model_id
+                    task_kwargs["model_name"] = model_name
+                    task_kwargs["model_locale"] = model_locale
+                signatures.append(upload_to_azure_task.s(**task_kwargs))
+                uploads.append({"upload_id": upload_id, "filename": filename})
+            result = group(signatures).apply_async()
+            for upload, task in zip(uploads, result.results):
+                upload["task_id"] = task.id
+            logger.info(
+                f"Dispatched {len(uploads)} upload(s) in batch {batch_id} as group {result.id}"
+            )
+            return jsonify(
+                {
+                    "batch_id": batch_id,
+                    "group_id": result.id,
+                    "uploads": uploads,
+                    "upload_id": uploads[0]["upload_id"],
+                    "task_id": uploads[0]["task_id"],
+                }
+            )
         except Exception as e:
             log_exception(e, logger)
             error_message = str(e)
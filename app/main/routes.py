@@ -1,8 +1,9 @@
-from flask import redirect, url_for
+from flask import redirect, url_for, current_app
 from flask_login import login_required
 from app.main import main_bp
 from app.extensions import csrf
 from app.auth.decorators import approval_required
+from app.services.circuit_breaker import circuit_health, CLOSED
 import logging
 
 logger = logging.getLogger(__name__)
@@ -18,5 +19,14 @@ def index():
 @main_bp.route("/health")
 @csrf.exempt
 def health():
-    """Health check endpoint"""
-    return {"status": "ok"}
+    """
+    Health check endpoint. Reports "degraded" while a dependency's circuit
+    is not closed, but still answers 200: the app itself is up and fails
+    fast until Azure recovers.
+    """
+    circuits = {
+        name: snapshot["state"]
+        for name, snapshot in circuit_health(current_app).items()
+    }
+    degraded = any(state != CLOSED for state in circuits.values())
+    return {"status": "degraded" if degraded else "ok", "circuits": circuits}
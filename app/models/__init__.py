@@ -1,3 +1,4 @@
 from app.extensions import db
 from app.models.file import File
 from app.models.user import User
+from app.models.transcript_segment import TranscriptSegment
@@ -14,9 +14,22 @@ class File(db.Model):
     progress_percent = db.Column(db.Float, default=0.0)
     stage_progress = db.Column(db.Float, default=0.0)
     blob_url = db.Column(db.String(512), nullable=True)
+    submission_blob_url = db.Column(db.String(512), nullable=True)
+    silence_map = db.Column(db.Text, nullable=True)
     transcript_url = db.Column(db.String(512), nullable=True)
+    transcript_hash = db.Column(db.String(64), nullable=True)
     transcription_id = db.Column(db.String(255), nullable=True)
+    # When the file last entered the transcription pipeline; recovery
+    # measures staleness from here rather than from the upload
+    transcription_started_at = db.Column(db.DateTime, nullable=True)
     duration_seconds = db.Column(db.String(50), nullable=True)
+    # Audio length known before transcription, used to order the queue
+    estimated_seconds = db.Column(db.Float, nullable=True)
+    # Summary of the stored transcript segments, written with them so the
+    # transcript window API needs no aggregate query. None until stored.
+    segment_count = db.Column(db.Integer, nullable=True)
+    segment_duration_ms = db.Column(db.Integer, nullable=True)
+    segment_longest_ms = db.Column(db.Integer, nullable=True)
     speaker_count = db.Column(db.String(10), nullable=True)
     accuracy_percent = db.Column(db.Float, nullable=True)
     user_id = db.Column(db.String(36), db.ForeignKey("users.id"), nullable=True)
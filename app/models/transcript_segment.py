@@ -0,0 +1,25 @@
+from app.extensions import db
+
+
+class TranscriptSegment(db.Model):
+    __tablename__ = "transcript_segments"
+    __table_args__ = (
+        db.UniqueConstraint(
+            "file_id", "position", name="uq_transcript_segment_position"
+        ),
+        db.Index("ix_transcript_segments_file_offset", "file_id", "offset_ms"),
+    )
+    id = db.Column(db.Integer, primary_key=True)
+    file_id = db.Column(
+        db.String(36), db.ForeignKey("files.id", ondelete="CASCADE"), nullable=False
+    )
+    position = db.Column(db.Integer, nullable=False)
+    offset_ms = db.Column(db.Integer, nullable=False)
+    duration_ms = db.Column(db.Integer, nullable=False, default=0)
+    speaker = db.Column(db.Integer, nullable=True)
+    text = db.Column(db.Text, nullable=True)
+    confidence = db.Column(db.Float, nullable=True)
+    words = db.Column(db.Text, nullable=True)
+
+    def __repr__(self):
+        return f"<TranscriptSegment(file_id='{self.file_id}', position={self.position}, offset_ms={self.offset_ms})>"
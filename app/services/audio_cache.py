@@ -0,0 +1,155 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class SegmentCache:
+    """
+    Bounded on-disk LRU cache of fixed-size audio segments.
+
+    Segments are stored one file per segment under a directory per blob and
+    version (its ETag), so several worker processes can share the cache and
+    a blob overwritten under the same name is never served from the old
+    bytes. Blob properties are cached for meta_max_age seconds, after which
+    a changed ETag is noticed. Recency is tracked with the file
+    modification time, which is bumped on every hit.
+    """
+
+    def __init__(self, cache_dir, max_bytes, segment_size, meta_max_age=3600):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.segment_size = segment_size
+        self.meta_max_age = meta_max_age
+        self._lock = threading.Lock()
+        self._approx_bytes = None
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _blob_dir(self, blob_path):
+        digest = hashlib.sha1(blob_path.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, digest)
+
+    def _segment_path(self, blob_path, index, version):
+        digest = hashlib.sha1(version.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self._blob_dir(blob_path), digest, f"{index}.seg")
+
+    def _write(self, path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as handle:
+            handle.write(data)
+        os.replace(tmp_path, path)
+
+    def get_meta(self, blob_path):
+        """
+        Return cached blob properties (size, content type, etag), or None
+        if they are missing or older than meta_max_age.
+        """
+        try:
+            with open(os.path.join(self._blob_dir(blob_path), "meta.json")) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - meta.pop("cached_at", 0) > self.meta_max_age:
+            return None
+        return meta
+
+    def put_meta(self, blob_path, meta):
+        try:
+            path = os.path.join(self._blob_dir(blob_path), "meta.json")
+            entry = dict(meta, cached_at=time.time())
+            self._write(path, json.dumps(entry).encode("utf-8"))
+        except OSError as e:
+            logger.warning(f"Could not cache metadata for {blob_path}: {str(e)}")
+
+    def get(self, blob_path, index, version=""):
+        path = self._segment_path(blob_path, index, version)
+        try:
+            with open(path, "rb") as handle:
+                data = handle.read()
+            os.utime(path)
+            return data
+        except OSError:
+            return None
+
+    def put(self, blob_path, index, data, version=""):
+        try:
+            self._write(self._segment_path(blob_path, index, version), data)
+        except OSError as e:
+            logger.warning(f"Could not cache segment {index} of {blob_path}: {str(e)}")
+            return
+        with self._lock:
+            if self._approx_bytes is None:
+                self._approx_bytes = self._scan()[0]
+            else:
+                self._approx_bytes += len(data)
+            if self._approx_bytes > self.max_bytes:
+                self._evict()
+
+    def invalidate(self, blob_path):
+        """Drop every cached version and segment of a blob."""
+        blob_dir = self._blob_dir(blob_path)
+        if not os.path.isdir(blob_dir):
+            return
+        shutil.rmtree(blob_dir, ignore_errors=True)
+        with self._lock:
+            self._approx_bytes = None
+
+    def _scan(self):
+        total = 0
+        entries = []
+        for root, _, names in os.walk(self.cache_dir):
+            for name in names:
+                if not name.endswith(".seg"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                total += stat.st_size
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return total, entries
+
+    def _evict(self):
+        """Delete least recently used segments until below 90% of the budget."""
+        started = time.time()
+        total, entries = self._scan()
+        target = self.max_bytes * 0.9
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+                removed += 1
+            except OSError:
+                continue
+        self._approx_bytes = total
+        logger.info(
+            f"Audio segment cache evicted {removed} segments in {time.time() - started:.2f}s ({total} bytes retained)"
+        )
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_segment_cache(app):
+    """Return the process-wide segment cache for an app's configuration."""
+    key = (
+        app.config["AUDIO_CACHE_DIR"],
+        app.config["AUDIO_CACHE_MAX_BYTES"],
+        app.config["AUDIO_SEGMENT_BYTES"],
+        app.config["AUDIO_CACHE_MAX_AGE"],
+    )
+    with _caches_lock:
+        if key not in _caches:
+            _caches[key] = SegmentCache(*key)
+        return _caches[key]
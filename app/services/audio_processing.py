@@ -0,0 +1,401 @@
+import bisect
+import os
+import json
+import logging
+import struct
+import wave
+import numpy as np
+from app.errors.exceptions import ValidationError
+
+logger = logging.getLogger(__name__)
+ANALYSIS_FRAME_MS = 30
+BLOCK_FRAMES = 2000
+TICKS_PER_MS = 10000
+PEAKS_MAGIC = b"PEAK"
+PEAKS_VERSION = 1
+PEAKS_BASE_SAMPLES = 512
+PEAKS_LEVEL_FACTOR = 4
+PEAKS_LEVELS = 4
+# Assumed bitrate (128 kbps) for compressed uploads, whose duration is not
+# read from a header
+COMPRESSED_BYTES_PER_SECOND = 16000
+
+
+def estimate_audio_seconds(path):
+    """
+    Duration of a local audio file in seconds: exact for WAV, from the
+    header, and estimated from the size for compressed formats. Returns
+    None if the file cannot be read.
+    """
+    try:
+        if path.lower().endswith(".wav"):
+            with wave.open(path, "rb") as wav_file:
+                return wav_file.getnframes() / float(wav_file.getframerate())
+        return os.path.getsize(path) / COMPRESSED_BYTES_PER_SECOND
+    except (OSError, EOFError, wave.Error) as e:
+        logger.warning(f"Could not estimate duration of {path}: {str(e)}")
+        return None
+
+
+def decode_pcm(raw, sample_width, channels):
+    """
+    Decode interleaved little-endian PCM bytes into a mono float32 array
+    normalised to [-1.0, 1.0].
+    """
+    if sample_width == 1:
+        samples = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128) / 128
+    elif sample_width == 2:
+        samples = np.frombuffer(raw, dtype="<i2").astype(np.float32) / 32768
+    elif sample_width == 3:
+        packed = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        values = packed[:, 0] | packed[:, 1] << 8 | packed[:, 2] << 16
+        values = np.where(values & 0x800000, values - 0x1000000, values)
+        samples = values.astype(np.float32) / 8388608
+    elif sample_width == 4:
+        samples = np.frombuffer(raw, dtype="<i4").astype(np.float32) / 2147483648
+    else:
+        raise ValidationError(
+            f"Unsupported PCM sample width: {sample_width} bytes", field="sample_width"
+        )
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1)
+    return samples
+
+
+def iter_pcm_blocks(wav_file, block_frames):
+    """
+    Yield (raw_bytes, mono_samples) blocks from an open wave.Wave_read
+    without loading the whole file into memory.
+    """
+    sample_width = wav_file.getsampwidth()
+    channels = wav_file.getnchannels()
+    while True:
+        raw = wav_file.readframes(block_frames)
+        if not raw:
+            break
+        yield raw, decode_pcm(raw, sample_width, channels)
+
+
+class SilenceMap:
+    """
+    Timestamp remap table between compacted audio and the original recording.
+
+    Each region records where a kept stretch of audio starts in the compacted
+    file, where it starts in the original file, and how long it is.
+    """
+
+    def __init__(self, regions, original_duration_ms):
+        self.regions = [tuple(int(v) for v in region) for region in regions]
+        self.original_duration_ms = int(original_duration_ms)
+        self._compact_starts = [region[0] for region in self.regions]
+
+    @property
+    def kept_ms(self):
+        return sum(region[2] for region in self.regions)
+
+    @property
+    def removed_ms(self):
+        return self.original_duration_ms - self.kept_ms
+
+    def to_original(self, compact_ms, is_end=False):
+        """
+        Map a compacted-audio offset back to original-audio time.
+
+        End offsets are resolved against the region they close rather than
+        the region that starts at the same compacted instant.
+        """
+        if not self.regions:
+            return compact_ms
+        if is_end:
+            index = bisect.bisect_left(self._compact_starts, compact_ms) - 1
+        else:
+            index = bisect.bisect_right(self._compact_starts, compact_ms) - 1
+        index = max(index, 0)
+        compact_start, original_start, length = self.regions[index]
+        delta = min(max(compact_ms - compact_start, 0), length)
+        return original_start + delta
+
+    def to_json(self):
+        return json.dumps(
+            {
+                "regions": [list(region) for region in self.regions],
+                "original_duration_ms": self.original_duration_ms,
+            }
+        )
+
+    @classmethod
+    def from_json(cls, value):
+        data = json.loads(value)
+        return cls(data.get("regions", []), data.get("original_duration_ms", 0))
+
+
+class SilenceDetector:
+    """
+    Energy-based voice activity detection over streamed PCM.
+
+    Frames whose RMS level is below the threshold are treated as silence;
+    only runs of silence longer than the minimum duration are removed, and
+    a little padding is kept around speech so word onsets are not clipped.
+    """
+
+    def __init__(
+        self,
+        threshold_dbfs=-45.0,
+        min_silence_ms=2000,
+        padding_ms=250,
+        mode="compact",
+        frame_ms=ANALYSIS_FRAME_MS,
+    ):
+        if mode not in ("trim", "compact"):
+            raise ValidationError(
+                f"Unsupported silence trimming mode: {mode}", field="mode"
+            )
+        self.threshold_dbfs = threshold_dbfs
+        self.min_silence_ms = min_silence_ms
+        self.padding_ms = padding_ms
+        self.mode = mode
+        self.frame_ms = frame_ms
+
+    def detect(self, path):
+        """
+        Scan a WAV file and return the list of (start_ms, end_ms) cuts to
+        remove, plus the original duration in milliseconds.
+        """
+        with wave.open(path, "rb") as wav_file:
+            sample_rate = wav_file.getframerate()
+            total_frames = wav_file.getnframes()
+            frame_len = max(int(sample_rate * self.frame_ms / 1000), 1)
+            threshold = 10 ** (self.threshold_dbfs / 20)
+            silent_flags = []
+            remainder = np.empty(0, dtype=np.float32)
+            for _, samples in iter_pcm_blocks(wav_file, frame_len * BLOCK_FRAMES):
+                if remainder.size:
+                    samples = np.concatenate((remainder, samples))
+                usable = samples.size // frame_len * frame_len
+                remainder = samples[usable:]
+                if not usable:
+                    continue
+                frames = samples[:usable].reshape(-1, frame_len)
+                rms = np.sqrt(np.mean(np.square(frames), axis=1))
+                silent_flags.append(rms < threshold)
+        duration_ms = int(total_frames * 1000 / sample_rate) if sample_rate else 0
+        if not silent_flags:
+            return [], duration_ms
+        cuts = self._silences_to_cuts(np.concatenate(silent_flags), duration_ms)
+        return cuts, duration_ms
+
+    def _silences_to_cuts(self, silent, duration_ms):
+        padded = np.concatenate(([False], silent, [False])).astype(np.int8)
+        edges = np.diff(padded)
+        run_starts = np.flatnonzero(edges == 1)
+        run_ends = np.flatnonzero(edges == -1)
+        cuts = []
+        for start_frame, end_frame in zip(run_starts, run_ends):
+            start_ms = int(start_frame) * self.frame_ms
+            end_ms = min(int(end_frame) * self.frame_ms, duration_ms)
+            is_leading = start_frame == 0
+            is_trailing = end_frame == silent.size
+            if self.mode == "trim" and not (is_leading or is_trailing):
+                continue
+            if end_ms - start_ms < self.min_silence_ms:
+                continue
+            cut_start = start_ms if is_leading else start_ms + self.padding_ms
+            cut_end = end_ms if is_trailing else end_ms - self.padding_ms
+            if cut_end > cut_start:
+                cuts.append((cut_start, cut_end))
+        return cuts
+
+    def compact(self, source_path, output_path):
+        """
+        Write a copy of source_path with long silences removed.
+
+        Returns:
+            SilenceMap describing the kept regions, or None when nothing
+            worth removing was found.
+        """
+        cuts, duration_ms = self.detect(source_path)
+        if not cuts:
+            return None
+        regions = []
+        compact_ms = 0
+        position_ms = 0
+        for cut_start, cut_end in cuts + [(duration_ms, duration_ms)]:
+            if cut_start > position_ms:
+                regions.append((compact_ms, position_ms, cut_start - position_ms))
+                compact_ms += cut_start - position_ms
+            position_ms = cut_end
+        if not regions:
+            logger.info(f"No speech detected in {source_path}; skipping compaction")
+            return None
+        with wave.open(source_path, "rb") as source, wave.open(
+            output_path, "wb"
+        ) as target:
+            target.setnchannels(source.getnchannels())
+            target.setsampwidth(source.getsampwidth())
+            target.setframerate(source.getframerate())
+            sample_rate = source.getframerate()
+            block_frames = sample_rate * self.frame_ms * BLOCK_FRAMES // 1000
+            for _, original_start, length in regions:
+                source.setpos(int(original_start * sample_rate / 1000))
+                remaining = int(length * sample_rate / 1000)
+                while remaining > 0:
+                    raw = source.readframes(min(block_frames, remaining))
+                    if not raw:
+                        break
+                    target.writeframes(raw)
+                    remaining -= min(block_frames, remaining)
+        silence_map = SilenceMap(regions, duration_ms)
+        logger.info(
+            f"Silence compaction removed {silence_map.removed_ms / 1000:.1f}s of {duration_ms / 1000:.1f}s ({len(cuts)} cuts)"
+        )
+        return silence_map
+
+
+class PeaksBuilder:
+    """
+    Accumulates min/max waveform peaks from streamed PCM at several zoom
+    levels.
+
+    Only the finest level is computed from samples; coarser levels are
+    reduced from it, so the audio is read exactly once.
+    """
+
+    def __init__(
+        self,
+        sample_rate,
+        base_samples=PEAKS_BASE_SAMPLES,
+        factor=PEAKS_LEVEL_FACTOR,
+        levels=PEAKS_LEVELS,
+    ):
+        self.sample_rate = sample_rate
+        self.base_samples = base_samples
+        self.factor = factor
+        self.levels = levels
+        self.total_samples = 0
+        self._mins = []
+        self._maxs = []
+        self._remainder = np.empty(0, dtype=np.float32)
+
+    def add(self, samples):
+        self.total_samples += samples.size
+        if self._remainder.size:
+            samples = np.concatenate((self._remainder, samples))
+        usable = samples.size // self.base_samples * self.base_samples
+        self._remainder = samples[usable:]
+        if usable:
+            frames = samples[:usable].reshape(-1, self.base_samples)
+            self._mins.append(frames.min(axis=1))
+            self._maxs.append(frames.max(axis=1))
+
+    def _finest(self):
+        mins = list(self._mins)
+        maxs = list(self._maxs)
+        if self._remainder.size:
+            mins.append(self._remainder.min(keepdims=True))
+            maxs.append(self._remainder.max(keepdims=True))
+        if not mins:
+            return np.empty(0, dtype=np.float32), np.empty(0, dtype=np.float32)
+        return np.concatenate(mins), np.concatenate(maxs)
+
+    def to_bytes(self):
+        """
+        Serialise all levels into the compact binary peaks format:
+
+        header  "PEAK", version (u16), sample rate (u32), total samples (u64),
+                level count (u16)
+        levels  samples per peak (u32), peak count (u32) for each level
+        data    interleaved int8 min/max pairs for each level, finest first
+        """
+        mins, maxs = self._finest()
+        level_headers = []
+        level_data = []
+        samples_per_peak = self.base_samples
+        for _ in range(self.levels):
+            pairs = np.empty(mins.size * 2, dtype=np.int8)
+            pairs[0::2] = np.clip(np.round(mins * 127), -127, 127)
+            pairs[1::2] = np.clip(np.round(maxs * 127), -127, 127)
+            level_headers.append(struct.pack("<II", samples_per_peak, mins.size))
+            level_data.append(pairs.tobytes())
+            if mins.size <= 1:
+                break
+            indices = np.arange(0, mins.size, self.factor)
+            mins = np.minimum.reduceat(mins, indices)
+            maxs = np.maximum.reduceat(maxs, indices)
+            samples_per_peak *= self.factor
+        header = struct.pack(
+            "<4sHIQH",
+            PEAKS_MAGIC,
+            PEAKS_VERSION,
+            self.sample_rate,
+            self.total_samples,
+            len(level_headers),
+        )
+        return header + b"".join(level_headers) + b"".join(level_data)
+
+
+def compute_waveform_peaks(stream):
+    """
+    Compute multi-level waveform peaks from a WAV file path or readable
+    stream in a single pass.
+
+    Returns:
+        bytes: peaks in the format described by PeaksBuilder.to_bytes
+    """
+    with wave.open(stream, "rb") as wav_file:
+        builder = PeaksBuilder(wav_file.getframerate())
+        block_frames = wav_file.getframerate() * 10
+        for _, samples in iter_pcm_blocks(wav_file, block_frames):
+            builder.add(samples)
+    return builder.to_bytes()
+
+
+def _iso_duration(milliseconds):
+    return f"PT{milliseconds / 1000:.2f}S"
+
+
+def _remap_timed_node(node, silence_map):
+    if "offsetMilliseconds" in node:
+        start = node["offsetMilliseconds"]
+        end = start + node.get("durationMilliseconds", 0)
+    elif "offsetInTicks" in node:
+        start = node["offsetInTicks"] / TICKS_PER_MS
+        end = start + node.get("durationInTicks", 0) / TICKS_PER_MS
+    else:
+        return
+    original_start = silence_map.to_original(start)
+    original_end = max(silence_map.to_original(end, is_end=True), original_start)
+    duration = original_end - original_start
+    if "offsetMilliseconds" in node:
+        node["offsetMilliseconds"] = int(original_start)
+        node["durationMilliseconds"] = int(duration)
+    if "offsetInTicks" in node:
+        node["offsetInTicks"] = float(original_start * TICKS_PER_MS)
+        node["durationInTicks"] = float(duration * TICKS_PER_MS)
+    if "offset" in node:
+        node["offset"] = _iso_duration(original_start)
+    if "duration" in node:
+        node["duration"] = _iso_duration(duration)
+
+
+def remap_transcript_offsets(result_json, silence_map):
+    """
+    Rewrite phrase and word offsets in an Azure batch transcription result
+    from compacted-audio time back to original-audio time, in place.
+    """
+    if not result_json or not silence_map:
+        return result_json
+    for phrase in result_json.get("recognizedPhrases", []):
+        _remap_timed_node(phrase, silence_map)
+        for best in phrase.get("nBest", []):
+            for word in best.get("words", []):
+                _remap_timed_node(word, silence_map)
+            for word in best.get("displayWords", []):
+                _remap_timed_node(word, silence_map)
+    original_ms = silence_map.original_duration_ms
+    if "durationMilliseconds" in result_json:
+        result_json["durationMilliseconds"] = original_ms
+    if "durationInTicks" in result_json:
+        result_json["durationInTicks"] = float(original_ms * TICKS_PER_MS)
+    if "duration" in result_json:
+        result_json["duration"] = _iso_duration(original_ms)
+    return result_json
@@ -1,25 +1,46 @@
 import os
 import time
 import json
+import random
 import datetime
 import requests
 from urllib.parse import urlparse
 import logging
 from datetime import timedelta
-from app.errors.exceptions import ValidationError, ServiceError, TranscriptionError
+from app.errors.exceptions import (
+    ValidationError,
+    ServiceError,
+    TranscriptionError,
+    RateLimitError,
+)
 from app.errors.logger import log_exception
+from app.services.rate_limiter import parse_retry_after
+from app.services.circuit_breaker import get_circuit_breaker, AZURE_SPEECH
 
 
 class BatchTranscriptionService:
     """
     A helper class that aligns with the official 2024-11-15 version of
     Azure Batch Transcription REST API, using simple requests calls.
+
+    Pass a RateLimiter to share one request budget between every process
+    using the same Speech key; request_deadline bounds how long a call may
+    wait on that budget and on 429 responses.
     """
 
-    def __init__(self, subscription_key, region, locale="en-AU"):
+    def __init__(
+        self,
+        subscription_key,
+        region,
+        locale="en-AU",
+        rate_limiter=None,
+        request_deadline=120,
+    ):
         self.subscription_key = subscription_key
         self.region = region
         self.locale = locale
+        self.rate_limiter = rate_limiter
+        self.request_deadline = request_deadline
         self.base_url = f"https://{region}.api.cognitive.microsoft.com/speechtotext"
         self.logger = logging.getLogger("app.services.transcription")
         if not subscription_key:
@@ -34,6 +55,56 @@ class BatchTranscriptionService:
             )
         self.logger.info(f"Initialized BatchTranscriptionService with region: {region}")
 
+    def _request(self, method, url, **kwargs):
+        """
+        Call the Speech API within the shared rate limit and circuit
+        breaker. While the breaker is open calls fail at once; network
+        errors and 5xx answers count against it.
+
+        A 429 pauses every caller of this key for its Retry-After period, or
+        an exponential backoff when the header is missing, and the call is
+        retried. Once the next attempt would pass request_deadline the 429
+        response is returned for the caller to report.
+        """
+        deadline = time.monotonic() + self.request_deadline
+        backoff = 1.0
+        breaker = get_circuit_breaker(AZURE_SPEECH)
+        while True:
+            breaker.check(TranscriptionError)
+            if self.rate_limiter is not None:
+                try:
+                    self.rate_limiter.acquire(deadline)
+                except RateLimitError as e:
+                    raise TranscriptionError(
+                        str(e),
+                        service="azure_speech",
+                        status_code=429,
+                        retry_after=e.payload.get("retry_after"),
+                    )
+            try:
+                response = requests.request(method, url, **kwargs)
+            except requests.exceptions.RequestException:
+                breaker.record(False)
+                raise
+            # Throttling is the rate limiter's job, so a 429 is not a failure
+            breaker.record(response.status_code < 500)
+            if response.status_code != 429:
+                return response
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if not retry_after:
+                # Missing, or "0", which would retry straight into the limit
+                retry_after = backoff
+                backoff = min(backoff * 2, 60)
+            if self.rate_limiter is not None:
+                self.rate_limiter.throttle(retry_after)
+            if time.monotonic() + retry_after > deadline:
+                return response
+            self.logger.warning(
+                f"Azure Speech API throttled {method} {url}; retrying in {retry_after:.1f}s"
+            )
+            if self.rate_limiter is None:
+                time.sleep(retry_after * (1 + random.uniform(0, 0.2)))
+
     def submit_transcription(
         self, audio_url, enable_diarization=True, model_id=None, locale="en-AU"
     ):
@@ -82,7 +153,9 @@ class BatchTranscriptionService:
         self.logger.info(f"Submitting transcription request to: {url}")
         self.logger.debug(f"Request payload: {json.dumps(data, indent=2)}")
         try:
-            response = requests.post(url, json=data, headers=headers, timeout=60)
+            response = self._request(
+                "POST", url, json=data, headers=headers, timeout=60
+            )
             if response.status_code not in (200, 201, 202):
                 try:
                     error_content = response.json()
@@ -143,7 +216,7 @@ class BatchTranscriptionService:
         )
         headers = {"Ocp-Apim-Subscription-Key": self.subscription_key}
         try:
-            resp = requests.get(url, headers=headers, timeout=60)
+            resp = self._request("GET", url, headers=headers, timeout=60)
             if resp.status_code != 200:
                 try:
                     error_content = resp.json()
@@ -201,7 +274,7 @@ class BatchTranscriptionService:
         files_url = f"{self.base_url}/transcriptions/{transcription_id}/files?api-version=2024-11-15"
         headers = {"Ocp-Apim-Subscription-Key": self.subscription_key}
         try:
-            resp = requests.get(files_url, headers=headers, timeout=60)
+            resp = self._request("GET", files_url, headers=headers, timeout=60)
             if resp.status_code != 200:
                 try:
                     error_content = resp.json()
@@ -333,7 +406,7 @@ class BatchTranscriptionService:
             self.logger.info(f"Retrieving {model_type} models from: {url}")
             headers = {"Ocp-Apim-Subscription-Key": self.subscription_key}
             try:
-                response = requests.get(url, headers=headers, timeout=60)
+                response = self._request("GET", url, headers=headers, timeout=60)
                 if response.status_code != 200:
                     try:
                         error_content = response.json()
@@ -10,14 +10,36 @@ from werkzeug.utils import secure_filename
 from datetime import datetime, timedelta
 import threading
 import json
-from urllib.parse import urlparse
+from urllib.parse import urlparse, unquote
+from azure.core.exceptions import ResourceNotFoundError as BlobNotFoundError
 import logging
 from app.errors.exceptions import StorageError, ValidationError
 from app.errors.service_helper import retry_on_error, log_service_call, ServiceBase
+from app.services.circuit_breaker import circuit_breaker, AZURE_STORAGE
 
 logger = logging.getLogger(__name__)
 
 
+def content_type_for(file_path):
+    """Pick a simple content type based on file extension."""
+    extension = os.path.splitext(file_path or "")[1].lower()
+    content_types = {
+        ".wav": "audio/wav",
+        ".mp3": "audio/mpeg",
+        ".json": "application/json",
+        ".txt": "text/plain",
+    }
+    return content_types.get(extension, "application/octet-stream")
+
+
+def blob_path_from_url(blob_url, container_name):
+    """Extract the blob path inside a container from a (SAS) blob URL."""
+    if not blob_url:
+        return None
+    path = urlparse(blob_url).path
+    return unquote(path.split(f"/{container_name}/", 1)[-1])
+
+
 class BlobStorageService(ServiceBase):
 
     def __init__(self, connection_string, container_name):
@@ -55,6 +77,7 @@ class BlobStorageService(ServiceBase):
             )
 
     @log_service_call("BlobStorage")
+    @circuit_breaker(AZURE_STORAGE, StorageError)
     @retry_on_error(max_retries=3, retry_delay=2, exceptions=(Exception,))
     def upload_file(self, file_path, blob_path, upload_id=None, progress_tracker=None):
         """
@@ -202,6 +225,7 @@ class BlobStorageService(ServiceBase):
             )
 
     @log_service_call("BlobStorage")
+    @circuit_breaker(AZURE_STORAGE, StorageError)
     @retry_on_error(max_retries=2, retry_delay=1)
     def download_file(self, blob_path, local_path):
         """Download a blob to local disk."""
@@ -227,6 +251,7 @@ class BlobStorageService(ServiceBase):
             )
 
     @log_service_call("BlobStorage")
+    @circuit_breaker(AZURE_STORAGE, StorageError)
     @retry_on_error(max_retries=3, retry_delay=1)
     def delete_blob(self, blob_path):
         """
@@ -259,6 +284,7 @@ class BlobStorageService(ServiceBase):
             )
 
     @log_service_call("BlobStorage")
+    @circuit_breaker(AZURE_STORAGE, StorageError)
     @retry_on_error(max_retries=3, retry_delay=1)
     def upload_bytes(self, data, blob_path, content_type=None):
         """
@@ -301,6 +327,109 @@ class BlobStorageService(ServiceBase):
                 container=self.container_name,
             )
 
+    @log_service_call("BlobStorage")
+    @circuit_breaker(AZURE_STORAGE, StorageError)
+    @retry_on_error(max_retries=2, retry_delay=1)
+    def download_bytes(self, blob_path):
+        """
+        Download a blob into memory.
+
+        Returns:
+            bytes: the blob content, or None if the blob does not exist
+        """
+        if not blob_path:
+            raise ValidationError("Blob path is required", field="blob_path")
+        try:
+            blob_client = self.blob_service_client.get_blob_client(
+                container=self.container_name, blob=blob_path
+            )
+            return blob_client.download_blob().readall()
+        except BlobNotFoundError:
+            return None
+        except Exception as e:
+            raise StorageError(
+                f"Error downloading blob: {str(e)}",
+                blob_path=blob_path,
+                container=self.container_name,
+            )
+
+    @log_service_call("BlobStorage")
+    @circuit_breaker(AZURE_STORAGE, StorageError)
+    @retry_on_error(max_retries=2, retry_delay=1)
+    def download_range(self, blob_path, offset, length):
+        """Download `length` bytes of a blob starting at `offset`."""
+        if not blob_path:
+            raise ValidationError("Blob path is required", field="blob_path")
+        try:
+            blob_client = self.blob_service_client.get_blob_client(
+                container=self.container_name, blob=blob_path
+            )
+            return blob_client.download_blob(offset=offset, length=length).readall()
+        except Exception as e:
+            raise StorageError(
+                f"Error downloading blob range: {str(e)}",
+                blob_path=blob_path,
+                offset=offset,
+                length=length,
+                container=self.container_name,
+            )
+
+    @log_service_call("BlobStorage")
+    @circuit_breaker(AZURE_STORAGE, StorageError)
+    @retry_on_error(max_retries=2, retry_delay=1)
+    def get_blob_properties(self, blob_path):
+        """
+        Fetch the size, content type and ETag of a blob.
+
+        Returns:
+            dict: {"size", "content_type", "etag"}
+        """
+        if not blob_path:
+            raise ValidationError("Blob path is required", field="blob_path")
+        try:
+            blob_client = self.blob_service_client.get_blob_client(
+                container=self.container_name, blob=blob_path
+            )
+            properties = blob_client.get_blob_properties()
+            return {
+                "size": properties.size,
+                "content_type": properties.content_settings.content_type
+                or self._get_content_type(blob_path),
+                "etag": (properties.etag or "").strip('"'),
+            }
+        except Exception as e:
+            raise StorageError(
+                f"Error reading blob properties: {str(e)}",
+                blob_path=blob_path,
+                container=self.container_name,
+            )
+
+    @circuit_breaker(AZURE_STORAGE, StorageError)
+    def open_blob_stream(self, blob_path):
+        """
+        Open a blob for sequential reading without buffering it in memory.
+
+        Returns:
+            StorageStreamDownloader: a file-like object exposing read(size)
+        """
+        if not blob_path:
+            raise ValidationError("Blob path is required", field="blob_path")
+        try:
+            blob_client = self.blob_service_client.get_blob_client(
+                container=self.container_name, blob=blob_path
+            )
+            return blob_client.download_blob()
+        except Exception as e:
+            raise StorageError(
+                f"Error opening blob stream: {str(e)}",
+                blob_path=blob_path,
+                container=self.container_name,
+            )
+
+    def blob_path_from_url(self, blob_url):
+        """Extract the blob path inside this container from a (SAS) blob URL."""
+        return blob_path_from_url(blob_url, self.container_name)
+
     def get_upload_progress(self, upload_id):
         """
         Return the current progress dict for a given upload_id
@@ -312,11 +441,4 @@ class BlobStorageService(ServiceBase):
 
     def _get_content_type(self, file_path):
         """Pick a simple content type based on file extension."""
-        extension = os.path.splitext(file_path)[1].lower()
-        content_types = {
-            ".wav": "audio/wav",
-            ".mp3": "audio/mpeg",
-            ".json": "application/json",
-            ".txt": "text/plain",
-        }
-        return content_types.get(extension, "application/octet-stream")
+        return content_type_for(file_path)
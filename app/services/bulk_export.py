@@ -0,0 +1,221 @@
+import os
+import json
+import queue
+import logging
+import threading
+import zipfile
+from collections import deque
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from app.extensions import db
+from app.models.file import File
+
+logger = logging.getLogger(__name__)
+_END = object()
+ZIP_EPOCH = datetime(1980, 1, 1)
+
+
+class _ZipBuffer:
+    """
+    Write-only, unseekable sink for zipfile. Without seek support zipfile
+    writes data descriptors after each entry, so the archive can be sent
+    as it is produced and drained after every write.
+    """
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+class _EntryFetch:
+    """
+    Fetch one archive entry on a worker thread into a small bounded queue,
+    so at most a few chunks per entry are held in memory at once.
+    """
+
+    def __init__(self, name, date_time, compress_type, open_chunks, cancelled, depth):
+        self.name = name
+        self.date_time = date_time
+        self.compress_type = compress_type
+        self.open_chunks = open_chunks
+        self.cancelled = cancelled
+        self.chunks = queue.Queue(maxsize=depth)
+
+    def _put(self, item):
+        while not self.cancelled.is_set():
+            try:
+                self.chunks.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def run(self):
+        try:
+            for chunk in self.open_chunks():
+                if not self._put(chunk):
+                    return
+            self._put(_END)
+        except Exception as e:
+            self._put(e)
+
+    def __iter__(self):
+        while True:
+            item = self.chunks.get()
+            if item is _END:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+
+def bulk_export_query(
+    date_from=None, date_to=None, status="completed", model=None, user_id=None
+):
+    """Files selected for a bulk export, oldest first."""
+    query = db.session.query(File)
+    if date_from:
+        query = query.filter(File.upload_time >= date_from)
+    if date_to:
+        query = query.filter(File.upload_time < date_to)
+    if status:
+        query = query.filter(File.status == status)
+    if model:
+        query = query.filter((File.model_name == model) | (File.model_id == model))
+    if user_id:
+        query = query.filter(File.user_id == user_id)
+    return query.order_by(File.upload_time, File.id)
+
+
+def _file_metadata(file):
+    return {
+        "id": file.id,
+        "filename": file.filename,
+        "upload_time": file.upload_time.isoformat() if file.upload_time else None,
+        "status": file.status,
+        "model_name": file.model_name,
+        "duration": file.duration_seconds,
+        "speaker_count": file.speaker_count,
+        "accuracy_percent": file.accuracy_percent,
+        "transcription_id": file.transcription_id,
+        "user_id": file.user_id,
+    }
+
+
+def stream_transcript_archive(
+    blob_service, files, include_audio=False, workers=8, chunk_size=4 * 1024 * 1024
+):
+    """
+    Generate a ZIP archive of transcripts (and optionally audio) as bytes
+    chunks, without temporary files.
+
+    Files are read lazily from the query, and blobs are fetched by a
+    bounded pool of worker threads a few entries ahead of the writer, each
+    into a bounded chunk queue. Memory therefore depends on the worker
+    count and chunk size, never on the number of files in the export.
+
+    Args:
+        blob_service: BlobStorageService for the transcript container
+        files: File query or iterable, in archive order
+        include_audio: also add each file's original audio
+        workers: concurrent blob fetches
+        chunk_size: read size for streamed blobs
+    """
+    cancelled = threading.Event()
+    buffer = _ZipBuffer()
+    archive = zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_DEFLATED)
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bulk-export")
+
+    def blob_chunks(blob_path):
+        def read():
+            stream = blob_service.open_blob_stream(blob_path)
+            while True:
+                chunk = stream.read(chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+
+        return read
+
+    def entries():
+        for file in files:
+            folder = f"{file.id}_{os.path.splitext(os.path.basename(file.filename))[0]}"
+            date_time = (file.upload_time or ZIP_EPOCH).timetuple()[:6]
+            metadata = json.dumps(_file_metadata(file), indent=2).encode("utf-8")
+            yield (
+                f"{folder}/metadata.json",
+                date_time,
+                zipfile.ZIP_DEFLATED,
+                lambda data=metadata: iter([data]),
+            )
+            if file.transcript_url:
+                yield (
+                    f"{folder}/transcript.json",
+                    date_time,
+                    zipfile.ZIP_DEFLATED,
+                    blob_chunks(blob_service.blob_path_from_url(file.transcript_url)),
+                )
+            if include_audio and file.blob_url:
+                yield (
+                    f"{folder}/{os.path.basename(file.filename)}",
+                    date_time,
+                    zipfile.ZIP_STORED,
+                    blob_chunks(blob_service.blob_path_from_url(file.blob_url)),
+                )
+
+    def write(fetch):
+        info = zipfile.ZipInfo(fetch.name, date_time=fetch.date_time)
+        info.compress_type = fetch.compress_type
+        try:
+            with archive.open(info, mode="w", force_zip64=True) as entry:
+                for chunk in fetch:
+                    entry.write(chunk)
+                    data = buffer.drain()
+                    if data:
+                        yield data
+        except Exception as e:
+            logger.error(f"Bulk export could not add {fetch.name}: {str(e)}")
+            error = zipfile.ZipInfo(
+                f"{fetch.name}.error.txt", date_time=fetch.date_time
+            )
+            archive.writestr(error, f"Could not export {fetch.name}: {str(e)}\n")
+        data = buffer.drain()
+        if data:
+            yield data
+
+    try:
+        pending = deque()
+        for name, date_time, compress_type, open_chunks in entries():
+            fetch = _EntryFetch(
+                name, date_time, compress_type, open_chunks, cancelled, depth=2
+            )
+            pool.submit(fetch.run)
+            pending.append(fetch)
+            while len(pending) > workers:
+                yield from write(pending.popleft())
+        while pending:
+            yield from write(pending.popleft())
+        archive.close()
+        data = buffer.drain()
+        if data:
+            yield data
+    finally:
+        # Unblock workers when the client disconnects mid-download
+        cancelled.set()
+        pool.shutdown(wait=False, cancel_futures=True)
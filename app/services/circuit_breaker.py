@@ -0,0 +1,392 @@
+import time
+import logging
+import functools
+import threading
+from flask import current_app, has_app_context
+from app.services.redis_client import get_redis
+from app.errors.exceptions import (
+    AppError,
+    ServiceError,
+    ValidationError,
+    ResourceNotFoundError,
+)
+
+logger = logging.getLogger(__name__)
+KEY_PREFIX = "circuit"
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+AZURE_STORAGE = "azure_storage"
+AZURE_SPEECH = "azure_speech"
+CIRCUIT_NAMES = (AZURE_STORAGE, AZURE_SPEECH)
+# Decide whether a call may go ahead. An open circuit turns half-open once
+# open_seconds have passed and lets max_probes calls through; a probe that
+# never reports back (its worker died) is replaced after open_seconds.
+ALLOW_SCRIPT = """
+local key = KEYS[1]
+local open_seconds, max_probes = tonumber(ARGV[1]), tonumber(ARGV[2])
+local clock = redis.call('time')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('hget', key, 'state') or 'closed'
+if state == 'closed' then
+    return {state, 1, '0'}
+end
+local elapsed = now - tonumber(redis.call('hget', key, 'opened_at') or '0')
+local probes = tonumber(redis.call('hget', key, 'probes') or '0')
+if elapsed >= open_seconds or (state == 'half_open' and probes < max_probes) then
+    if elapsed >= open_seconds then
+        probes = 0
+        redis.call('hset', key, 'opened_at', tostring(now))
+    end
+    redis.call('hset', key, 'state', 'half_open', 'probes', probes + 1)
+    return {'half_open', 1, '0'}
+end
+redis.call('hincrby', key, 'rejected', 1)
+return {state, 0, tostring(open_seconds - elapsed)}
+"""
+# Record a call's outcome. Closed circuits count outcomes in time buckets
+# and open once the failure ratio over the window is reached; a half-open
+# circuit closes on a successful probe and re-opens on a failed one.
+RECORD_SCRIPT = """
+local key, window = KEYS[1], KEYS[2]
+local success = tonumber(ARGV[1])
+local bucket_seconds, buckets = tonumber(ARGV[2]), tonumber(ARGV[3])
+local min_calls, failure_ratio = tonumber(ARGV[4]), tonumber(ARGV[5])
+local clock = redis.call('time')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('hget', key, 'state') or 'closed'
+redis.call('hincrby', key, 'calls', 1)
+if success == 0 then
+    redis.call('hincrby', key, 'failures', 1)
+end
+if state == 'half_open' then
+    redis.call('del', window)
+    if success == 1 then
+        redis.call('hset', key, 'state', 'closed', 'probes', 0)
+        return 'closed'
+    end
+    redis.call('hset', key, 'state', 'open', 'opened_at', tostring(now), 'probes', 0)
+    redis.call('hincrby', key, 'opened_count', 1)
+    return 'open'
+end
+if state == 'open' then
+    return state
+end
+local current = math.floor(now / bucket_seconds)
+redis.call('hincrby', window, current .. (success == 1 and ':ok' or ':fail'), 1)
+redis.call('pexpire', window, math.ceil(bucket_seconds * buckets * 2000))
+local calls, failures = 0, 0
+local fields = redis.call('hgetall', window)
+for i = 1, #fields, 2 do
+    local bucket, kind = string.match(fields[i], '^(%d+):(%a+)$')
+    if tonumber(bucket) <= current - buckets then
+        redis.call('hdel', window, fields[i])
+    else
+        calls = calls + tonumber(fields[i + 1])
+        if kind == 'fail' then
+            failures = failures + tonumber(fields[i + 1])
+        end
+    end
+end
+if calls >= min_calls and failures / calls >= failure_ratio then
+    redis.call('del', window)
+    redis.call('hset', key, 'state', 'open', 'opened_at', tostring(now), 'probes', 0)
+    redis.call('hincrby', key, 'opened_count', 1)
+    return 'open'
+end
+return 'closed'
+"""
+_local_state = {}
+_local_lock = threading.Lock()
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def is_dependency_failure(exc):
+    """
+    Whether an exception says the dependency is unhealthy. Bad input and
+    4xx answers such as a missing blob or job are the caller's problem and
+    leave the circuit alone; 408 and 429 still count as the service
+    struggling.
+    """
+    if isinstance(exc, (ValidationError, ResourceNotFoundError)):
+        return False
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        seen.add(id(exc))
+        if isinstance(exc, AppError):
+            status = exc.payload.get("status_code")
+        else:
+            status = getattr(exc, "status_code", None)
+        if isinstance(status, int) and 400 <= status < 500 and status not in (408, 429):
+            return False
+        exc = exc.__cause__ or exc.__context__
+    return True
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for one external dependency, shared through Redis so
+    every web process and worker trips and recovers together.
+
+    Outcomes are counted in buckets over a rolling window of window_seconds.
+    Once at least min_calls have been made in the window and failure_ratio
+    of them failed, the circuit opens and calls fail at once for
+    open_seconds instead of waiting out timeouts and retries. Then up to
+    half_open_probes calls are let through: a success closes the circuit
+    and a failure opens it again. Without Redis the state is process-local.
+    If Redis itself fails, calls are allowed.
+    """
+
+    def __init__(
+        self,
+        redis,
+        name,
+        window_seconds=60,
+        buckets=6,
+        min_calls=10,
+        failure_ratio=0.5,
+        open_seconds=30,
+        half_open_probes=1,
+    ):
+        self.redis = redis
+        self.name = name
+        self.bucket_seconds = window_seconds / buckets
+        self.buckets = buckets
+        self.min_calls = min_calls
+        self.failure_ratio = failure_ratio
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+        self.state_key = f"{KEY_PREFIX}:{name}:state"
+        self.window_key = f"{KEY_PREFIX}:{name}:window"
+
+    def _local(self):
+        return _local_state.setdefault(
+            self.name, {"state": CLOSED, "probes": 0, "opened_at": 0.0, "window": {}}
+        )
+
+    def _local_allow(self):
+        now = time.time()
+        with _local_lock:
+            entry = self._local()
+            if entry["state"] == CLOSED:
+                return CLOSED, True, 0.0
+            elapsed = now - entry["opened_at"]
+            if elapsed >= self.open_seconds or (
+                entry["state"] == HALF_OPEN and entry["probes"] < self.half_open_probes
+            ):
+                if elapsed >= self.open_seconds:
+                    entry.update(probes=0, opened_at=now)
+                entry["state"] = HALF_OPEN
+                entry["probes"] += 1
+                return HALF_OPEN, True, 0.0
+            entry["rejected"] = entry.get("rejected", 0) + 1
+            return entry["state"], False, self.open_seconds - elapsed
+
+    def _local_record(self, success):
+        now = time.time()
+        with _local_lock:
+            entry = self._local()
+            entry["calls"] = entry.get("calls", 0) + 1
+            if not success:
+                entry["failures"] = entry.get("failures", 0) + 1
+            if entry["state"] == HALF_OPEN:
+                entry["window"] = {}
+                if success:
+                    entry.update(state=CLOSED, probes=0)
+                    return CLOSED
+                entry.update(state=OPEN, opened_at=now, probes=0)
+                entry["opened_count"] = entry.get("opened_count", 0) + 1
+                return OPEN
+            if entry["state"] == OPEN:
+                return OPEN
+            current = int(now // self.bucket_seconds)
+            window = entry["window"]
+            counts = window.setdefault(current, [0, 0])
+            counts[0] += 1
+            counts[1] += 0 if success else 1
+            for bucket in [b for b in window if b <= current - self.buckets]:
+                del window[bucket]
+            calls = sum(c[0] for c in window.values())
+            failures = sum(c[1] for c in window.values())
+            if calls >= self.min_calls and failures / calls >= self.failure_ratio:
+                entry.update(state=OPEN, opened_at=now, probes=0, window={})
+                entry["opened_count"] = entry.get("opened_count", 0) + 1
+                return OPEN
+            return CLOSED
+
+    def allow(self):
+        """Return (state, allowed, retry_after seconds) for the next call."""
+        if self.redis is None:
+            return self._local_allow()
+        try:
+            state, allowed, retry_after = self.redis.eval(
+                ALLOW_SCRIPT,
+                1,
+                self.state_key,
+                self.open_seconds,
+                self.half_open_probes,
+            )
+        except Exception as e:
+            logger.warning(f"Circuit {self.name} unavailable: {str(e)}")
+            return CLOSED, True, 0.0
+        if isinstance(state, bytes):
+            state = state.decode("utf-8")
+        return state, bool(allowed), float(retry_after)
+
+    def record(self, success):
+        """Record a call's outcome, returning the circuit's state afterwards."""
+        if self.redis is None:
+            state = self._local_record(success)
+        else:
+            try:
+                state = self.redis.eval(
+                    RECORD_SCRIPT,
+                    2,
+                    self.state_key,
+                    self.window_key,
+                    1 if success else 0,
+                    self.bucket_seconds,
+                    self.buckets,
+                    self.min_calls,
+                    self.failure_ratio,
+                )
+            except Exception as e:
+                logger.warning(f"Could not record outcome for {self.name}: {str(e)}")
+                return CLOSED
+            if isinstance(state, bytes):
+                state = state.decode("utf-8")
+        if state == OPEN and not success:
+            logger.error(
+                f"Circuit {self.name} open; failing calls fast for {self.open_seconds}s"
+            )
+        return state
+
+    def check(self, error=ServiceError):
+        """Raise error, marked 503, if the circuit does not allow a call now."""
+        state, allowed, retry_after = self.allow()
+        if allowed:
+            return state
+        exc = error(
+            f"{self.name} is unavailable; failing fast while it recovers",
+            service=self.name,
+            circuit=state,
+            retry_after=round(retry_after, 1),
+        )
+        exc.status_code = 503
+        raise exc
+
+    def snapshot(self):
+        """Current state, the rolling window and lifetime counters."""
+        now = time.time()
+        current = int(now // self.bucket_seconds)
+        if self.redis is None:
+            with _local_lock:
+                entry = dict(self._local())
+                window = [
+                    (calls, failures)
+                    for bucket, (calls, failures) in entry.pop("window").items()
+                    if bucket > current - self.buckets
+                ]
+        else:
+            decode = lambda v: v.decode("utf-8") if isinstance(v, bytes) else v
+            entry = {
+                decode(k): decode(v)
+                for k, v in self.redis.hgetall(self.state_key).items()
+            }
+            window = []
+            for field, count in self.redis.hgetall(self.window_key).items():
+                bucket, kind = decode(field).split(":")
+                if int(bucket) > current - self.buckets:
+                    count = int(count)
+                    window.append((count, count if kind == "fail" else 0))
+        calls = sum(c[0] for c in window)
+        failures = sum(c[1] for c in window)
+        state = entry.get("state", CLOSED)
+        retry_after = 0.0
+        if state != CLOSED:
+            opened_at = float(entry.get("opened_at", 0))
+            retry_after = max(self.open_seconds - (now - opened_at), 0.0)
+        return {
+            "name": self.name,
+            "state": state,
+            "window_calls": calls,
+            "window_failures": failures,
+            "window_failure_ratio": round(failures / calls, 3) if calls else 0.0,
+            "retry_after": round(retry_after, 1),
+            "opened_count": int(entry.get("opened_count", 0)),
+            "rejected": int(entry.get("rejected", 0)),
+            "calls": int(entry.get("calls", 0)),
+            "failures": int(entry.get("failures", 0)),
+        }
+
+
+def get_circuit_breaker(name, app=None):
+    """
+    The breaker for a dependency, configured from the app's CIRCUIT_*
+    settings. Outside an app context it uses the defaults with
+    process-local state.
+    """
+    if app is None and has_app_context():
+        app = current_app._get_current_object()
+    cache_key = (name, id(app))
+    with _breakers_lock:
+        breaker = _breakers.get(cache_key)
+        if breaker is None:
+            if app is None:
+                breaker = CircuitBreaker(None, name)
+            else:
+                config = app.config
+                breaker = CircuitBreaker(
+                    get_redis(app),
+                    name,
+                    window_seconds=config["CIRCUIT_WINDOW_SECONDS"],
+                    min_calls=config["CIRCUIT_MIN_CALLS"],
+                    failure_ratio=config["CIRCUIT_FAILURE_RATIO"],
+                    open_seconds=config["CIRCUIT_OPEN_SECONDS"],
+                    half_open_probes=config["CIRCUIT_HALF_OPEN_PROBES"],
+                )
+            _breakers[cache_key] = breaker
+        return breaker
+
+
+def circuit_breaker(name, error=ServiceError):
+    """
+    Decorator failing calls fast with error while the named dependency's
+    circuit is open. Place it outside retry_on_error so an open circuit
+    skips the retries too; a call that exhausts its retries counts as one
+    failure.
+    """
+
+    def decorator(func):
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            breaker = get_circuit_breaker(name)
+            breaker.check(error)
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                breaker.record(not is_dependency_failure(e))
+                raise
+            breaker.record(True)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def circuit_open_error(exc):
+    """Whether exc was raised by an open circuit rather than a failed call."""
+    return isinstance(exc, AppError) and "circuit" in exc.payload
+
+
+def circuit_health(app):
+    """Snapshots of every dependency's circuit, keyed by name."""
+    health = {}
+    for name in CIRCUIT_NAMES:
+        try:
+            health[name] = get_circuit_breaker(name, app).snapshot()
+        except Exception as e:
+            logger.warning(f"Could not read circuit {name}: {str(e)}")
+            health[name] = {"name": name, "state": "unknown"}
+    return health
@@ -0,0 +1,52 @@
+import logging
+from contextlib import contextmanager
+from app.extensions import db
+from app.models.file import File
+from app.errors.exceptions import ResourceNotFoundError
+
+logger = logging.getLogger(__name__)
+
+
+@contextmanager
+def unit_of_work():
+    """
+    Run a short block of database work and give the connection back.
+
+    Commits when the block succeeds and rolls back when it raises. Either
+    way the session is removed, so no connection or open transaction is
+    held while the caller goes on to wait on Azure. ORM objects loaded
+    inside the block are detached afterwards; copy out what is needed.
+    """
+    try:
+        yield db.session
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    finally:
+        db.session.remove()
+
+
+@contextmanager
+def file_unit(file_id):
+    """Load a file by id for one unit of work, raising if it is gone."""
+    with unit_of_work() as session:
+        file = session.get(File, file_id)
+        if file is None:
+            raise ResourceNotFoundError(f"File with ID {file_id} not found")
+        yield file
+
+
+def update_file(file_id, **values):
+    """Set columns on a file row in its own unit of work."""
+    with file_unit(file_id) as file:
+        for name, value in values.items():
+            setattr(file, name, value)
+
+
+def mark_file_error(file_id, message):
+    """Record a failed file, logging rather than raising if that fails too."""
+    try:
+        update_file(file_id, status="error", error_message=message)
+    except Exception as e:
+        logger.error(f"Could not record error state for file {file_id}: {str(e)}")
@@ -0,0 +1,263 @@
+import json
+import time
+import logging
+from app.services.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+KEY_PREFIX = "fair_share"
+# Queue a job for a user. A user is in the ring exactly while they have
+# pending jobs, so the first job of an idle user adds them to it.
+ENQUEUE_SCRIPT = """
+local prefix, user, file_id, job, score = ARGV[1], ARGV[2], ARGV[3], ARGV[4], ARGV[5]
+if redis.call('hsetnx', prefix .. ':jobs', file_id, job) == 0 then
+    return 0
+end
+local pending = prefix .. ':pending:' .. user
+redis.call('zadd', pending, score, file_id)
+if redis.call('zcard', pending) == 1 then
+    redis.call('rpush', prefix .. ':ring', user)
+end
+return 1
+"""
+# Take up to limit jobs while the Speech resource has free slots, in turns:
+# each turn every waiting user below their in-flight cap gets one job, and
+# within a turn the user whose next job scores lowest goes first. Users
+# served this turn are kept in a set, even if they leave and rejoin the
+# ring, so a user with many short jobs cannot come round again before the
+# others; the set is cleared once no unserved user is waiting. Served users
+# move to the back of the ring, which breaks score ties, and leave it when
+# their pending queue empties.
+TAKE_SCRIPT = """
+local prefix, limit, cap = ARGV[1], tonumber(ARGV[2]), tonumber(ARGV[3])
+local now, stale_before = tonumber(ARGV[4]), tonumber(ARGV[5])
+local resource, resource_cap = ARGV[6], tonumber(ARGV[7])
+local ring = prefix .. ':ring'
+local served = prefix .. ':served'
+local running = prefix .. ':resource:' .. resource
+redis.call('zremrangebyscore', running, '-inf', stale_before)
+limit = math.min(limit, resource_cap - redis.call('zcard', running))
+for _, user in ipairs(redis.call('lrange', ring, 0, -1)) do
+    local inflight = prefix .. ':inflight:' .. user
+    for _, stale in ipairs(redis.call('zrangebyscore', inflight, '-inf', stale_before)) do
+        redis.call('hdel', prefix .. ':jobs', stale)
+    end
+    redis.call('zremrangebyscore', inflight, '-inf', stale_before)
+end
+local taken = {}
+while #taken < limit do
+    local next_user, next_score = false, nil
+    local waiting = false
+    for _, user in ipairs(redis.call('lrange', ring, 0, -1)) do
+        if redis.call('zcard', prefix .. ':inflight:' .. user) < cap then
+            waiting = true
+            local head = redis.call('zrange', prefix .. ':pending:' .. user, 0, 0, 'withscores')
+            local score = tonumber(head[2])
+            if redis.call('sismember', served, user) == 0
+                and (next_score == nil or score < next_score) then
+                next_user, next_score = user, score
+            end
+        end
+    end
+    if not waiting then
+        break
+    end
+    if not next_user then
+        redis.call('del', served)
+    else
+        local pending = prefix .. ':pending:' .. next_user
+        local file_id = redis.call('zrange', pending, 0, 0)[1]
+        redis.call('zrem', pending, file_id)
+        redis.call('zadd', prefix .. ':inflight:' .. next_user, now, file_id)
+        redis.call('zadd', running, now, file_id)
+        table.insert(taken, redis.call('hget', prefix .. ':jobs', file_id))
+        redis.call('sadd', served, next_user)
+        redis.call('lrem', ring, 0, next_user)
+        if redis.call('zcard', pending) > 0 then
+            redis.call('rpush', ring, next_user)
+        end
+    end
+end
+return taken
+"""
+# Forget a job whether it is still pending or in flight
+REMOVE_SCRIPT = """
+local prefix, file_id, resource = ARGV[1], ARGV[2], ARGV[3]
+local job = redis.call('hget', prefix .. ':jobs', file_id)
+redis.call('zrem', prefix .. ':resource:' .. resource, file_id)
+if not job then
+    return 0
+end
+local user = cjson.decode(job)['user_id']
+local pending = prefix .. ':pending:' .. user
+redis.call('hdel', prefix .. ':jobs', file_id)
+redis.call('zrem', prefix .. ':inflight:' .. user, file_id)
+if redis.call('zrem', pending, file_id) > 0 and redis.call('zcard', pending) == 0 then
+    redis.call('lrem', prefix .. ':ring', 0, user)
+end
+return 1
+"""
+
+
+class FairScheduler:
+    """
+    Admission of transcriptions to Azure, kept in Redis so every web process
+    and worker sees the same queues.
+
+    Each user has a pending queue. Jobs are taken in turns that give every
+    waiting user one job, and a user with max_inflight jobs already running
+    is skipped until one finishes, so a bulk import queues behind its own
+    cap instead of ahead of everyone else's uploads. Nothing is taken while the Speech resource
+    already has resource_max_inflight jobs, which keeps submissions within
+    its concurrent job limit.
+
+    Shorter audio goes first: jobs are scored by enqueue time plus
+    duration_weight seconds per second of audio. A user's queue is taken in
+    score order, and within a turn users are served by the score of their
+    next job, so a short upload is not held behind another user's long one.
+    Scores are fixed when a job is queued, so a long file is only overtaken
+    by jobs queued within duration_weight times its length after it, and
+    cannot starve. In-flight entries older than inflight_ttl are assumed
+    lost and stop counting.
+    """
+
+    def __init__(
+        self,
+        redis,
+        max_inflight=3,
+        inflight_ttl=4 * 3600,
+        resource="default",
+        resource_max_inflight=20,
+        duration_weight=1.0,
+        default_seconds=600,
+    ):
+        self.redis = redis
+        self.max_inflight = max_inflight
+        self.inflight_ttl = inflight_ttl
+        self.resource = resource
+        self.resource_max_inflight = resource_max_inflight
+        self.duration_weight = duration_weight
+        self.default_seconds = default_seconds
+
+    def _decode(self, value):
+        return value.decode("utf-8") if isinstance(value, bytes) else value
+
+    def enqueue(self, user_id, file_id, model_locale=None, estimated_seconds=None):
+        """Queue a file for a user; returns False if it is already queued."""
+        if estimated_seconds is None:
+            estimated_seconds = self.default_seconds
+        job = json.dumps(
+            {
+                "file_id": file_id,
+                "user_id": user_id,
+                "model_locale": model_locale,
+                "estimated_seconds": estimated_seconds,
+            }
+        )
+        score = time.time() + self.duration_weight * estimated_seconds
+        added = self.redis.eval(
+            ENQUEUE_SCRIPT, 0, KEY_PREFIX, user_id, file_id, job, score
+        )
+        return bool(added)
+
+    def take(self, limit=100):
+        """Mark up to limit jobs in flight and return them as dicts."""
+        now = time.time()
+        jobs = self.redis.eval(
+            TAKE_SCRIPT,
+            0,
+            KEY_PREFIX,
+            limit,
+            self.max_inflight,
+            now,
+            now - self.inflight_ttl,
+            self.resource,
+            self.resource_max_inflight,
+        )
+        return [json.loads(self._decode(job)) for job in jobs if job]
+
+    def remove(self, file_id):
+        """Free a job's in-flight slot, or drop it if it is still pending."""
+        return bool(
+            self.redis.eval(REMOVE_SCRIPT, 0, KEY_PREFIX, file_id, self.resource)
+        )
+
+    def is_pending(self, file_id):
+        """Whether a file is waiting in a user queue, not yet dispatched."""
+        job = self.redis.hget(f"{KEY_PREFIX}:jobs", file_id)
+        if job is None:
+            return False
+        user_id = json.loads(self._decode(job))["user_id"]
+        score = self.redis.zscore(f"{KEY_PREFIX}:inflight:{user_id}", file_id)
+        return score is None
+
+    def _pending_counts(self):
+        """{user_id: pending jobs} for every user with work waiting."""
+        users = [
+            self._decode(user)
+            for user in self.redis.lrange(f"{KEY_PREFIX}:ring", 0, -1)
+        ]
+        if not users:
+            return {}
+        pipe = self.redis.pipeline()
+        for user in users:
+            pipe.zcard(f"{KEY_PREFIX}:pending:{user}")
+        return dict(zip(users, pipe.execute()))
+
+    def queue_positions(self, user_id):
+        """
+        Estimated place in line of each of a user's pending files, as
+        {file_id: position} with 1 meaning next. A file that is n-th in its
+        user's queue waits for n turns of the ring, so every other user
+        with pending work contributes up to n jobs ahead of it.
+        """
+        pending = [
+            self._decode(file_id)
+            for file_id in self.redis.zrange(f"{KEY_PREFIX}:pending:{user_id}", 0, -1)
+        ]
+        if not pending:
+            return {}
+        lengths = [
+            length
+            for user, length in self._pending_counts().items()
+            if user != str(user_id)
+        ]
+        return {
+            file_id: index + 1 + sum(min(length, index + 1) for length in lengths)
+            for index, file_id in enumerate(pending)
+        }
+
+    def capacity(self):
+        """In-flight jobs, free slots and queue depth for the Speech resource."""
+        running = f"{KEY_PREFIX}:resource:{self.resource}"
+        self.redis.zremrangebyscore(running, "-inf", time.time() - self.inflight_ttl)
+        inflight = self.redis.zcard(running)
+        pending = self._pending_counts()
+        return {
+            "resource": self.resource,
+            "max_inflight": self.resource_max_inflight,
+            "inflight": inflight,
+            "available": max(self.resource_max_inflight - inflight, 0),
+            "queue_depth": sum(pending.values()),
+            "users_waiting": len(pending),
+            "user_max_inflight": self.max_inflight,
+        }
+
+
+def get_fair_scheduler(app):
+    """
+    Return a scheduler for the app, or None when Redis is not configured;
+    callers then dispatch straight to Celery without fair sharing.
+    """
+    redis = get_redis(app)
+    if redis is None:
+        return None
+    return FairScheduler(
+        redis,
+        max_inflight=app.config["FAIR_SHARE_USER_INFLIGHT"],
+        inflight_ttl=app.config["FAIR_SHARE_INFLIGHT_TTL"],
+        resource=app.config["AZURE_SPEECH_RESOURCE"]
+        or app.config["AZURE_SPEECH_REGION"],
+        resource_max_inflight=app.config["AZURE_SPEECH_MAX_INFLIGHT"],
+        duration_weight=app.config["ADMISSION_DURATION_WEIGHT"],
+        default_seconds=app.config["ADMISSION_DEFAULT_SECONDS"],
+    )
@@ -0,0 +1,266 @@
+import time
+import uuid
+import logging
+import threading
+from app.services.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+LEASE_KEY_PREFIX = "transcription_lease"
+DISPATCH_KEY_PREFIX = "transcription_dispatch"
+# Only the holder's token may extend or delete a lease
+RENEW_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('pexpire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+_local_keys = {}
+_local_lock = threading.Lock()
+
+
+def _local_set(key, value, ttl, only_if=None):
+    """
+    Process-local stand-in for SET NX PX and the compare-and-set scripts,
+    used when Redis is not configured. only_if=None means set if absent.
+    """
+    now = time.monotonic()
+    with _local_lock:
+        current = _local_keys.get(key)
+        if current and current[1] <= now:
+            current = None
+        if only_if is None and current is not None:
+            return False
+        if only_if is not None and (current is None or current[0] != only_if):
+            return False
+        if ttl is None:
+            _local_keys.pop(key, None)
+        else:
+            _local_keys[key] = (value, now + ttl)
+        return True
+
+
+def _local_get(key):
+    with _local_lock:
+        current = _local_keys.get(key)
+        if current and current[1] > time.monotonic():
+            return current[0]
+        return None
+
+
+class FileLease:
+    """
+    Exclusive, expiring claim on transcribing one file.
+
+    A worker takes the lease before submitting a file to Azure, and each
+    stage that follows renews it, with a heartbeat while it works. If the
+    pipeline stalls the lease expires after ttl seconds and a redelivered
+    or recovered task can take over.
+    """
+
+    def __init__(self, redis, file_id, ttl=300, token=None):
+        self.redis = redis
+        self.key = f"{LEASE_KEY_PREFIX}:{file_id}"
+        # Pass the token of a lease taken by an earlier task to act as its holder
+        self.token = token or uuid.uuid4().hex
+        self.ttl = ttl
+        self.lost = False
+        self.retaken = False
+        self.handed_off = False
+        self._stop = threading.Event()
+        self._heartbeat = None
+
+    def acquire(self):
+        """Take the lease, returning False if another worker holds it."""
+        if self.redis is None:
+            return _local_set(self.key, self.token, self.ttl)
+        return bool(
+            self.redis.set(self.key, self.token, nx=True, px=int(self.ttl * 1000))
+        )
+
+    def renew(self):
+        """Extend the lease, returning False if it has been lost."""
+        if self.redis is None:
+            renewed = _local_set(self.key, self.token, self.ttl, only_if=self.token)
+        else:
+            renewed = bool(
+                self.redis.eval(
+                    RENEW_SCRIPT, 1, self.key, self.token, int(self.ttl * 1000)
+                )
+            )
+        if not renewed:
+            self.lost = True
+        return renewed
+
+    def resume(self):
+        """
+        Renew a lease carried over from an earlier task, or re-take it with
+        the same token if it expired while that task waited in a queue.
+        Returns False only when another token holds it; sets retaken when
+        the lease had to be taken again.
+        """
+        self.retaken = False
+        if self.renew():
+            return True
+        if not self.acquire():
+            return False
+        self.lost = False
+        self.retaken = True
+        return True
+
+    def release(self):
+        self.stop_heartbeat()
+        try:
+            if self.redis is None:
+                _local_set(self.key, None, None, only_if=self.token)
+            else:
+                self.redis.eval(RELEASE_SCRIPT, 1, self.key, self.token)
+        except Exception as e:
+            logger.warning(f"Could not release {self.key}: {str(e)}")
+
+    def hand_off(self):
+        """
+        Keep the lease for a task scheduled to take over with its token,
+        so leaving the context manager stops the heartbeat without
+        releasing it.
+        """
+        self.handed_off = True
+        self.stop_heartbeat()
+
+    def held(self):
+        """Whether any worker currently holds this file's lease."""
+        if self.redis is None:
+            return _local_get(self.key) is not None
+        return bool(self.redis.exists(self.key))
+
+    def start_heartbeat(self):
+        """Renew the lease every third of its TTL on a background thread."""
+        if self._heartbeat is not None:
+            return
+        self._stop.clear()
+        self._heartbeat = threading.Thread(
+            target=self._beat, name=f"lease-{self.key}", daemon=True
+        )
+        self._heartbeat.start()
+
+    def stop_heartbeat(self):
+        if self._heartbeat is None:
+            return
+        self._stop.set()
+        self._heartbeat.join(timeout=5)
+        self._heartbeat = None
+
+    def _beat(self):
+        while not self._stop.wait(self.ttl / 3):
+            try:
+                if not self.renew():
+                    logger.error(f"Lost {self.key}; another worker may take over")
+                    return
+            except Exception as e:
+                # A brief Redis outage is survivable while the TTL lasts
+                logger.warning(f"Heartbeat for {self.key} failed: {str(e)}")
+
+    def __enter__(self):
+        self.start_heartbeat()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.handed_off:
+            self.stop_heartbeat()
+        else:
+            self.release()
+        return False
+
+
+def check_lease_ttl(config):
+    """
+    Warn when the lease cannot outlast the gap between pipeline stages, a
+    poll countdown plus time in the queue. Stages re-take an expired lease,
+    but until then recovery may see the file as orphaned.
+    """
+    needed = (
+        config["TRANSCRIPTION_POLL_INTERVAL"] + config["TRANSCRIPTION_QUEUE_LATENCY"]
+    )
+    if config["TRANSCRIPTION_LEASE_TTL"] < needed:
+        logger.warning(
+            f"TRANSCRIPTION_LEASE_TTL={config['TRANSCRIPTION_LEASE_TTL']}s is shorter "
+            f"than the poll interval plus queue latency ({needed}s)"
+        )
+        return False
+    return True
+
+
+def file_lease(app, file_id, token=None):
+    return FileLease(
+        get_redis(app),
+        file_id,
+        ttl=app.config["TRANSCRIPTION_LEASE_TTL"],
+        token=token,
+    )
+
+
+class DispatchRegistry:
+    """
+    Idempotency keys for queued transcriptions. The first dispatch for an
+    idempotency key records its Celery task id; later dispatches with the
+    same key get that id back instead of queueing another task. The key is
+    cleared once the task holds the file's lease, which takes over
+    deduplication from there.
+    """
+
+    def __init__(self, redis, ttl=3600):
+        self.redis = redis
+        self.ttl = ttl
+
+    def _key(self, idempotency_key):
+        return f"{DISPATCH_KEY_PREFIX}:{idempotency_key}"
+
+    def claim(self, idempotency_key, task_id):
+        """Return None if task_id now owns the key, else the existing task id."""
+        key = self._key(idempotency_key)
+        if self.redis is None:
+            if _local_set(key, task_id, self.ttl):
+                return None
+            return _local_get(key)
+        # Retry once in case the key expires between the SET and the GET
+        for _ in range(2):
+            if self.redis.set(key, task_id, nx=True, ex=self.ttl):
+                return None
+            existing = self.redis.get(key)
+            if existing is not None:
+                return (
+                    existing.decode("utf-8")
+                    if isinstance(existing, bytes)
+                    else existing
+                )
+        return None
+
+    def pending(self, idempotency_key):
+        """Whether a dispatch for the key is queued and not yet started."""
+        key = self._key(idempotency_key)
+        if self.redis is None:
+            return _local_get(key) is not None
+        return bool(self.redis.exists(key))
+
+    def forget(self, idempotency_key):
+        """Allow the key to be dispatched again, e.g. once a task has finished."""
+        key = self._key(idempotency_key)
+        try:
+            if self.redis is None:
+                with _local_lock:
+                    _local_keys.pop(key, None)
+            else:
+                self.redis.delete(key)
+        except Exception as e:
+            logger.warning(f"Could not clear {key}: {str(e)}")
+
+
+def dispatch_registry(app):
+    return DispatchRegistry(
+        get_redis(app), ttl=app.config["TRANSCRIPTION_DISPATCH_TTL"]
+    )
@@ -0,0 +1,95 @@
+import time
+import logging
+import threading
+from sqlalchemy import event
+from celery import current_task
+from celery.signals import task_prerun, task_postrun
+
+logger = logging.getLogger(__name__)
+_stats = {}
+_stats_lock = threading.Lock()
+_instrumented = set()
+_warn_seconds = 5.0
+
+
+class CheckoutStats:
+    """Connection checkouts made by one task"""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.total_seconds = 0.0
+        self.longest_seconds = 0.0
+        self.open = 0
+
+    def add(self, seconds):
+        self.checkouts += 1
+        self.total_seconds += seconds
+        self.longest_seconds = max(self.longest_seconds, seconds)
+
+    def to_dict(self):
+        return {
+            "checkouts": self.checkouts,
+            "total_seconds": round(self.total_seconds, 4),
+            "longest_seconds": round(self.longest_seconds, 4),
+            "still_open": self.open,
+        }
+
+
+def _current_task_id():
+    task = current_task._get_current_object()
+    if task is None or task.request is None:
+        return None
+    return task.request.id
+
+
+def instrument_pool(engine, warn_seconds=5.0):
+    """
+    Time every connection checkout from an engine's pool and attribute it
+    to the Celery task running at the time. Totals are logged when the task
+    finishes; checkouts held longer than warn_seconds log a warning.
+    """
+    global _warn_seconds
+    _warn_seconds = warn_seconds
+    if id(engine) in _instrumented:
+        return
+    _instrumented.add(id(engine))
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        task_id = _current_task_id()
+        connection_record.info["checkout"] = (time.perf_counter(), task_id)
+        with _stats_lock:
+            stats = _stats.get(task_id)
+            if stats is not None:
+                stats.open += 1
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        started, task_id = connection_record.info.pop("checkout", (None, None))
+        if started is None or task_id is None:
+            return
+        held = time.perf_counter() - started
+        with _stats_lock:
+            stats = _stats.get(task_id)
+            if stats is not None:
+                stats.add(held)
+                stats.open = max(stats.open - 1, 0)
+        if held > _warn_seconds:
+            logger.warning(f"Task {task_id} held a database connection for {held:.2f}s")
+
+
+@task_prerun.connect
+def _reset_task_stats(task_id=None, **kwargs):
+    with _stats_lock:
+        _stats[task_id] = CheckoutStats()
+
+
+@task_postrun.connect
+def _report_task_stats(task_id=None, task=None, **kwargs):
+    with _stats_lock:
+        stats = _stats.pop(task_id, None)
+    if stats is None or (stats.checkouts == 0 and stats.open == 0):
+        return
+    logger.info(
+        f"DB checkouts for {task.name if task else 'task'} {task_id}: {stats.to_dict()}"
+    )
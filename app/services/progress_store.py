@@ -0,0 +1,207 @@
+import time
+import logging
+import threading
+from sqlalchemy import bindparam
+from app.extensions import db
+from app.models.file import File
+from app.services.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+REDIS_KEY_PREFIX = "file_progress"
+DIRTY_KEY = f"{REDIS_KEY_PREFIX}:dirty"
+PROGRESS_FIELDS = ("progress_percent", "current_stage", "stage_progress")
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+class ProgressStore:
+    """
+    Live progress of in-flight transcriptions, kept out of the database.
+
+    Tasks record progress here on every poll; readers merge it over the
+    file row, and a periodic flush copies pending values to the database in
+    one batched UPDATE. Uses Redis when configured and a process-local dict
+    otherwise, which only suits single-process development and tests.
+    """
+
+    def __init__(self, redis=None, ttl=86400):
+        self.redis = redis
+        self.ttl = ttl
+        self._local = {}
+        self._dirty = set()
+        self._lock = threading.Lock()
+
+    def _key(self, file_id):
+        return f"{REDIS_KEY_PREFIX}:{file_id}"
+
+    def record(
+        self, file_id, progress_percent, current_stage=None, stage_progress=None
+    ):
+        """Record a progress update and mark the file for the next flush."""
+        entry = {"progress_percent": float(progress_percent), "updated_at": time.time()}
+        if current_stage is not None:
+            entry["current_stage"] = current_stage
+        if stage_progress is not None:
+            entry["stage_progress"] = float(stage_progress)
+        if self.redis is None:
+            with self._lock:
+                self._local.setdefault(file_id, {}).update(entry)
+                self._dirty.add(file_id)
+            return
+        try:
+            pipe = self.redis.pipeline()
+            pipe.hset(self._key(file_id), mapping=entry)
+            pipe.expire(self._key(file_id), self.ttl)
+            pipe.sadd(DIRTY_KEY, file_id)
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"Progress store write failed for {file_id}: {str(e)}")
+
+    def get_many(self, file_ids):
+        """Return {file_id: progress dict} for the files with live progress."""
+        file_ids = list(file_ids)
+        if not file_ids:
+            return {}
+        if self.redis is None:
+            with self._lock:
+                return {
+                    file_id: dict(self._local[file_id])
+                    for file_id in file_ids
+                    if file_id in self._local
+                }
+        try:
+            pipe = self.redis.pipeline()
+            for file_id in file_ids:
+                pipe.hgetall(self._key(file_id))
+            results = pipe.execute()
+        except Exception as e:
+            logger.warning(f"Progress store read failed: {str(e)}")
+            return {}
+        progress = {}
+        for file_id, values in zip(file_ids, results):
+            if values:
+                progress[file_id] = _decode(values)
+        return progress
+
+    def get(self, file_id):
+        return self.get_many([file_id]).get(file_id)
+
+    def clear(self, file_id):
+        """Forget a file's live progress once its final state is committed."""
+        if self.redis is None:
+            with self._lock:
+                self._local.pop(file_id, None)
+                self._dirty.discard(file_id)
+            return
+        try:
+            pipe = self.redis.pipeline()
+            pipe.delete(self._key(file_id))
+            pipe.srem(DIRTY_KEY, file_id)
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"Progress store clear failed for {file_id}: {str(e)}")
+
+    def take_dirty(self, batch_size=500):
+        """Remove and return the IDs of files updated since the last flush."""
+        if self.redis is None:
+            with self._lock:
+                dirty, self._dirty = self._dirty, set()
+            return list(dirty)
+        file_ids = []
+        while True:
+            popped = self.redis.spop(DIRTY_KEY, batch_size)
+            if not popped:
+                break
+            file_ids.extend(
+                value.decode("utf-8") if isinstance(value, bytes) else value
+                for value in popped
+            )
+            if len(popped) < batch_size:
+                break
+        return file_ids
+
+
+def _decode(values):
+    decoded = {}
+    for key, value in values.items():
+        key = key.decode("utf-8") if isinstance(key, bytes) else key
+        value = value.decode("utf-8") if isinstance(value, bytes) else value
+        if key == "current_stage":
+            decoded[key] = value
+        else:
+            decoded[key] = float(value)
+    return decoded
+
+
+def get_progress_store(app):
+    """Return the process-wide progress store configured for an app."""
+    with _stores_lock:
+        store = _stores.get(id(app))
+        if store is None:
+            store = _stores[id(app)] = ProgressStore(redis=get_redis(app))
+        return store
+
+
+def merge_live_progress(store, file_dicts):
+    """
+    Overlay live progress on serialized files that are still processing.
+    The database row may lag the live value by up to one flush interval.
+    """
+    processing = [data for data in file_dicts if data.get("status") == "processing"]
+    live = store.get_many(data["id"] for data in processing)
+    for data in processing:
+        entry = live.get(data["id"])
+        if not entry:
+            continue
+        for field in PROGRESS_FIELDS:
+            if field in entry:
+                data[field] = entry[field]
+    return file_dicts
+
+
+def flush_progress(store):
+    """
+    Write pending live progress to the files table with a single
+    executemany UPDATE. Rows that have since reached a final state are left
+    alone. Returns the number of files flushed.
+    """
+    file_ids = store.take_dirty()
+    if not file_ids:
+        return 0
+    live = store.get_many(file_ids)
+    rows = [
+        {
+            "b_id": file_id,
+            "b_progress": entry["progress_percent"],
+            "b_stage": entry.get("current_stage"),
+        }
+        for file_id, entry in live.items()
+        if "progress_percent" in entry
+    ]
+    if not rows:
+        return 0
+    files = File.__table__
+    statement = (
+        files.update()
+        .where(files.c.id == bindparam("b_id"))
+        .where(files.c.status == "processing")
+        .values(
+            progress_percent=bindparam("b_progress"),
+            current_stage=db.func.coalesce(bindparam("b_stage"), files.c.current_stage),
+        )
+    )
+    try:
+        db.session.execute(statement, rows)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        # Put the files back so the next flush retries them
+        for file_id in file_ids:
+            if file_id in live:
+                store.record(file_id, **_record_args(live[file_id]))
+        raise
+    return len(rows)
+
+
+def _record_args(entry):
+    return {field: entry[field] for field in PROGRESS_FIELDS if field in entry}
@@ -0,0 +1,221 @@
+import time
+import random
+import hashlib
+import logging
+import threading
+from email.utils import parsedate_to_datetime
+from app.services.redis_client import get_redis
+from app.errors.exceptions import RateLimitError
+
+logger = logging.getLogger(__name__)
+KEY_PREFIX = "rate_limit"
+# Take one token, or return how long to wait for one. Uses the Redis clock
+# so workers on different hosts agree; a throttle set by any caller blocks
+# everyone until it ends. Floats are returned as strings since Lua numbers
+# are truncated to integers on the way out.
+TAKE_SCRIPT = """
+local bucket, blocked = KEYS[1], KEYS[2]
+local rate, burst = tonumber(ARGV[1]), tonumber(ARGV[2])
+local clock = redis.call('time')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local blocked_until = tonumber(redis.call('get', blocked) or '0')
+if blocked_until > now then
+    return tostring(blocked_until - now)
+end
+local state = redis.call('hmget', bucket, 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('hset', bucket, 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('pexpire', bucket, math.ceil(burst / rate * 1000) + 1000)
+return tostring(wait)
+"""
+# Block the bucket for ARGV[1] seconds unless it is already blocked for longer
+THROTTLE_SCRIPT = """
+local seconds = tonumber(ARGV[1])
+local clock = redis.call('time')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+if seconds > 0 and now + seconds > tonumber(redis.call('get', KEYS[1]) or '0') then
+    redis.call('set', KEYS[1], tostring(now + seconds), 'px', math.ceil(seconds * 1000))
+end
+return 1
+"""
+METRIC_FIELDS = (
+    "requests",
+    "waited_seconds",
+    "throttled_responses",
+    "throttled_seconds",
+    "deadline_exceeded",
+)
+_local_buckets = {}
+_local_metrics = {}
+_local_lock = threading.Lock()
+
+
+def parse_retry_after(value):
+    """Seconds to wait from a Retry-After header (delta or HTTP date), or None."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """
+    Token bucket shared through Redis by every process calling one API.
+
+    Each call takes a token, refilled at rate per second up to burst. When
+    the API answers 429, throttle() blocks the bucket for the Retry-After
+    period for every caller, not just the one that was refused, so workers
+    back off together instead of retrying into the same limit. Waits are
+    stretched by up to jitter of their length so blocked callers do not all
+    wake at once. Without Redis the bucket is process-local.
+
+    If Redis fails the limiter lets calls through rather than stopping all
+    transcription; Azure's own limits still apply.
+    """
+
+    def __init__(self, redis, name, rate=5.0, burst=10, jitter=0.2):
+        self.redis = redis
+        self.name = name
+        self.rate = rate
+        self.burst = burst
+        self.jitter = jitter
+        self.bucket_key = f"{KEY_PREFIX}:{name}:bucket"
+        self.blocked_key = f"{KEY_PREFIX}:{name}:blocked"
+        self.metrics_key = f"{KEY_PREFIX}:{name}:metrics"
+
+    def _local_take(self):
+        now = time.time()
+        with _local_lock:
+            tokens, ts, blocked_until = _local_buckets.get(
+                self.name, (self.burst, now, 0.0)
+            )
+            if blocked_until > now:
+                return blocked_until - now
+            tokens = min(self.burst, tokens + max(0.0, now - ts) * self.rate)
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / self.rate
+            _local_buckets[self.name] = (tokens, now, blocked_until)
+            return wait
+
+    def _take(self):
+        """Take a token, returning 0, or the seconds until one is free."""
+        if self.redis is None:
+            return self._local_take()
+        try:
+            return float(
+                self.redis.eval(
+                    TAKE_SCRIPT,
+                    2,
+                    self.bucket_key,
+                    self.blocked_key,
+                    self.rate,
+                    self.burst,
+                )
+            )
+        except Exception as e:
+            logger.warning(f"Rate limiter {self.name} unavailable: {str(e)}")
+            return 0.0
+
+    def _record(self, **values):
+        if self.redis is None:
+            with _local_lock:
+                metrics = _local_metrics.setdefault(self.name, {})
+                for field, value in values.items():
+                    metrics[field] = metrics.get(field, 0) + value
+            return
+        try:
+            pipe = self.redis.pipeline()
+            for field, value in values.items():
+                pipe.hincrbyfloat(self.metrics_key, field, value)
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"Could not record rate limit metrics: {str(e)}")
+
+    def acquire(self, deadline=None):
+        """
+        Wait for a token and return the seconds spent waiting. Raises
+        RateLimitError if none will be free before deadline, a
+        time.monotonic() value.
+        """
+        started = time.monotonic()
+        while True:
+            wait = self._take()
+            if wait <= 0:
+                break
+            wait *= 1 + random.uniform(0, self.jitter)
+            if deadline is not None and time.monotonic() + wait > deadline:
+                self._record(
+                    waited_seconds=time.monotonic() - started, deadline_exceeded=1
+                )
+                raise RateLimitError(
+                    f"Rate limit for {self.name} would delay this call past its deadline",
+                    service=self.name,
+                    retry_after=round(wait, 3),
+                )
+            time.sleep(wait)
+        waited = time.monotonic() - started
+        self._record(requests=1, waited_seconds=waited)
+        return waited
+
+    def throttle(self, seconds):
+        """Block every caller for seconds after the API has refused a call."""
+        self._record(throttled_responses=1, throttled_seconds=seconds)
+        logger.warning(f"{self.name} throttled; pausing calls for {seconds:.1f}s")
+        if self.redis is None:
+            until = time.time() + seconds
+            with _local_lock:
+                tokens, ts, blocked_until = _local_buckets.get(
+                    self.name, (self.burst, time.time(), 0.0)
+                )
+                _local_buckets[self.name] = (tokens, ts, max(blocked_until, until))
+            return
+        try:
+            self.redis.eval(THROTTLE_SCRIPT, 1, self.blocked_key, seconds)
+        except Exception as e:
+            logger.warning(f"Could not share throttle for {self.name}: {str(e)}")
+
+    def metrics(self):
+        """Totals since the metrics were last reset, plus the configured limit."""
+        if self.redis is None:
+            with _local_lock:
+                raw = dict(_local_metrics.get(self.name, {}))
+        else:
+            raw = {
+                (k.decode("utf-8") if isinstance(k, bytes) else k): v
+                for k, v in self.redis.hgetall(self.metrics_key).items()
+            }
+        metrics = {field: round(float(raw.get(field, 0)), 3) for field in METRIC_FIELDS}
+        metrics.update(name=self.name, rate=self.rate, burst=self.burst)
+        return metrics
+
+
+def speech_rate_limiter(app, subscription_key, region):
+    """
+    The shared limiter for one Speech key and region. The key is hashed
+    so it never appears in Redis key names.
+    """
+    digest = hashlib.sha256(subscription_key.encode("utf-8")).hexdigest()[:12]
+    return RateLimiter(
+        get_redis(app),
+        f"azure_speech:{region}:{digest}",
+        rate=app.config["SPEECH_RATE_LIMIT"],
+        burst=app.config["SPEECH_RATE_BURST"],
+        jitter=app.config["SPEECH_RATE_JITTER"],
+    )
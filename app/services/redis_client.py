@@ -0,0 +1,26 @@
+import logging
+import threading
+from redis import Redis
+
+logger = logging.getLogger(__name__)
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_redis(app):
+    """
+    Return a shared Redis client for the app's REDIS_URL, or None when no
+    Redis is configured (callers then fall back to process-local state).
+    """
+    url = app.config.get("REDIS_URL")
+    if not url or not url.startswith(("redis://", "rediss://", "unix://")):
+        return None
+    with _clients_lock:
+        if url not in _clients:
+            _clients[url] = Redis.from_url(
+                url,
+                socket_timeout=app.config.get("REDIS_SOCKET_TIMEOUT", 5),
+                socket_connect_timeout=app.config.get("REDIS_SOCKET_TIMEOUT", 5),
+            )
+            logger.info("Created shared Redis client")
+        return _clients[url]
@@ -0,0 +1,138 @@
+import os
+import json
+import logging
+from app.services.transcript_processing import (
+    PROCESSING_VERSION,
+    build_processed_transcript,
+)
+from app.services.word_index import WORD_INDEX_VERSION, WordIndex
+from app.errors.exceptions import StorageError
+from app.errors.logger import log_exception
+
+logger = logging.getLogger(__name__)
+TRANSCRIPT_ARTIFACT = "final.json"
+PEAKS_ARTIFACT = "peaks.bin"
+
+
+def processed_artifact_name(version=PROCESSING_VERSION):
+    """Blob name of the frontend-ready transcript for a processing version."""
+    return f"processed-v{version}.json"
+
+
+def word_index_artifact_name(version=WORD_INDEX_VERSION):
+    """Blob name of the word/time index for an index format version."""
+    return f"word-index-v{version}.json"
+
+
+DERIVED_ARTIFACTS = (
+    [PEAKS_ARTIFACT]
+    + [processed_artifact_name(version) for version in range(1, PROCESSING_VERSION + 1)]
+    + [
+        word_index_artifact_name(version)
+        for version in range(1, WORD_INDEX_VERSION + 1)
+    ]
+)
+
+
+def artifact_blob_path(file_id, name):
+    """
+    Blob path for an artifact built from one file's audio or transcript.
+
+    Artifacts are keyed by file id so two uploads sharing a filename never
+    read or delete each other's transcript, peaks or index.
+    """
+    return f"transcripts/{file_id}/{name}"
+
+
+def legacy_artifact_blob_path(filename, name):
+    """Filename-keyed path artifacts were stored under before file-id keys."""
+    base_name = os.path.splitext(os.path.basename(filename))[0]
+    return f"{base_name}/transcript/{name}"
+
+
+def store_processed_transcript(blob_service, file_id, result_json):
+    """
+    Build the frontend-ready transcript for the current processing version
+    and store it next to the raw transcript.
+
+    Returns:
+        bytes: the serialised processed transcript
+    """
+    payload = build_processed_transcript(result_json)
+    blob_service.upload_bytes(
+        payload,
+        artifact_blob_path(file_id, processed_artifact_name()),
+        "application/json",
+    )
+    logger.info(
+        f"Stored processed transcript v{PROCESSING_VERSION} for file {file_id} ({len(payload)} bytes)"
+    )
+    return payload
+
+
+def load_processed_transcript(blob_service, file):
+    """
+    Return the frontend-ready transcript JSON bytes for a file.
+
+    The stored artifact for the current processing version is served as-is;
+    when it is missing (older files, or a new processing version) it is
+    rebuilt from the raw transcript blob and stored for the next request.
+    """
+    payload = blob_service.download_bytes(
+        artifact_blob_path(file.id, processed_artifact_name())
+    )
+    if payload is not None:
+        return payload
+    logger.info(
+        f"Processed transcript v{PROCESSING_VERSION} missing for file {file.id}; regenerating"
+    )
+    raw = blob_service.download_bytes(
+        blob_service.blob_path_from_url(file.transcript_url)
+    )
+    if raw is None:
+        raise StorageError(
+            "Raw transcript blob not found", file_id=file.id, service="azure_storage"
+        )
+    result_json = json.loads(raw)
+    try:
+        return store_processed_transcript(blob_service, file.id, result_json)
+    except StorageError as e:
+        log_exception(e, logger)
+        return build_processed_transcript(result_json)
+
+
+def store_word_index(blob_service, file_id, processed_payload):
+    """
+    Build the word/time index from a processed transcript and store it next
+    to the transcript.
+
+    Returns:
+        bytes: the serialised word index
+    """
+    payload = WordIndex.build(json.loads(processed_payload)).to_bytes()
+    blob_service.upload_bytes(
+        payload,
+        artifact_blob_path(file_id, word_index_artifact_name()),
+        "application/json",
+    )
+    logger.info(f"Stored word index for file {file_id} ({len(payload)} bytes)")
+    return payload
+
+
+def load_word_index(blob_service, file):
+    """
+    Return the serialised word/time index for a file, building and storing
+    it from the processed transcript when it is missing.
+    """
+    payload = blob_service.download_bytes(
+        artifact_blob_path(file.id, word_index_artifact_name())
+    )
+    if payload is not None:
+        return payload
+    logger.info(f"Word index missing for file {file.id}; building")
+    processed = load_processed_transcript(blob_service, file)
+    try:
+        return store_word_index(blob_service, file.id, processed)
+    except StorageError as e:
+        log_exception(e, logger)
+        return WordIndex.build(json.loads(processed)).to_bytes()
@@ -0,0 +1,201 @@
+import time
+import logging
+import threading
+from collections import OrderedDict
+from app.services.redis_client import get_redis
+from app.services.transcript_processing import PROCESSING_VERSION
+
+logger = logging.getLogger(__name__)
+REDIS_KEY_PREFIX = "transcript"
+
+
+def transcript_cache_key(file):
+    """
+    Cache key for a file's processed transcript.
+
+    The processing version and Azure job id are part of the key, so a new
+    processing version or a re-transcription never serves a stale entry.
+    """
+    return f"{file.id}:v{PROCESSING_VERSION}:{file.transcription_id or 'none'}"
+
+
+class _Flight:
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class TranscriptCache:
+    """
+    Two-tier cache for processed transcript payloads.
+
+    Tier one is an in-process LRU bounded by total bytes; tier two is a
+    shared Redis tier. Concurrent misses for the same key are coalesced so
+    only one caller per process runs the loader, and a short Redis lock
+    extends that to one loader across processes.
+    """
+
+    def __init__(
+        self,
+        redis=None,
+        max_bytes=128 * 1024 * 1024,
+        redis_ttl=86400,
+        redis_max_bytes=32 * 1024 * 1024,
+        lock_ttl=30,
+    ):
+        self.redis = redis
+        self.max_bytes = max_bytes
+        self.redis_ttl = redis_ttl
+        self.redis_max_bytes = redis_max_bytes
+        self.lock_ttl = lock_ttl
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._flights = {}
+
+    def _redis_key(self, key):
+        return f"{REDIS_KEY_PREFIX}:{key}"
+
+    def _get_local(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def _put_local(self, key, value):
+        if len(value) > self.max_bytes // 4:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous)
+            self._entries[key] = value
+            self._bytes += len(value)
+            while self._bytes > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+
+    def _get_shared(self, key):
+        if self.redis is None:
+            return None
+        try:
+            return self.redis.get(self._redis_key(key))
+        except Exception as e:
+            logger.warning(f"Transcript cache Redis read failed: {str(e)}")
+            return None
+
+    def _put_shared(self, key, value):
+        if self.redis is None or len(value) > self.redis_max_bytes:
+            return
+        try:
+            self.redis.set(self._redis_key(key), value, ex=self.redis_ttl)
+        except Exception as e:
+            logger.warning(f"Transcript cache Redis write failed: {str(e)}")
+
+    def get(self, key):
+        value = self._get_local(key)
+        if value is None:
+            value = self._get_shared(key)
+            if value is not None:
+                self._put_local(key, value)
+        return value
+
+    def get_or_load(self, key, loader):
+        """
+        Return the cached payload for key, calling loader() at most once per
+        process (and, with Redis, once across processes) on a miss.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+        with self._lock:
+            flight = self._flights.get(key)
+            is_leader = flight is None
+            if is_leader:
+                flight = self._flights[key] = _Flight()
+        if not is_leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+        try:
+            flight.value = self._load_shared(key, loader)
+            self._put_local(key, flight.value)
+            return flight.value
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            flight.event.set()
+            with self._lock:
+                self._flights.pop(key, None)
+
+    def _load_shared(self, key, loader):
+        if self.redis is None:
+            return loader()
+        lock_key = f"{self._redis_key(key)}:lock"
+        try:
+            acquired = self.redis.set(lock_key, "1", nx=True, ex=self.lock_ttl)
+        except Exception as e:
+            logger.warning(f"Transcript cache lock unavailable: {str(e)}")
+            return loader()
+        if not acquired:
+            deadline = time.time() + self.lock_ttl
+            while time.time() < deadline:
+                time.sleep(0.1)
+                value = self._get_shared(key)
+                if value is not None:
+                    return value
+                try:
+                    if not self.redis.exists(lock_key):
+                        break
+                except Exception:
+                    break
+            logger.info(f"Transcript cache wait for {key} ended without a value")
+            return loader()
+        try:
+            value = loader()
+            self._put_shared(key, value)
+            return value
+        finally:
+            try:
+                self.redis.delete(lock_key)
+            except Exception:
+                pass
+
+    def invalidate(self, file_id):
+        """Drop every cached transcript payload for a file in both tiers."""
+        prefix = f"{file_id}:"
+        with self._lock:
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                self._bytes -= len(self._entries.pop(key))
+        if self.redis is None:
+            return
+        try:
+            keys = list(
+                self.redis.scan_iter(match=f"{REDIS_KEY_PREFIX}:{prefix}*", count=100)
+            )
+            if keys:
+                self.redis.delete(*keys)
+        except Exception as e:
+            logger.warning(f"Transcript cache invalidation failed: {str(e)}")
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_transcript_cache(app):
+    """Return the process-wide transcript cache configured for an app."""
+    with _caches_lock:
+        cache = _caches.get(id(app))
+        if cache is None:
+            cache = _caches[id(app)] = TranscriptCache(
+                redis=get_redis(app),
+                max_bytes=app.config["TRANSCRIPT_CACHE_MAX_BYTES"],
+                redis_ttl=app.config["TRANSCRIPT_CACHE_TTL"],
+                redis_max_bytes=app.config["TRANSCRIPT_CACHE_REDIS_MAX_BYTES"],
+            )
+        return cache
@@ -0,0 +1,98 @@
+import json
+
+try:
+    import msgpack
+except ImportError:  # MessagePack is optional; columnar JSON is served instead
+    msgpack = None
+
+FORMAT_JSON = "json"
+FORMAT_COLUMNAR = "columnar"
+FORMAT_MSGPACK = "msgpack"
+COLUMNAR_VERSION = 1
+CONFIDENCE_SCALE = 255
+MIMETYPES = {
+    FORMAT_JSON: "application/json",
+    FORMAT_COLUMNAR: "application/vnd.transcript.columnar+json",
+    FORMAT_MSGPACK: "application/x-msgpack",
+}
+
+
+def negotiate_transcript_format(request):
+    """
+    Pick the wire format for a transcript response. An explicit ``format``
+    query parameter wins over the Accept header; plain JSON is the default.
+    MessagePack falls back to columnar JSON when msgpack is not installed.
+    """
+    requested = request.args.get("format", "").lower()
+    if requested not in MIMETYPES:
+        requested = FORMAT_JSON
+        accepted = request.accept_mimetypes
+        for fmt in (FORMAT_MSGPACK, FORMAT_COLUMNAR):
+            if MIMETYPES[fmt] in accepted.values():
+                requested = fmt
+                break
+    if requested == FORMAT_MSGPACK and msgpack is None:
+        return FORMAT_COLUMNAR
+    return requested
+
+
+def quantize_confidence(value):
+    """Map a 0-1 confidence onto a single byte."""
+    return max(0, min(CONFIDENCE_SCALE, int(round((value or 0) * CONFIDENCE_SCALE))))
+
+
+def encode_columnar(processed):
+    """
+    Convert a processed transcript (or segment window) into the columnar
+    layout: each segment carries parallel arrays of word-table indices,
+    offsets relative to the segment start, durations and quantized
+    confidences, and every distinct word string is sent once. Formatted
+    timestamp strings are dropped; the client formats from milliseconds.
+    """
+    words = []
+    word_ids = {}
+    segments = []
+    for segment in processed.get("segments", []):
+        offset = int(segment.get("offsetMilliseconds", 0))
+        entry = {
+            "o": offset,
+            "d": int(segment.get("durationMilliseconds", 0)),
+            "s": segment.get("speaker"),
+            "c": quantize_confidence(segment.get("confidence")),
+            "t": segment.get("text", ""),
+        }
+        if "index" in segment:
+            entry["i"] = segment["index"]
+        if segment.get("words"):
+            ids, offsets, durations, confidences = [], [], [], []
+            for word in segment["words"]:
+                text = word.get("word", "")
+                word_id = word_ids.get(text)
+                if word_id is None:
+                    word_id = word_ids[text] = len(words)
+                    words.append(text)
+                ids.append(word_id)
+                offsets.append(int(word.get("offsetMilliseconds", 0)) - offset)
+                durations.append(int(word.get("durationMilliseconds", 0)))
+                confidences.append(quantize_confidence(word.get("confidence")))
+            entry.update(w=ids, wo=offsets, wd=durations, wc=confidences)
+        segments.append(entry)
+    result = {key: value for key, value in processed.items() if key != "segments"}
+    result.update(
+        format=FORMAT_COLUMNAR,
+        version=COLUMNAR_VERSION,
+        confidenceScale=CONFIDENCE_SCALE,
+        words=words,
+        segments=segments,
+    )
+    return result
+
+
+def serialize_transcript(processed, fmt):
+    """Serialise a processed transcript in a negotiated format as bytes."""
+    if fmt == FORMAT_JSON:
+        return json.dumps(processed, separators=(",", ":")).encode("utf-8")
+    columnar = encode_columnar(processed)
+    if fmt == FORMAT_MSGPACK:
+        return msgpack.packb(columnar, use_bin_type=True)
+    return json.dumps(columnar, separators=(",", ":")).encode("utf-8")
@@ -0,0 +1,124 @@
+import json
+from app.extensions import db
+from app.models.transcript_segment import TranscriptSegment
+
+EXPORT_BATCH_SIZE = 500
+FLUSH_BYTES = 64 * 1024
+EXPORT_FORMATS = {
+    "srt": ("application/x-subrip", "srt"),
+    "vtt": ("text/vtt", "vtt"),
+    "txt": ("text/plain", "txt"),
+    "jsonl": ("application/x-ndjson", "jsonl"),
+}
+
+
+def iter_segments(file_id, include_words=False):
+    """
+    Yield a file's stored segments in playback order, fetched from the
+    database in batches so memory stays bounded for multi-hour files.
+    """
+    columns = [
+        TranscriptSegment.position,
+        TranscriptSegment.offset_ms,
+        TranscriptSegment.duration_ms,
+        TranscriptSegment.speaker,
+        TranscriptSegment.text,
+        TranscriptSegment.confidence,
+    ]
+    if include_words:
+        columns.append(TranscriptSegment.words)
+    query = (
+        db.session.query(*columns)
+        .filter(TranscriptSegment.file_id == file_id)
+        .order_by(TranscriptSegment.offset_ms, TranscriptSegment.position)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    yield from query
+
+
+def clock_time(milliseconds, separator="."):
+    """Format milliseconds as HH:MM:SS.mmm (or with a comma for SRT)."""
+    seconds, millis = divmod(int(milliseconds), 1000)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}{separator}{millis:03d}"
+
+
+def speaker_label(speaker):
+    return f"Speaker {speaker}" if speaker is not None else "Speaker"
+
+
+def buffered(chunks):
+    """Join small chunks into roughly FLUSH_BYTES pieces before sending."""
+    pending = []
+    size = 0
+    for chunk in chunks:
+        pending.append(chunk)
+        size += len(chunk)
+        if size >= FLUSH_BYTES:
+            yield "".join(pending)
+            pending = []
+            size = 0
+    if pending:
+        yield "".join(pending)
+
+
+def srt_chunks(segments):
+    for number, segment in enumerate(segments, start=1):
+        start = clock_time(segment.offset_ms, ",")
+        end = clock_time(segment.offset_ms + segment.duration_ms, ",")
+        yield (
+            f"{number}\n{start} --> {end}\n"
+            f"{speaker_label(segment.speaker)}: {segment.text}\n\n"
+        )
+
+
+def vtt_chunks(segments):
+    yield "WEBVTT\n\n"
+    for segment in segments:
+        start = clock_time(segment.offset_ms)
+        end = clock_time(segment.offset_ms + segment.duration_ms)
+        yield (
+            f"{start} --> {end}\n"
+            f"<v {speaker_label(segment.speaker)}>{segment.text}\n\n"
+        )
+
+
+def txt_chunks(segments):
+    """Plain text grouped into speaker turns, each headed by label and time."""
+    first = True
+    current_speaker = None
+    for segment in segments:
+        if first or segment.speaker != current_speaker:
+            heading = (
+                f"{speaker_label(segment.speaker)} [{clock_time(segment.offset_ms)}]"
+            )
+            separator = "" if first else "\n\n"
+            yield f"{separator}{heading}\n{segment.text}"
+            first = False
+            current_speaker = segment.speaker
+        else:
+            yield f" {segment.text}"
+    yield "\n"
+
+
+def jsonl_chunks(segments):
+    for segment in segments:
+        record = {
+            "index": segment.position,
+            "offsetMilliseconds": segment.offset_ms,
+            "durationMilliseconds": segment.duration_ms,
+            "speaker": segment.speaker,
+            "text": segment.text,
+            "confidence": segment.confidence,
+            "words": json.loads(segment.words) if segment.words else [],
+        }
+        yield json.dumps(record, separators=(",", ":")) + "\n"
+
+
+def generate_export(file_id, fmt):
+    """Return a generator streaming a transcript export in the given format."""
+    if fmt == "jsonl":
+        return buffered(jsonl_chunks(iter_segments(file_id, include_words=True)))
+    writers = {"srt": srt_chunks, "vtt": vtt_chunks, "txt": txt_chunks}
+    return buffered(writers[fmt](iter_segments(file_id)))
@@ -0,0 +1,120 @@
+import json
+from app.errors.exceptions import ValidationError
+
+PROCESSING_VERSION = 1
+
+
+def build_processed_transcript(data):
+    """
+    Run process_transcript_data and serialise the result as compact JSON
+    bytes, ready to be stored as a blob and served without re-encoding.
+    """
+    processed = process_transcript_data(data)
+    return json.dumps(processed, separators=(",", ":")).encode("utf-8")
+
+
+def process_transcript_data(data):
+    """Process transcript data into a frontend-friendly format"""
+    if not data:
+        raise ValidationError("Transcript data is empty or null", field="data")
+    result = {
+        "source": data.get("source", ""),
+        "duration": data.get("duration", ""),
+        "combinedResults": [],
+        "segments": [],
+    }
+    if "combinedRecognizedPhrases" in data:
+        result["combinedResults"] = [
+            {
+                "channel": item.get("channel", 0),
+                "text": item.get("display", ""),
+                "lexical": item.get("lexical", ""),
+            }
+            for item in data["combinedRecognizedPhrases"]
+        ]
+    if "recognizedPhrases" in data:
+        segments = []
+        for phrase in data["recognizedPhrases"]:
+            if (
+                phrase.get("recognitionStatus") != "Success"
+                or not phrase.get("nBest")
+                or len(phrase["nBest"]) == 0
+            ):
+                continue
+            best_result = phrase["nBest"][0]
+            offset_str = format_timestamp(phrase.get("offsetMilliseconds", 0))
+            end_offset = phrase.get("offsetMilliseconds", 0) + phrase.get(
+                "durationMilliseconds", 0
+            )
+            end_str = format_timestamp(end_offset)
+            segment = {
+                "start": offset_str,
+                "end": end_str,
+                "offsetMilliseconds": phrase.get("offsetMilliseconds", 0),
+                "durationMilliseconds": phrase.get("durationMilliseconds", 0),
+                "speaker": phrase.get("speaker", 0),
+                "text": best_result.get("display", ""),
+                "confidence": best_result.get("confidence", 0),
+                "words": [],
+            }
+            if "words" in best_result:
+                segment["words"] = [
+                    {
+                        "word": word.get("word", ""),
+                        "start": format_timestamp(word.get("offsetMilliseconds", 0)),
+                        "duration": format_timestamp_duration(
+                            word.get("durationMilliseconds", 0)
+                        ),
+                        "offsetMilliseconds": word.get("offsetMilliseconds", 0),
+                        "durationMilliseconds": word.get("durationMilliseconds", 0),
+                        "confidence": word.get("confidence", 0),
+                    }
+                    for word in best_result["words"]
+                ]
+            segments.append(segment)
+        result["segments"] = sorted(segments, key=lambda x: x["offsetMilliseconds"])
+    return result
+
+
+def format_timestamp(milliseconds):
+    """Convert milliseconds to a user-friendly timestamp format (MM:SS.mmm)"""
+    seconds = milliseconds / 1000
+    minutes = int(seconds // 60)
+    seconds_remainder = seconds % 60
+    return f"{minutes:02d}:{seconds_remainder:06.3f}"
+
+
+def format_timestamp_duration(milliseconds):
+    """Format a duration in milliseconds to a user-friendly format"""
+    seconds = milliseconds / 1000
+    return f"{seconds:.3f}s"
+
+
+def add_time_strings(time1, time2):
+    """
+    Add two time strings in HH:MM:SS, HH:MM:SS.msec, or ISO 8601 duration format (PT1.5S)
+    """
+
+    def to_seconds(time_str):
+        if time_str.startswith("PT") and time_str.endswith("S"):
+            try:
+                return float(time_str[2:-1])
+            except ValueError:
+                return 0
+        parts = time_str.split(":")
+        if len(parts) == 3:
+            h, m, s = parts
+            return int(h) * 3600 + int(m) * 60 + float(s)
+        elif len(parts) == 2:
+            m, s = parts
+            return int(m) * 60 + float(s)
+        return 0
+
+    def to_string(seconds):
+        h = int(seconds // 3600)
+        m = int(seconds % 3600 // 60)
+        s = seconds % 60
+        return f"{h:02d}:{m:02d}:{s:06.3f}"
+
+    total_seconds = to_seconds(time1) + to_seconds(time2)
+    return to_string(total_seconds)
@@ -0,0 +1,152 @@
+import re
+import logging
+import threading
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from app.extensions import db
+
+logger = logging.getLogger(__name__)
+FTS_TABLE = "transcript_segments_fts"
+TSVECTOR_EXPRESSION = "to_tsvector('english', coalesce(s.text, ''))"
+BACKEND_FTS5 = "fts5"
+BACKEND_TSVECTOR = "tsvector"
+BACKEND_LIKE = "like"
+_backends = {}
+_backends_lock = threading.Lock()
+
+SQLITE_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        text, content='transcript_segments', content_rowid='id',
+        tokenize='porter unicode61')""",
+    f"""CREATE TRIGGER IF NOT EXISTS transcript_segments_fts_insert
+        AFTER INSERT ON transcript_segments BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, text) VALUES (new.id, new.text);
+        END""",
+    f"""CREATE TRIGGER IF NOT EXISTS transcript_segments_fts_delete
+        AFTER DELETE ON transcript_segments BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, text)
+        VALUES ('delete', old.id, old.text);
+        END""",
+    f"""CREATE TRIGGER IF NOT EXISTS transcript_segments_fts_update
+        AFTER UPDATE OF text ON transcript_segments BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, text)
+        VALUES ('delete', old.id, old.text);
+        INSERT INTO {FTS_TABLE}(rowid, text) VALUES (new.id, new.text);
+        END""",
+]
+POSTGRES_DDL = [
+    "CREATE INDEX IF NOT EXISTS ix_transcript_segments_text_fts "
+    "ON transcript_segments USING GIN "
+    "(to_tsvector('english', coalesce(text, '')))",
+]
+
+
+def ensure_search_index():
+    """
+    Create the full-text index over transcript segments for the configured
+    database if it does not exist yet, and return the backend in use.
+
+    SQLite gets an FTS5 table kept in sync with transcript_segments by
+    triggers, so storing a transcript's segments indexes it. PostgreSQL
+    gets a GIN index over the segment text's tsvector. Other databases, and
+    SQLite builds without FTS5, fall back to LIKE matching.
+
+    Runs its DDL on its own connection, so call it before the session
+    starts writing.
+    """
+    engine = db.engine
+    key = str(engine.url)
+    with _backends_lock:
+        if key in _backends:
+            return _backends[key]
+        backend = BACKEND_LIKE
+        try:
+            if engine.dialect.name == "sqlite":
+                with engine.begin() as conn:
+                    existed = conn.execute(
+                        text("SELECT 1 FROM sqlite_master WHERE name = :name"),
+                        {"name": FTS_TABLE},
+                    ).first()
+                    for statement in SQLITE_DDL:
+                        conn.execute(text(statement))
+                    if not existed:
+                        # Index segments stored before the FTS table existed
+                        conn.execute(
+                            text(
+                                f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+                            )
+                        )
+                backend = BACKEND_FTS5
+            elif engine.dialect.name == "postgresql":
+                with engine.begin() as conn:
+                    for statement in POSTGRES_DDL:
+                        conn.execute(text(statement))
+                backend = BACKEND_TSVECTOR
+        except SQLAlchemyError as e:
+            # Not remembered, so the index is retried once the schema exists
+            logger.warning(
+                f"Full-text index unavailable, falling back to LIKE search: {str(e)}"
+            )
+            return BACKEND_LIKE
+        logger.info(f"Transcript search backend: {backend}")
+        _backends[key] = backend
+        return backend
+
+
+def search_terms(query):
+    """Split a free-text query into word tokens."""
+    return re.findall(r"\w+", query.lower())
+
+
+def search_transcripts(user_id, query, limit=20):
+    """
+    Return the best-matching transcript segments across a user's files.
+
+    Returns:
+        list: dicts with file_id, filename, offset_ms, duration_ms, speaker,
+            text and rank, best match first
+    """
+    terms = search_terms(query)
+    if not terms:
+        return []
+    backend = ensure_search_index()
+    columns = "s.file_id, f.filename, s.offset_ms, s.duration_ms, s.speaker, s.text"
+    params = {"user_id": user_id, "limit": limit}
+    if backend == BACKEND_FTS5:
+        # Quote every term so user input cannot inject FTS5 query syntax
+        params["query"] = " ".join(f'"{term}"' for term in terms)
+        sql = f"""
+            SELECT {columns}, bm25({FTS_TABLE}) AS rank
+            FROM {FTS_TABLE}
+            JOIN transcript_segments s ON s.id = {FTS_TABLE}.rowid
+            JOIN files f ON f.id = s.file_id
+            WHERE {FTS_TABLE} MATCH :query AND f.user_id = :user_id
+            ORDER BY rank
+            LIMIT :limit
+        """
+    elif backend == BACKEND_TSVECTOR:
+        params["query"] = " ".join(terms)
+        sql = f"""
+            SELECT {columns}, ts_rank({TSVECTOR_EXPRESSION}, q) AS rank
+            FROM transcript_segments s
+            JOIN files f ON f.id = s.file_id,
+                 plainto_tsquery('english', :query) q
+            WHERE f.user_id = :user_id AND {TSVECTOR_EXPRESSION} @@ q
+            ORDER BY rank DESC
+            LIMIT :limit
+        """
+    else:
+        clauses = []
+        for i, term in enumerate(terms):
+            params[f"term{i}"] = f"%{term}%"
+            clauses.append(f"LOWER(s.text) LIKE :term{i}")
+        sql = f"""
+            SELECT {columns}, 0 AS rank
+            FROM transcript_segments s
+            JOIN files f ON f.id = s.file_id
+            WHERE f.user_id = :user_id AND {" AND ".join(clauses)}
+            ORDER BY f.upload_time DESC, s.offset_ms
+            LIMIT :limit
+        """
+    rows = db.session.execute(text(sql), params).mappings().all()
+    return [dict(row) for row in rows]
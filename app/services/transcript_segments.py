@@ -0,0 +1,170 @@
+import json
+import logging
+from sqlalchemy import func, insert, or_
+from sqlalchemy.exc import IntegrityError
+from app.extensions import db
+from app.models.file import File
+from app.models.transcript_segment import TranscriptSegment
+from app.services.transcript_processing import format_timestamp
+from app.services.transcript_search import ensure_search_index
+
+logger = logging.getLogger(__name__)
+
+
+def replace_transcript_segments(file_id, processed):
+    """
+    Replace the stored segments of a file with those of a processed
+    transcript and record their summary on the file row. The caller owns
+    the transaction and must commit.
+
+    Returns:
+        int: number of segments stored
+    """
+    db.session.query(TranscriptSegment).filter(
+        TranscriptSegment.file_id == file_id
+    ).delete(synchronize_session=False)
+    rows = [
+        {
+            "file_id": file_id,
+            "position": position,
+            "offset_ms": int(segment.get("offsetMilliseconds", 0)),
+            "duration_ms": int(segment.get("durationMilliseconds", 0)),
+            "speaker": segment.get("speaker"),
+            "text": segment.get("text", ""),
+            "confidence": segment.get("confidence"),
+            "words": (
+                json.dumps(segment["words"], separators=(",", ":"))
+                if segment.get("words")
+                else None
+            ),
+        }
+        for position, segment in enumerate(processed.get("segments", []))
+    ]
+    if rows:
+        db.session.execute(insert(TranscriptSegment), rows)
+    store_segment_summary(
+        file_id,
+        len(rows),
+        max((row["offset_ms"] + row["duration_ms"] for row in rows), default=0),
+        max((row["duration_ms"] for row in rows), default=0),
+    )
+    return len(rows)
+
+
+def store_segment_summary(file_id, count, duration_ms, longest_ms):
+    """Record a file's segment summary; the caller must commit."""
+    db.session.query(File).filter(File.id == file_id).update(
+        {
+            File.segment_count: count,
+            File.segment_duration_ms: duration_ms,
+            File.segment_longest_ms: longest_ms,
+        },
+        synchronize_session=False,
+    )
+
+
+def backfill_transcript_segments(file_id, processed):
+    """
+    Populate the segment store for a transcript finalized before it
+    existed. A concurrent backfill of the same file is not an error.
+    """
+    ensure_search_index()
+    try:
+        count = replace_transcript_segments(file_id, processed)
+        db.session.commit()
+        logger.info(f"Backfilled {count} transcript segments for file {file_id}")
+    except IntegrityError:
+        db.session.rollback()
+        logger.info(
+            f"Transcript segments for file {file_id} were backfilled concurrently"
+        )
+
+
+def segment_summary(file_id):
+    """
+    Return (segment_count, duration_ms, longest_segment_ms) for a file's
+    stored segments.
+    """
+    end_ms = TranscriptSegment.offset_ms + TranscriptSegment.duration_ms
+    count, duration_ms, longest_ms = (
+        db.session.query(
+            func.count(TranscriptSegment.id),
+            func.max(end_ms),
+            func.max(TranscriptSegment.duration_ms),
+        )
+        .filter(TranscriptSegment.file_id == file_id)
+        .one()
+    )
+    return count or 0, duration_ms or 0, longest_ms or 0
+
+
+def ensure_transcript_segments(file, load_processed):
+    """
+    Return (segment_count, duration_ms, longest_segment_ms) for a file,
+    read from its row once recorded. Transcripts finalized before the
+    segment store existed are backfilled from load_processed() on first
+    use, and ones stored before the summary columns get them filled in.
+    A transcript with no segments is recorded as 0, not backfilled again.
+    """
+    if file.segment_count is not None:
+        return (
+            file.segment_count,
+            file.segment_duration_ms or 0,
+            file.segment_longest_ms or 0,
+        )
+    summary = segment_summary(file.id)
+    if summary[0] == 0:
+        backfill_transcript_segments(file.id, load_processed())
+        summary = segment_summary(file.id)
+    store_segment_summary(file.id, *summary)
+    db.session.commit()
+    return summary
+
+
+def query_segment_window(file_id, from_ms, to_ms, longest_ms, include_words=False):
+    """
+    Return the segments of a file overlapping [from_ms, to_ms) in playback
+    order, in the same shape as process_transcript_data produces.
+
+    The offset index bounds the scan: a segment overlapping the window
+    cannot start earlier than from_ms minus the longest segment.
+    """
+    end_ms = TranscriptSegment.offset_ms + TranscriptSegment.duration_ms
+    columns = [
+        TranscriptSegment.position,
+        TranscriptSegment.offset_ms,
+        TranscriptSegment.duration_ms,
+        TranscriptSegment.speaker,
+        TranscriptSegment.text,
+        TranscriptSegment.confidence,
+    ]
+    if include_words:
+        columns.append(TranscriptSegment.words)
+    rows = (
+        db.session.query(*columns)
+        .filter(
+            TranscriptSegment.file_id == file_id,
+            TranscriptSegment.offset_ms >= from_ms - longest_ms,
+            TranscriptSegment.offset_ms < to_ms,
+            or_(end_ms > from_ms, TranscriptSegment.offset_ms >= from_ms),
+        )
+        .order_by(TranscriptSegment.offset_ms, TranscriptSegment.position)
+        .all()
+    )
+    segments = []
+    for row in rows:
+        segment = {
+            "index": row.position,
+            "start": format_timestamp(row.offset_ms),
+            "end": format_timestamp(row.offset_ms + row.duration_ms),
+            "offsetMilliseconds": row.offset_ms,
+            "durationMilliseconds": row.duration_ms,
+            "speaker": row.speaker,
+            "text": row.text,
+            "confidence": row.confidence,
+            "words": [],
+        }
+        if include_words and row.words:
+            segment["words"] = json.loads(row.words)
+        segments.append(segment)
+    return segments
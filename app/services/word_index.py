@@ -0,0 +1,160 @@
+import re
+import json
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+
+WORD_INDEX_VERSION = 1
+_TOKEN_PATTERN = re.compile(r"[^\w']+")
+
+
+def normalize_token(word):
+    """Lowercase a word and strip punctuation so lookups ignore formatting."""
+    return _TOKEN_PATTERN.sub("", word.lower()).strip("'")
+
+
+class WordIndex:
+    """
+    Word/time index over a single transcript.
+
+    Words are kept in playback order as parallel arrays of start offsets,
+    durations, text and owning segment, so the word at a time is a binary
+    search over the starts. A token-to-positions map answers phrase
+    queries without scanning the transcript.
+    """
+
+    def __init__(self, starts, durations, words, segments, tokens):
+        self.starts = starts
+        self.durations = durations
+        self.words = words
+        self.segments = segments
+        self.tokens = tokens
+
+    @classmethod
+    def build(cls, processed):
+        entries = []
+        for segment_index, segment in enumerate(processed.get("segments", [])):
+            for word in segment.get("words") or []:
+                entries.append(
+                    (
+                        int(word.get("offsetMilliseconds", 0)),
+                        int(word.get("durationMilliseconds", 0)),
+                        word.get("word", ""),
+                        segment_index,
+                    )
+                )
+        entries.sort(key=lambda entry: entry[0])
+        tokens = {}
+        for position, entry in enumerate(entries):
+            token = normalize_token(entry[2])
+            if token:
+                tokens.setdefault(token, []).append(position)
+        return cls(
+            starts=[entry[0] for entry in entries],
+            durations=[entry[1] for entry in entries],
+            words=[entry[2] for entry in entries],
+            segments=[entry[3] for entry in entries],
+            tokens=tokens,
+        )
+
+    def to_bytes(self):
+        return json.dumps(
+            {
+                "version": WORD_INDEX_VERSION,
+                "starts": self.starts,
+                "durations": self.durations,
+                "words": self.words,
+                "segments": self.segments,
+                "tokens": self.tokens,
+            },
+            separators=(",", ":"),
+        ).encode("utf-8")
+
+    @classmethod
+    def from_bytes(cls, payload):
+        data = json.loads(payload)
+        return cls(
+            data["starts"],
+            data["durations"],
+            data["words"],
+            data["segments"],
+            data["tokens"],
+        )
+
+    def __len__(self):
+        return len(self.starts)
+
+    def word_at(self, offset_ms):
+        """
+        Return the position of the word spoken at offset_ms, or of the last
+        word before it when offset_ms falls in a pause. None before the
+        first word.
+        """
+        position = bisect_right(self.starts, offset_ms) - 1
+        return position if position >= 0 else None
+
+    def describe(self, position, length=1):
+        """Describe a run of words starting at a position."""
+        last = position + length - 1
+        return {
+            "index": position,
+            "text": " ".join(self.words[position : last + 1]),
+            "offset_ms": self.starts[position],
+            "end_ms": self.starts[last] + self.durations[last],
+            "segment_index": self.segments[position],
+        }
+
+    def find(self, query, limit=50):
+        """
+        Return the start positions of every occurrence of a phrase, in
+        playback order, together with the phrase length in words.
+        """
+        terms = [token for token in map(normalize_token, query.split()) if token]
+        if not terms:
+            return [], 0
+        postings = [self.tokens.get(term, []) for term in terms]
+        if len(terms) == 1:
+            return postings[0][:limit], 1
+        # Drive the match from the rarest term and probe the others by
+        # position, so cost follows term frequency, not transcript length
+        driver = min(range(len(terms)), key=lambda i: len(postings[i]))
+        others = [
+            (offset, set(positions))
+            for offset, positions in enumerate(postings)
+            if offset != driver
+        ]
+        matches = []
+        for position in postings[driver]:
+            start = position - driver
+            if start < 0:
+                continue
+            if all(start + offset in positions for offset, positions in others):
+                matches.append(start)
+                if len(matches) >= limit:
+                    break
+        return matches, len(terms)
+
+
+class WordIndexCache:
+    """Small in-process LRU of parsed word indexes."""
+
+    def __init__(self, max_entries=32):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_load(self, key, loader):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+        index = WordIndex.from_bytes(loader())
+        with self._lock:
+            self._entries[key] = index
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return index
+
+
+word_index_cache = WordIndexCache()
@@ -57,7 +57,9 @@ export class FileDetailView {
           stageText = "Generating Transcript";
           break;
         case "queued":
-          stageText = "Queued for Processing";
+          stageText = file.queue_position
+            ? `Queued for Processing (#${file.queue_position} in line)`
+            : "Queued for Processing";
           break;
         case "transcribing":
           stageText = "Transcribing Audio";
@@ -48,7 +48,9 @@ export class ProgressManager {
       if (file.current_stage === "transcribing") {
         currentStage.textContent = "Transcribing Audio";
       } else if (file.current_stage === "queued") {
-        currentStage.textContent = "Queued for Processing";
+        currentStage.textContent = file.queue_position
+          ? `Queued (#${file.queue_position} in line)`
+          : "Queued for Processing";
       } else {
         currentStage.textContent = "Processing";
       }
@@ -0,0 +1,54 @@
+/**
+ * Batch Progress Feed
+ * Polls one endpoint for the progress of every upload in a batch, instead
+ * of one poller per file
+ */
+export class BatchProgressFeed {
+  constructor(queue, pollInterval = 1500) {
+    this.queue = queue;
+    this.pollInterval = pollInterval;
+    this.uploadForm = document.getElementById("uploadForm");
+    this.interval = null;
+    this.polling = false;
+  }
+
+  start() {
+    if (this.interval) return;
+    this.interval = setInterval(() => this.poll(), this.pollInterval);
+  }
+
+  stop() {
+    if (this.interval) {
+      clearInterval(this.interval);
+      this.interval = null;
+    }
+  }
+
+  poll() {
+    if (!this.queue.isProcessing()) {
+      this.stop();
+      return;
+    }
+    // Skip a tick rather than stacking requests behind a slow response
+    if (this.polling) return;
+    this.polling = true;
+
+    const progressUrl = this.uploadForm
+      .getAttribute("data-batch-progress-url")
+      .replace("BATCH_ID_PLACEHOLDER", this.queue.batchId);
+
+    window
+      .fetchWithCsrf(progressUrl)
+      .then((response) => (response.ok ? response.json() : null))
+      .then((data) => {
+        if (!data) return;
+        data.uploads.forEach((status) => this.queue.applyStatus(status));
+      })
+      .catch((error) => {
+        console.error("Error polling for upload progress:", error);
+      })
+      .finally(() => {
+        this.polling = false;
+      });
+  }
+}
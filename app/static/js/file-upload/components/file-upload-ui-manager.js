@@ -21,12 +21,13 @@ export class FileUploadUIManager {
     this.uploadPercentage = document.getElementById("uploadPercentage");
     this.uploadStageText = document.getElementById("uploadStageText");
     this.currentStage = document.getElementById("currentStage");
-    this.uploadTimeRemaining = document.getElementById("uploadTimeRemaining");
-    this.timeRemaining = document.getElementById("timeRemaining");
+    this.uploadQueue = document.getElementById("uploadQueue");
+    this.queueRows = new Map();
 
     // Callbacks
     this.fileChangeCallback = null;
     this.formSubmitCallback = null;
+    this.retryCallback = null;
   }
 
   initEventListeners() {
@@ -34,26 +35,36 @@ export class FileUploadUIManager {
 
     // File selection change
     this.fileInput.addEventListener("change", () => {
-      const file =
-        this.fileInput.files.length > 0 ? this.fileInput.files[0] : null;
-      if (this.fileChangeCallback) this.fileChangeCallback(file);
+      if (this.fileChangeCallback) this.fileChangeCallback(this.fileInput.files);
     });
 
-    // Form submission
+    // Form submission queues the selected files; more can be added while
+    // earlier ones are still uploading
     this.uploadForm.addEventListener("submit", (e) => {
       e.preventDefault();
       if (this.fileInput.files.length > 0) {
-        // Prepare form data
-        const formData = new FormData(this.uploadForm);
+        const files = Array.from(this.fileInput.files);
 
         // Display progress UI
         this.showProgressUI();
 
         // Call submit callback
-        if (this.formSubmitCallback) this.formSubmitCallback(formData);
+        if (this.formSubmitCallback) this.formSubmitCallback(files);
+
+        this.fileInput.value = "";
+        this.updateFileInfo([]);
       }
     });
 
+    // Retry buttons on failed files
+    if (this.uploadQueue) {
+      this.uploadQueue.addEventListener("click", (e) => {
+        const button = e.target.closest(".upload-queue-retry");
+        if (!button || !this.retryCallback) return;
+        this.retryCallback(parseInt(button.dataset.itemId, 10));
+      });
+    }
+
     // Drag and drop functionality
     this.initDragDropEvents();
   }
@@ -92,8 +103,12 @@ export class FileUploadUIManager {
     this.formSubmitCallback = callback;
   }
 
-  updateFileInfo(file) {
-    if (!file) {
+  setRetryCallback(callback) {
+    this.retryCallback = callback;
+  }
+
+  updateFileInfo(files) {
+    if (!files || files.length === 0) {
       // Reset UI if no file
       this.dropArea.classList.remove("has-file");
       this.dropAreaContent.classList.remove("d-none");
@@ -104,9 +119,13 @@ export class FileUploadUIManager {
     }
 
     // Update file info and show the selected file view
-    if (this.selectedFileName) this.selectedFileName.textContent = file.name;
+    const totalSize = Array.from(files).reduce((sum, f) => sum + f.size, 0);
+    if (this.selectedFileName) {
+      this.selectedFileName.textContent =
+        files.length === 1 ? files[0].name : `${files.length} files selected`;
+    }
     if (this.selectedFileSize)
-      this.selectedFileSize.textContent = `File size: ${this.formatFileSize(file.size)}`;
+      this.selectedFileSize.textContent = `${files.length === 1 ? "File size" : "Total size"}: ${this.formatFileSize(totalSize)}`;
 
     this.dropArea.classList.add("has-file");
     this.dropAreaContent.classList.add("d-none");
@@ -117,12 +136,50 @@ export class FileUploadUIManager {
     this.uploadProgressContainer.classList.remove("d-none");
     this.uploadStatusText.classList.remove("d-none");
     this.uploadStageText.classList.remove("d-none");
-    this.uploadTimeRemaining.classList.remove("d-none");
-
-    // Disable upload button
-    this.uploadButton.disabled = true;
+    this.uploadQueue.classList.remove("d-none");
     this.uploadButton.innerHTML =
-      '<i class="fas fa-circle-notch fa-spin me-2"></i>Uploading...';
+      '<i class="fas fa-plus me-2"></i>Add to Upload Queue';
+  }
+
+  /**
+   * Show or refresh the progress line of one queued file
+   */
+  updateQueueItem(item) {
+    let row = this.queueRows.get(item.id);
+    if (!row) {
+      row = document.createElement("div");
+      row.className = "upload-queue-item";
+      row.innerHTML = `
+        <div class="d-flex justify-content-between align-items-center mb-1">
+          <span class="upload-queue-name text-truncate me-2"></span>
+          <span class="d-flex align-items-center">
+            <small class="upload-queue-status text-muted"></small>
+            <button type="button"
+                    class="btn btn-sm btn-outline-primary upload-queue-retry ms-2 d-none"
+                    data-item-id="${item.id}">Retry</button>
+          </span>
+        </div>
+        <div class="progress upload-queue-progress">
+          <div class="progress-bar" role="progressbar" style="width: 0%"></div>
+        </div>
+      `;
+      row.querySelector(".upload-queue-name").textContent = item.file.name;
+      this.uploadQueue.appendChild(row);
+      this.queueRows.set(item.id, row);
+    }
+
+    const bar = row.querySelector(".progress-bar");
+    bar.style.width = `${item.percent}%`;
+    bar.classList.toggle("bg-success", item.state === "completed");
+    bar.classList.toggle("bg-danger", item.state === "error");
+
+    const status = row.querySelector(".upload-queue-status");
+    status.textContent =
+      item.state === "error" ? item.error : `${item.stage} ${item.percent}%`;
+    status.classList.toggle("text-danger", item.state === "error");
+    row
+      .querySelector(".upload-queue-retry")
+      .classList.toggle("d-none", item.state !== "error");
   }
 
   updateProgress(progressData) {
@@ -144,27 +201,12 @@ export class FileUploadUIManager {
     if (this.uploadStatusText && progressData.statusText) {
       this.uploadStatusText.innerHTML = progressData.statusText;
     }
-
-    // Update time remaining
-    if (this.timeRemaining && progressData.timeRemaining !== undefined) {
-      this.timeRemaining.textContent = progressData.timeRemaining;
-    }
   }
 
   showError(message) {
-    if (this.uploadButton) {
-      this.uploadButton.disabled = false;
-      this.uploadButton.innerHTML =
-        '<i class="fas fa-upload me-2"></i>Try Again';
-    }
-
     if (this.uploadStatusText) {
       this.uploadStatusText.innerHTML = `<small class="text-danger">Error: ${message}</small>`;
     }
-
-    if (this.timeRemaining) {
-      this.timeRemaining.textContent = "N/A";
-    }
   }
 
   preventDefaults(e) {
@@ -212,14 +254,4 @@ export class FileUploadUIManager {
       return (bytes / (1024 * 1024 * 1024)).toFixed(2) + " GB";
     }
   }
-
-  formatTimeRemaining(seconds) {
-    if (seconds < 60) {
-      return `${Math.round(seconds)} seconds`;
-    } else if (seconds < 3600) {
-      return `${Math.floor(seconds / 60)} minutes ${Math.round(seconds % 60)} seconds`;
-    } else {
-      return `${Math.floor(seconds / 3600)} hours ${Math.floor((seconds % 3600) / 60)} minutes`;
-    }
-  }
 }
@@ -0,0 +1,182 @@
+/**
+ * Upload Queue
+ * Uploads many files with a bounded number in flight, follows each one
+ * through the Azure upload and lets failed files be retried on their own
+ */
+export class UploadQueue {
+  constructor(uploadManager, concurrency = 3) {
+    this.uploadManager = uploadManager;
+    this.uploadForm = document.getElementById("uploadForm");
+    this.concurrency = Math.max(1, concurrency);
+    this.batchId = this.createBatchId();
+    this.items = [];
+    this.nextId = 1;
+    this.active = 0;
+    this.changeCallback = null;
+    this.processingCallback = null;
+    this.drainedCallback = null;
+  }
+
+  createBatchId() {
+    if (window.crypto && window.crypto.randomUUID) {
+      return window.crypto.randomUUID();
+    }
+    return "10000000-1000-4000-8000-100000000000".replace(/[018]/g, (c) =>
+      (
+        c ^
+        (window.crypto.getRandomValues(new Uint8Array(1))[0] & (15 >> (c / 4)))
+      ).toString(16),
+    );
+  }
+
+  onChange(callback) {
+    this.changeCallback = callback;
+  }
+
+  /**
+   * Called whenever a file moves to server-side processing, so the batch
+   * progress feed can start polling
+   */
+  onProcessing(callback) {
+    this.processingCallback = callback;
+  }
+
+  onDrained(callback) {
+    this.drainedCallback = callback;
+  }
+
+  add(files) {
+    const added = Array.from(files).map((file) => ({
+      id: this.nextId++,
+      file,
+      state: "queued",
+      percent: 0,
+      stage: "Queued",
+      uploadId: null,
+      redirectUrl: null,
+      error: null,
+    }));
+    this.items.push(...added);
+    added.forEach((item) => this.changed(item));
+    this.pump();
+    return added;
+  }
+
+  retry(itemId) {
+    const item = this.items.find((entry) => entry.id === itemId);
+    if (!item || item.state !== "error") return;
+    Object.assign(item, {
+      state: "queued",
+      percent: 0,
+      stage: "Queued",
+      uploadId: null,
+      error: null,
+    });
+    this.changed(item);
+    this.pump();
+  }
+
+  pump() {
+    while (this.active < this.concurrency) {
+      const item = this.items.find((entry) => entry.state === "queued");
+      if (!item) break;
+      this.start(item);
+    }
+  }
+
+  start(item) {
+    this.active++;
+    item.state = "uploading";
+    item.stage = "Local upload";
+    this.changed(item);
+
+    const formData = new FormData(this.uploadForm);
+    formData.set("file", item.file);
+    formData.set("batch_id", this.batchId);
+
+    // The local upload is the first quarter of each file's progress
+    this.uploadManager
+      .startUpload(formData, (fraction) => {
+        item.percent = Math.round(fraction * 25);
+        this.changed(item);
+      })
+      .then((response) => {
+        item.uploadId = response.upload_id;
+        item.state = "processing";
+        item.percent = 25;
+        item.stage = "Waiting for Azure upload";
+        this.changed(item);
+        if (this.processingCallback) this.processingCallback();
+      })
+      .catch((error) => this.fail(item, error.message))
+      .finally(() => {
+        // The slot frees once the browser has sent the file; the Azure
+        // upload continues on the server
+        this.active--;
+        this.pump();
+      });
+  }
+
+  /**
+   * Apply one upload's status from the batch progress feed
+   */
+  applyStatus(status) {
+    const item = this.items.find(
+      (entry) =>
+        entry.uploadId === status.upload_id && entry.state === "processing",
+    );
+    if (!item) return;
+
+    if (status.status === "completed") {
+      item.state = "completed";
+      item.percent = 100;
+      item.stage = "Complete";
+      item.redirectUrl = status.redirect_url;
+      this.changed(item);
+    } else if (status.status === "error") {
+      this.fail(item, status.error);
+    } else if (status.progress > 0) {
+      item.percent = Math.round(25 + status.progress * 0.75);
+      item.stage = "Azure upload";
+      this.changed(item);
+    }
+  }
+
+  fail(item, message) {
+    item.state = "error";
+    item.stage = "Failed";
+    item.error = message || "Upload failed";
+    this.changed(item);
+  }
+
+  isProcessing() {
+    return this.items.some((item) => item.state === "processing");
+  }
+
+  summary() {
+    const count = (state) =>
+      this.items.filter((item) => item.state === state).length;
+    const total = this.items.length;
+    const percent =
+      total > 0
+        ? Math.round(
+            this.items.reduce((sum, item) => sum + item.percent, 0) / total,
+          )
+        : 0;
+    return {
+      total,
+      completed: count("completed"),
+      failed: count("error"),
+      pending: total - count("completed") - count("error"),
+      percent,
+    };
+  }
+
+  changed(item) {
+    const summary = this.summary();
+    if (this.changeCallback) this.changeCallback(item, summary);
+    if (summary.total > 0 && summary.pending === 0 && this.drainedCallback) {
+      this.drainedCallback(this.items, summary);
+    }
+  }
+}
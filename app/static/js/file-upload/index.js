@@ -4,14 +4,14 @@
  */
 import { FileUploadUIManager } from "./components/file-upload-ui-manager.js";
 import { FileUploadManager } from "./components/file-upload-manager.js";
-import { UploadProgressTracker } from "./components/upload-progress-tracker.js";
+import { UploadQueue } from "./components/upload-queue.js";
+import { BatchProgressFeed } from "./components/batch-progress-feed.js";
 
 class FileUploadApp {
   constructor() {
     // Create component instances
     this.uiManager = new FileUploadUIManager();
-    this.uploadManager = new FileUploadManager(this.uiManager);
-    this.progressTracker = new UploadProgressTracker(this.uiManager);
+    this.uploadManager = new FileUploadManager();
 
     // Initialize
     this.init();
@@ -19,37 +19,63 @@ class FileUploadApp {
 
   init() {
     // Check if we're on the upload page
-    if (!document.getElementById("uploadForm")) return;
+    const uploadForm = document.getElementById("uploadForm");
+    if (!uploadForm) return;
+
+    this.queue = new UploadQueue(
+      this.uploadManager,
+      parseInt(uploadForm.dataset.uploadConcurrency, 10) || 3,
+    );
+    this.progressFeed = new BatchProgressFeed(this.queue);
+    this.queue.onChange((item, summary) => this.handleQueueChange(item, summary));
+    this.queue.onProcessing(() => this.progressFeed.start());
+    this.queue.onDrained((items, summary) =>
+      this.handleQueueDrained(items, summary),
+    );
 
     // Set up event listeners
     this.uiManager.initEventListeners();
-    this.uiManager.setFileChangeCallback((file) => this.handleFileChange(file));
-    this.uiManager.setFormSubmitCallback((formData) =>
-      this.handleFormSubmit(formData),
+    this.uiManager.setFileChangeCallback((files) =>
+      this.handleFileChange(files),
     );
+    this.uiManager.setFormSubmitCallback((files) => this.queue.add(files));
+    this.uiManager.setRetryCallback((itemId) => this.queue.retry(itemId));
   }
 
-  handleFileChange(file) {
-    if (!file) return;
+  handleFileChange(files) {
+    if (!files) return;
 
     // Update UI with file info
-    this.uiManager.updateFileInfo(file);
+    this.uiManager.updateFileInfo(files);
   }
 
-  handleFormSubmit(formData) {
-    // Start upload process
-    this.uploadManager
-      .startUpload(formData)
-      .then((response) => {
-        // Start tracking progress
-        this.progressTracker.startTracking(
-          response.upload_id,
-          response.task_id,
-        );
-      })
-      .catch((error) => {
-        this.uiManager.showError(error.message);
-      });
+  handleQueueChange(item, summary) {
+    this.uiManager.updateQueueItem(item);
+    this.uiManager.updateProgress({
+      percent: summary.percent,
+      stage: `${summary.completed} of ${summary.total} files uploaded`,
+      statusText:
+        summary.failed > 0
+          ? `<small class="text-danger">${summary.failed} failed, retry them below</small>`
+          : '<small class="text-muted">Uploading files...</small>',
+    });
+  }
+
+  handleQueueDrained(items, summary) {
+    this.progressFeed.stop();
+    if (summary.failed > 0) return;
+
+    this.uiManager.updateProgress({
+      percent: 100,
+      statusText:
+        '<small class="text-success">Upload complete! Processing files...</small>',
+    });
+
+    // A single file opens its detail page, a batch the file list
+    window.location.href =
+      items.length === 1 && items[0].redirectUrl
+        ? items[0].redirectUrl
+        : document.getElementById("uploadForm").getAttribute("data-files-url");
   }
 }
 
@@ -43,9 +43,10 @@ export class EventBindingsManager {
     // Keyboard shortcuts
     document.addEventListener("keydown", this.handleKeyDown.bind(this));
 
-    // Segment click events
-    document.querySelectorAll(".speaker-segment").forEach((segment) => {
-      segment.addEventListener("click", (event) => {
+    // Segment click events, delegated so segments from later windows work too
+    const container = this.transcriptRenderer.transcriptContainer;
+    if (container) {
+      container.addEventListener("click", (event) => {
         // Don't trigger if clicking on a word which has its own handler
         if (
           event.target.classList.contains("word-highlight") ||
@@ -54,11 +55,14 @@ export class EventBindingsManager {
           return;
         }
 
+        const segment = event.target.closest(".speaker-segment");
+        if (!segment) return;
+
         const startTime = parseFloat(segment.dataset.start);
         this.audioPlayer.seekToTime(startTime);
         this.audioPlayer.play();
       });
-    });
+    }
   }
 
   handleDocumentClick(e) {
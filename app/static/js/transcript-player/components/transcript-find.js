@@ -0,0 +1,70 @@
+/**
+ * Transcript Find Component
+ * Finds a word or phrase in the transcript through the server-side word
+ * index and steps the player through the matches
+ */
+export class TranscriptFindComponent {
+  constructor(audioPlayer) {
+    this.audioPlayer = audioPlayer;
+    this.form = document.getElementById("transcript-find-form");
+    this.input = document.getElementById("transcript-find-input");
+    this.status = document.getElementById("transcript-find-status");
+    this.btnPrevious = document.getElementById("btn-find-previous");
+    this.btnNext = document.getElementById("btn-find-next");
+    this.matches = [];
+    this.current = -1;
+  }
+
+  init(findUrl) {
+    if (!this.form || !findUrl) return;
+    this.findUrl = findUrl;
+
+    this.form.addEventListener("submit", (event) => {
+      event.preventDefault();
+      this.find(this.input.value.trim());
+    });
+    this.btnPrevious.addEventListener("click", () => this.step(-1));
+    this.btnNext.addEventListener("click", () => this.step(1));
+  }
+
+  find(query) {
+    if (!query) return;
+    const params = new URLSearchParams({ q: query });
+    window
+      .fetchWithCsrf(`${this.findUrl}?${params}`)
+      .then((response) => {
+        if (!response.ok) {
+          throw new Error(`Search failed (HTTP ${response.status})`);
+        }
+        return response.json();
+      })
+      .then((data) => {
+        this.matches = data.matches;
+        this.current = this.matches.length > 0 ? 0 : -1;
+        this.show();
+      })
+      .catch((error) => {
+        console.error("Error searching transcript:", error);
+        this.status.textContent = "Search failed";
+      });
+  }
+
+  step(direction) {
+    if (this.matches.length === 0) return;
+    this.current =
+      (this.current + direction + this.matches.length) % this.matches.length;
+    this.show();
+  }
+
+  show() {
+    const hasMatches = this.matches.length > 0;
+    this.btnPrevious.disabled = !hasMatches;
+    this.btnNext.disabled = !hasMatches;
+    if (!hasMatches) {
+      this.status.textContent = "No matches";
+      return;
+    }
+    this.status.textContent = `${this.current + 1} of ${this.matches.length}`;
+    this.audioPlayer.seekToTime(this.matches[this.current].offset_ms / 1000);
+  }
+}
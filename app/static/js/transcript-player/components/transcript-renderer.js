@@ -1,6 +1,21 @@
+import { TimeIndex } from "../services/time-index.js";
+
+// Extra height rendered above and below the visible area, in pixels
+const OVERSCAN_PX = 800;
+
+// Height estimate for segments that have not been rendered yet
+const SEGMENT_CHROME_PX = 110;
+const LINE_HEIGHT_PX = 26;
+const CHARACTER_WIDTH_PX = 8;
+
 /**
  * Transcript Renderer Component
- * Handles rendering and highlighting of transcript segments
+ * Handles rendering and highlighting of transcript segments.
+ *
+ * Rendering is virtualized: only the segments in and near the visible part
+ * of the transcript exist in the DOM. Spacers above and below them stand
+ * in for the rest, sized from measured heights where segments have been
+ * shown and from estimates where they have not.
  */
 export class TranscriptRendererComponent {
   constructor() {
@@ -8,108 +23,552 @@ export class TranscriptRendererComponent {
     this.segments = [];
     this.activeSegment = null;
     this.isWhisperModel = false;
+    this.windowed = false;
+    this.renderedIndices = new Set();
+    this.speakerMap = {};
+    this.speakerCount = 0;
+    this.endSentinel = null;
+
+    // Segments and words by time, for highlighting during playback
+    this.segmentTimes = new TimeIndex();
+    this.wordTimes = new TimeIndex();
+    this.currentSegment = null;
+    this.currentWord = null;
+    this.highlightedSegment = null;
+    this.highlightedWord = null;
+
+    // Virtual layout: segment index -> position, measured heights and
+    // cumulative offsets, plus the segments currently in the DOM
+    this.positions = new Map();
+    this.heights = new Map();
+    this.offsets = new Float64Array(1);
+    this.layoutDirty = true;
+    this.rendered = new Map();
+    this.first = -1;
+    this.last = -1;
+    this.segmentGap = null;
+    this.charactersPerLine = 80;
+    this.content = null;
+    this.topSpacer = null;
+    this.bottomSpacer = null;
+    this.updateRequested = false;
+    this.listening = false;
   }
 
-  setData(data) {
+  setData(data, options = {}) {
     this.segments = data.segments || [];
+    this.windowed = Boolean(options.windowed);
+    this.segments.forEach((segment, position) => {
+      segment.index = this.segmentIndex(segment, position);
+    });
+    this.renderedIndices = new Set(
+      this.segments.map((segment) => segment.index),
+    );
 
     // Detect if this is likely a Whisper model output
     if (this.segments.length > 0) {
-      const firstSegment = this.segments[0];
-      // Whisper is a display-only model without lexical data
-      // It may have different property names or missing properties
-      this.isWhisperModel =
-        !firstSegment.words ||
-        (firstSegment.words &&
-          firstSegment.words.length > 0 &&
-          typeof firstSegment.words[0].confidence === "undefined");
-
-      console.log(
-        "Detected transcript type:",
-        this.isWhisperModel ? "Whisper model" : "Standard model",
-      );
+      this.detectModelType(this.segments[0]);
     }
   }
 
+  detectModelType(firstSegment) {
+    // Whisper is a display-only model without lexical data
+    // It may have different property names or missing properties
+    this.isWhisperModel =
+      !firstSegment.words ||
+      (firstSegment.words &&
+        firstSegment.words.length > 0 &&
+        typeof firstSegment.words[0].confidence === "undefined");
+
+    console.log(
+      "Detected transcript type:",
+      this.isWhisperModel ? "Whisper model" : "Standard model",
+    );
+  }
+
   render() {
+    this.resetLayout();
     if (!this.segments || this.segments.length === 0) {
+      if (this.windowed) {
+        // Later windows may still hold speech; keep the end marker visible
+        this.createViewport();
+        return;
+      }
       this.showEmpty();
       return;
     }
 
-    let html = "";
-    let speakerMap = {}; // Map to track speaker number assignments
-    let speakerCount = 0;
+    this.speakerMap = {}; // Map to track speaker number assignments
+    this.speakerCount = 0;
 
     // First pass: assign consistent speaker numbers
-    this.segments.forEach((segment) => {
-      if (segment.speaker !== undefined && !speakerMap[segment.speaker]) {
-        speakerCount++;
-        speakerMap[segment.speaker] = speakerCount;
-      }
-    });
+    this.segments.forEach((segment) => this.assignSpeakerNumber(segment));
 
     // If no speakers were detected, default to one speaker
-    if (speakerCount === 0) {
-      speakerMap[0] = 1;
-    }
-
-    // Second pass: generate HTML
-    this.segments.forEach((segment, index) => {
-      const speakerNum =
-        (segment.speaker !== undefined ? speakerMap[segment.speaker] : 1) % 6 ||
-        6; // Limit to 6 colors, cycling
-
-      // Process words with confidence
-      let processedText = segment.text;
-
-      // Handle word-level highlighting based on model type
-      if (!this.isWhisperModel && segment.words && segment.words.length > 0) {
-        // Standard model with confidence scores
-        processedText = this.createHighlightedText(segment.words, segment.text);
-      } else if (
-        this.isWhisperModel &&
-        segment.displayWords &&
-        segment.displayWords.length > 0
-      ) {
-        // Whisper model with display words
-        processedText = this.createWhisperHighlightedText(
-          segment.displayWords,
-          segment.text,
-        );
-      }
+    if (this.speakerCount === 0) {
+      this.speakerMap[0] = 1;
+    }
 
-      // Format timestamp display in a user-friendly way
-      const start = this.formatTimestamp(
-        segment.start ||
-          segment.offsetSeconds ||
-          segment.offsetMilliseconds / 1000,
+    // Second pass: index times and materialize the visible segments
+    this.indexSegments(this.segments);
+    this.createViewport();
+    this.updateVisibleRange();
+  }
+
+  /**
+   * Merge segments from a newly loaded window in playback order, skipping
+   * any already added by a neighbouring window
+   */
+  addSegments(segments) {
+    const fresh = segments.filter(
+      (segment) => !this.renderedIndices.has(segment.index),
+    );
+    if (fresh.length === 0) return;
+
+    if (this.segments.length === 0) {
+      this.detectModelType(fresh[0]);
+    }
+    fresh.forEach((segment) => {
+      this.renderedIndices.add(segment.index);
+      this.assignSpeakerNumber(segment);
+    });
+
+    // Segments loaded above the reader must not move what they are reading
+    this.keepScrollAnchor(() => {
+      this.segments = this.segments
+        .concat(fresh)
+        .sort((a, b) => a.index - b.index);
+      this.indexSegments(fresh);
+    });
+    this.first = -1;
+    this.updateVisibleRange();
+  }
+
+  /**
+   * Call back whenever the end of the rendered transcript scrolls into view
+   */
+  observeEnd(callback) {
+    this.ensureEndSentinel();
+    if (!("IntersectionObserver" in window)) return;
+    const observer = new IntersectionObserver(
+      (entries) => {
+        if (entries.some((entry) => entry.isIntersecting)) callback();
+      },
+      { root: this.transcriptContainer, rootMargin: "400px 0px" },
+    );
+    observer.observe(this.endSentinel);
+  }
+
+  ensureEndSentinel() {
+    if (!this.endSentinel) {
+      this.endSentinel = document.createElement("div");
+      this.endSentinel.className = "transcript-end-sentinel";
+    }
+    if (this.endSentinel.parentNode !== this.transcriptContainer) {
+      this.transcriptContainer.appendChild(this.endSentinel);
+    }
+  }
+
+  /**
+   * Replace the container's content with the spacers and the element that
+   * holds the rendered segments
+   */
+  createViewport() {
+    this.topSpacer = document.createElement("div");
+    this.topSpacer.className = "transcript-spacer";
+    this.content = document.createElement("div");
+    this.content.className = "transcript-segments";
+    this.bottomSpacer = document.createElement("div");
+    this.bottomSpacer.className = "transcript-spacer";
+    this.transcriptContainer.replaceChildren(
+      this.topSpacer,
+      this.content,
+      this.bottomSpacer,
+    );
+    if (this.windowed) {
+      this.ensureEndSentinel();
+    }
+    this.updateLineWidth();
+
+    if (!this.listening) {
+      this.listening = true;
+      this.transcriptContainer.addEventListener(
+        "scroll",
+        () => this.scheduleUpdate(),
+        { passive: true },
       );
-      const end = this.formatTimestamp(
-        segment.end ||
-          segment.endSeconds ||
-          (segment.offsetMilliseconds + segment.durationMilliseconds) / 1000,
+      window.addEventListener("resize", () => {
+        // Wrapping changes with the width, so every height is re-measured
+        this.keepScrollAnchor(() => {
+          this.heights.clear();
+          this.rendered = new Map();
+          this.updateLineWidth();
+          this.layoutDirty = true;
+        });
+        this.first = -1;
+        this.scheduleUpdate();
+      });
+    }
+  }
+
+  resetLayout() {
+    this.segmentTimes.clear();
+    this.wordTimes.clear();
+    this.positions = new Map();
+    this.heights.clear();
+    this.rendered = new Map();
+    this.layoutDirty = true;
+    this.first = -1;
+    this.last = -1;
+    this.content = null;
+    this.currentSegment = null;
+    this.currentWord = null;
+    this.highlightedSegment = null;
+    this.highlightedWord = null;
+  }
+
+  /**
+   * Add segments and their words to the time indexes. Runs once per
+   * render or loaded window, never per playback tick
+   */
+  indexSegments(segments) {
+    const segmentEntries = [];
+    const wordEntries = [];
+    segments.forEach((segment) => {
+      const [start, end] = this.segmentTimeRange(segment);
+      segmentEntries.push({ start, end, value: segment });
+      this.segmentWords(segment).forEach((word, wordIndex) => {
+        const [wordStart, wordEnd] = this.wordTimeRange(word);
+        wordEntries.push({
+          start: wordStart,
+          end: wordEnd,
+          value: { segment, wordIndex },
+        });
+      });
+    });
+    this.segmentTimes.insert(segmentEntries);
+    this.wordTimes.insert(wordEntries);
+    this.layoutDirty = true;
+  }
+
+  scheduleUpdate() {
+    if (this.updateRequested) return;
+    this.updateRequested = true;
+    window.requestAnimationFrame(() => {
+      this.updateRequested = false;
+      this.updateVisibleRange();
+    });
+  }
+
+  /**
+   * Materialize the segments around the visible area, release the rest and
+   * correct the spacers with the heights of newly shown segments
+   */
+  updateVisibleRange() {
+    if (!this.content || this.segments.length === 0) return;
+    this.layout();
+
+    const container = this.transcriptContainer;
+    const scrollTop = container.scrollTop - this.listTop();
+    const first = this.positionAtOffset(scrollTop - OVERSCAN_PX);
+    const last = this.positionAtOffset(
+      scrollTop + container.clientHeight + OVERSCAN_PX,
+    );
+
+    if (first !== this.first || last !== this.last) {
+      const created = this.materialize(first, last);
+      this.measure(created);
+    }
+    this.paintSegment();
+    this.paintWord();
+  }
+
+  materialize(first, last) {
+    const rendered = new Map();
+    const missing = [];
+    for (let position = first; position <= last; position++) {
+      const segment = this.segments[position];
+      const existing = this.rendered.get(segment.index);
+      if (existing) {
+        rendered.set(segment.index, existing);
+      } else {
+        missing.push(segment);
+      }
+    }
+
+    const created = [];
+    if (missing.length > 0) {
+      const template = document.createElement("template");
+      template.innerHTML = missing
+        .map((segment) => this.createSegmentHtml(segment, segment.index))
+        .join("");
+      Array.from(template.content.children).forEach((element, i) => {
+        const entry = {
+          element,
+          words: element.querySelectorAll(".word-highlight"),
+        };
+        rendered.set(missing[i].index, entry);
+        created.push([missing[i].index, element]);
+      });
+    }
+
+    const elements = [];
+    for (let position = first; position <= last; position++) {
+      elements.push(rendered.get(this.segments[position].index).element);
+    }
+    this.content.replaceChildren(...elements);
+    this.rendered = rendered;
+    this.first = first;
+    this.last = last;
+    this.sizeSpacers();
+    return created;
+  }
+
+  measure(created) {
+    if (created.length === 0) return;
+    if (this.segmentGap === null) {
+      this.segmentGap =
+        parseFloat(window.getComputedStyle(created[0][1]).marginBottom) || 0;
+    }
+    this.keepScrollAnchor(() => {
+      created.forEach(([index, element]) => {
+        const height = element.offsetHeight + this.segmentGap;
+        if (this.heights.get(index) !== height) {
+          this.heights.set(index, height);
+          this.layoutDirty = true;
+        }
+      });
+    });
+  }
+
+  /**
+   * Run a change to the layout without moving the segment at the top of
+   * the visible area
+   */
+  keepScrollAnchor(change) {
+    const container = this.transcriptContainer;
+    let anchor = null;
+    let before = 0;
+    let firstSegment = null;
+    let lastSegment = null;
+    if (this.content && this.segments.length > 0) {
+      this.layout();
+      const position = this.positionAtOffset(
+        container.scrollTop - this.listTop(),
       );
-      const timestampDisplay = `${start} - ${end}`;
+      anchor = this.segments[position];
+      before = this.offsets[position];
+      if (this.first >= 0) {
+        firstSegment = this.segments[this.first];
+        lastSegment = this.segments[this.last];
+      }
+    }
+
+    change();
+
+    this.layout();
+    if (firstSegment) {
+      // Resize the spacers first, so the new scroll position is in range
+      this.first = this.positions.get(firstSegment.index);
+      this.last = this.positions.get(lastSegment.index);
+      this.sizeSpacers();
+    }
+    if (anchor) {
+      const delta = this.offsets[this.positions.get(anchor.index)] - before;
+      if (delta !== 0) {
+        container.scrollTop += delta;
+      }
+    }
+  }
 
-      // Get time values for segment, accounting for different property names
-      const startTime =
-        segment.offsetSeconds || segment.offsetMilliseconds / 1000 || 0;
+  layout() {
+    if (!this.layoutDirty) return;
+    const count = this.segments.length;
+    const offsets = new Float64Array(count + 1);
+    this.positions = new Map();
+    for (let position = 0; position < count; position++) {
+      const segment = this.segments[position];
+      this.positions.set(segment.index, position);
+      offsets[position + 1] = offsets[position] + this.heightOf(segment);
+    }
+    this.offsets = offsets;
+    this.layoutDirty = false;
+  }
+
+  heightOf(segment) {
+    const measured = this.heights.get(segment.index);
+    if (measured !== undefined) return measured;
+    const length = segment.text ? segment.text.length : 0;
+    const lines = Math.max(1, Math.ceil(length / this.charactersPerLine));
+    return SEGMENT_CHROME_PX + lines * LINE_HEIGHT_PX;
+  }
+
+  updateLineWidth() {
+    this.charactersPerLine = Math.max(
+      20,
+      Math.floor(
+        (this.transcriptContainer.clientWidth - 80) / CHARACTER_WIDTH_PX,
+      ),
+    );
+  }
+
+  /**
+   * Position of the segment at a vertical offset into the transcript,
+   * clamped to the loaded segments
+   */
+  positionAtOffset(offset) {
+    let low = 0;
+    let high = this.segments.length;
+    while (low < high) {
+      const middle = (low + high) >>> 1;
+      if (this.offsets[middle + 1] <= offset) {
+        low = middle + 1;
+      } else {
+        high = middle;
+      }
+    }
+    return Math.min(low, this.segments.length - 1);
+  }
+
+  /**
+   * Where the segment list starts within the scrollable content
+   */
+  listTop() {
+    const container = this.transcriptContainer;
+    return (
+      this.topSpacer.getBoundingClientRect().top -
+      container.getBoundingClientRect().top +
+      container.scrollTop
+    );
+  }
+
+  sizeSpacers() {
+    if (this.first < 0) return;
+    const total = this.offsets[this.segments.length];
+    this.topSpacer.style.height = `${this.offsets[this.first]}px`;
+    this.bottomSpacer.style.height = `${total - this.offsets[this.last + 1]}px`;
+  }
+
+  scrollToSegment(segment) {
+    if (!this.content) return;
+    this.layout();
+    const position = this.positions.get(segment.index);
+    if (position === undefined) return;
+
+    const container = this.transcriptContainer;
+    const top = Math.max(
+      0,
+      this.listTop() +
+        this.offsets[position] -
+        (container.clientHeight - this.heightOf(segment)) / 2,
+    );
+    // Long jumps land instantly; animating them would render every
+    // segment on the way
+    const distance = Math.abs(top - container.scrollTop);
+    container.scrollTo({
+      top,
+      behavior: distance > container.clientHeight * 2 ? "auto" : "smooth",
+    });
+    this.scheduleUpdate();
+  }
+
+  segmentIndex(segment, position) {
+    return segment.index !== undefined ? segment.index : position;
+  }
+
+  assignSpeakerNumber(segment) {
+    if (segment.speaker !== undefined && !this.speakerMap[segment.speaker]) {
+      this.speakerCount++;
+      this.speakerMap[segment.speaker] = this.speakerCount;
+    }
+  }
+
+  /**
+   * Words rendered as individually highlighted spans for a segment
+   */
+  segmentWords(segment) {
+    if (!this.isWhisperModel && segment.words && segment.words.length > 0) {
+      return segment.words;
+    }
+    if (
+      this.isWhisperModel &&
+      segment.displayWords &&
+      segment.displayWords.length > 0
+    ) {
+      return segment.displayWords;
+    }
+    return [];
+  }
+
+  segmentTimeRange(segment) {
+    // Get time values for segment, accounting for different property names
+    const startTime =
+      segment.offsetSeconds || segment.offsetMilliseconds / 1000 || 0;
+    const endTime =
+      segment.endSeconds ||
+      (segment.offsetMilliseconds + segment.durationMilliseconds) / 1000 ||
+      0;
+    return [startTime, endTime];
+  }
+
+  wordTimeRange(word) {
+    if (this.isWhisperModel) {
+      // Get timing info from the displayWords format
+      const startTime = word.offsetSeconds || word.offset / 1000 || 0;
       const endTime =
+        startTime + (word.durationSeconds || word.duration / 1000 || 0.5);
+      return [startTime, endTime];
+    }
+    // Get timing info, handling different property names
+    const startTime = word.offsetSeconds || word.offsetMilliseconds / 1000;
+    const endTime =
+      word.endSeconds ||
+      (word.offsetMilliseconds + word.durationMilliseconds) / 1000;
+    return [startTime, endTime];
+  }
+
+  createSegmentHtml(segment, index) {
+    const speakerNumber =
+      segment.speaker !== undefined && this.speakerMap[segment.speaker]
+        ? this.speakerMap[segment.speaker]
+        : 1;
+    const speakerNum = speakerNumber % 6 || 6; // Limit to 6 colors, cycling
+
+    // Process words with confidence
+    let processedText = segment.text;
+
+    // Handle word-level highlighting based on model type
+    const words = this.segmentWords(segment);
+    if (words.length > 0 && !this.isWhisperModel) {
+      // Standard model with confidence scores
+      processedText = this.createHighlightedText(words, segment.text);
+    } else if (words.length > 0) {
+      // Whisper model with display words
+      processedText = this.createWhisperHighlightedText(words, segment.text);
+    }
+
+    // Format timestamp display in a user-friendly way
+    const start = this.formatTimestamp(
+      segment.start ||
+        segment.offsetSeconds ||
+        segment.offsetMilliseconds / 1000,
+    );
+    const end = this.formatTimestamp(
+      segment.end ||
         segment.endSeconds ||
-        (segment.offsetMilliseconds + segment.durationMilliseconds) / 1000 ||
-        0;
+        (segment.offsetMilliseconds + segment.durationMilliseconds) / 1000,
+    );
+    const timestampDisplay = `${start} - ${end}`;
 
-      html += `
+    const [startTime, endTime] = this.segmentTimeRange(segment);
+
+    return `
         <div class="speaker-segment speaker-${speakerNum}" data-index="${index}" data-start="${startTime}" data-end="${endTime}">
           <span class="timestamp">${timestampDisplay}</span>
-          <span class="speaker-label">Speaker ${segment.speaker !== undefined ? speakerMap[segment.speaker] : 1}</span>
+          <span class="speaker-label">Speaker ${speakerNumber}</span>
           <span class="segment-text">${processedText}</span>
         </div>
       `;
-    });
-
-    this.transcriptContainer.innerHTML = html;
   }
 
   createHighlightedText(words, originalText) {
@@ -124,11 +583,7 @@ export class TranscriptRendererComponent {
         confidenceClass = "medium-confidence";
       }
 
-      // Get timing info, handling different property names
-      const startTime = word.offsetSeconds || word.offsetMilliseconds / 1000;
-      const endTime =
-        word.endSeconds ||
-        (word.offsetMilliseconds + word.durationMilliseconds) / 1000;
+      const [startTime, endTime] = this.wordTimeRange(word);
 
       highlightedText += `<span class="word-highlight ${confidenceClass}" data-start="${startTime}" data-end="${endTime}">
         ${word.word || word.text}
@@ -146,10 +601,7 @@ export class TranscriptRendererComponent {
       // Whisper doesn't provide confidence scores, so we'll use high-confidence for all
       const confidenceClass = "high-confidence";
 
-      // Get timing info from the displayWords format
-      const startTime = word.offsetSeconds || word.offset / 1000 || 0;
-      const endTime =
-        startTime + (word.durationSeconds || word.duration / 1000 || 0.5);
+      const [startTime, endTime] = this.wordTimeRange(word);
 
       highlightedText += `<span class="word-highlight ${confidenceClass}" data-start="${startTime}" data-end="${endTime}">
         ${word.text || word.word || word.display}
@@ -167,11 +619,13 @@ export class TranscriptRendererComponent {
   }
 
   showEmpty() {
+    this.resetLayout();
     this.transcriptContainer.innerHTML =
       '<div class="alert alert-warning">No transcript data found.</div>';
   }
 
   showError(message) {
+    this.resetLayout();
     this.transcriptContainer.innerHTML = `
       <div class="alert alert-danger">
         <i class="fas fa-exclamation-triangle me-2"></i>
@@ -181,50 +635,67 @@ export class TranscriptRendererComponent {
   }
 
   highlightSegmentAtTime(currentTime) {
-    const segmentElements = document.querySelectorAll(".speaker-segment");
-    let activeSegment = null;
-
-    segmentElements.forEach((segment) => {
-      const start = parseFloat(segment.dataset.start);
-      const end = parseFloat(segment.dataset.end);
+    const segment = this.segmentTimes.find(currentTime);
 
-      if (currentTime >= start && currentTime <= end) {
-        activeSegment = segment;
-      }
+    // Only act when playback crosses into another segment
+    if (segment === this.currentSegment) return;
+    this.currentSegment = segment;
+    this.paintSegment();
 
-      // Remove active class from all segments
-      segment.classList.remove("active-segment");
-    });
+    // Scroll to active segment if it changed
+    if (segment && this.activeSegment !== segment) {
+      this.activeSegment = segment;
+      this.scrollToSegment(segment);
+    }
+  }
 
-    // Add active class to current segment and scroll if needed
-    if (activeSegment) {
-      activeSegment.classList.add("active-segment");
+  highlightWordAtTime(currentTime) {
+    const word = this.wordTimes.find(currentTime);
+    if (word === this.currentWord) return;
+    this.currentWord = word;
+    this.paintWord();
+  }
 
-      // Scroll to active segment if it changed
-      if (this.activeSegment !== activeSegment) {
-        this.activeSegment = activeSegment;
-        activeSegment.scrollIntoView({ behavior: "smooth", block: "center" });
-      }
+  /**
+   * Mark the current segment when it is materialized. Called on segment
+   * changes and after the rendered range moves
+   */
+  paintSegment() {
+    const entry = this.currentSegment
+      ? this.rendered.get(this.currentSegment.index)
+      : null;
+    const element = entry ? entry.element : null;
+    if (element === this.highlightedSegment) return;
+
+    if (this.highlightedSegment) {
+      this.highlightedSegment.classList.remove("active-segment");
+    }
+    this.highlightedSegment = element;
+    if (element) {
+      element.classList.add("active-segment");
     }
   }
 
-  highlightWordAtTime(currentTime) {
-    document.querySelectorAll(".word-highlight").forEach((wordSpan) => {
-      wordSpan.style.backgroundColor = "";
-
-      const wordStart = parseFloat(wordSpan.dataset.start);
-      const wordEnd = parseFloat(wordSpan.dataset.end);
-
-      if (currentTime >= wordStart && currentTime <= wordEnd) {
-        // Highlight current word
-        if (wordSpan.classList.contains("low-confidence")) {
-          wordSpan.style.backgroundColor = "rgba(239, 68, 68, 0.3)";
-        } else if (wordSpan.classList.contains("medium-confidence")) {
-          wordSpan.style.backgroundColor = "rgba(245, 158, 11, 0.3)";
-        } else {
-          wordSpan.style.backgroundColor = "rgba(67, 97, 238, 0.2)";
-        }
-      }
-    });
+  paintWord() {
+    const entry = this.currentWord
+      ? this.rendered.get(this.currentWord.segment.index)
+      : null;
+    const wordSpan = entry ? entry.words[this.currentWord.wordIndex] : null;
+    if (wordSpan === this.highlightedWord) return;
+
+    if (this.highlightedWord) {
+      this.highlightedWord.style.backgroundColor = "";
+    }
+    this.highlightedWord = wordSpan || null;
+    if (!wordSpan) return;
+
+    // Highlight current word
+    if (wordSpan.classList.contains("low-confidence")) {
+      wordSpan.style.backgroundColor = "rgba(239, 68, 68, 0.3)";
+    } else if (wordSpan.classList.contains("medium-confidence")) {
+      wordSpan.style.backgroundColor = "rgba(245, 158, 11, 0.3)";
+    } else {
+      wordSpan.style.backgroundColor = "rgba(67, 97, 238, 0.2)";
+    }
   }
 }
@@ -0,0 +1,133 @@
+/**
+ * Waveform Component
+ * Renders precomputed min/max peaks and lets the user seek by clicking
+ */
+export class WaveformComponent {
+  constructor(audioPlayer) {
+    this.audioPlayer = audioPlayer;
+    this.canvas = document.getElementById("waveform-canvas");
+    this.peaks = null;
+    this.duration = 0;
+    this.progress = 0;
+  }
+
+  load(peaksUrl) {
+    if (!this.canvas || !peaksUrl) return Promise.resolve(null);
+
+    return window
+      .fetchWithCsrf(peaksUrl)
+      .then((response) => {
+        if (!response.ok) {
+          throw new Error(`Failed to load waveform (HTTP ${response.status})`);
+        }
+        return response.arrayBuffer();
+      })
+      .then((buffer) => {
+        this.peaks = this.parsePeaks(buffer);
+        this.duration = this.peaks.totalSamples / this.peaks.sampleRate;
+        this.canvas.classList.remove("d-none");
+        this.bindEvents();
+        this.draw();
+        return this.peaks;
+      })
+      .catch((error) => {
+        // The waveform is an enhancement; the player works without it
+        console.warn("Waveform unavailable:", error.message);
+        return null;
+      });
+  }
+
+  parsePeaks(buffer) {
+    const view = new DataView(buffer);
+    const magic = String.fromCharCode(
+      view.getUint8(0),
+      view.getUint8(1),
+      view.getUint8(2),
+      view.getUint8(3),
+    );
+    if (magic !== "PEAK") {
+      throw new Error("Unrecognised peaks format");
+    }
+
+    const sampleRate = view.getUint32(6, true);
+    const totalSamples = Number(view.getBigUint64(10, true));
+    const levelCount = view.getUint16(18, true);
+
+    const levels = [];
+    let dataOffset = 20 + levelCount * 8;
+    for (let i = 0; i < levelCount; i++) {
+      const samplesPerPeak = view.getUint32(20 + i * 8, true);
+      const count = view.getUint32(24 + i * 8, true);
+      levels.push({
+        samplesPerPeak,
+        count,
+        data: new Int8Array(buffer, dataOffset, count * 2),
+      });
+      dataOffset += count * 2;
+    }
+
+    return { sampleRate, totalSamples, levels };
+  }
+
+  pickLevel(width) {
+    // Coarsest level that still has at least one peak per pixel
+    const levels = this.peaks.levels;
+    for (let i = levels.length - 1; i >= 0; i--) {
+      if (levels[i].count >= width) return levels[i];
+    }
+    return levels[0];
+  }
+
+  bindEvents() {
+    this.canvas.addEventListener("click", (event) => {
+      const rect = this.canvas.getBoundingClientRect();
+      const fraction = (event.clientX - rect.left) / rect.width;
+      this.audioPlayer.seekToTime(fraction * this.duration);
+    });
+
+    window.addEventListener("resize", () => this.draw());
+  }
+
+  onTimeUpdate(currentTime) {
+    if (!this.peaks || !this.duration) return;
+    this.progress = currentTime / this.duration;
+    this.draw();
+  }
+
+  draw() {
+    if (!this.peaks || this.peaks.levels.length === 0) return;
+
+    const ratio = window.devicePixelRatio || 1;
+    const width = this.canvas.clientWidth;
+    const height = this.canvas.clientHeight;
+    if (this.canvas.width !== width * ratio) {
+      this.canvas.width = width * ratio;
+      this.canvas.height = height * ratio;
+    }
+
+    const ctx = this.canvas.getContext("2d");
+    ctx.setTransform(ratio, 0, 0, ratio, 0, 0);
+    ctx.clearRect(0, 0, width, height);
+
+    const level = this.pickLevel(width);
+    const peaksPerPixel = level.count / width;
+    const middle = height / 2;
+    const progressX = this.progress * width;
+
+    for (let x = 0; x < width; x++) {
+      const start = Math.floor(x * peaksPerPixel);
+      const end = Math.max(start + 1, Math.floor((x + 1) * peaksPerPixel));
+      let min = 0;
+      let max = 0;
+      for (let i = start; i < end && i < level.count; i++) {
+        min = Math.min(min, level.data[i * 2]);
+        max = Math.max(max, level.data[i * 2 + 1]);
+      }
+
+      ctx.fillStyle = x <= progressX ? "#4361ee" : "#c7d0f8";
+      const top = middle - (max / 127) * middle;
+      const bottom = middle - (min / 127) * middle;
+      ctx.fillRect(x, top, 1, Math.max(bottom - top, 1));
+    }
+  }
+}
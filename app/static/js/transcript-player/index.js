@@ -6,6 +6,10 @@ import { AudioPlayerComponent } from "./components/audio-player.js";
 import { TranscriptRendererComponent } from "./components/transcript-renderer.js";
 import { AudioTranscriptSynchronizer } from "./components/audio-transcript-synchronizer.js";
 import { EventBindingsManager } from "./components/event-bindings-manager.js";
+import { WaveformComponent } from "./components/waveform.js";
+import { TranscriptFindComponent } from "./components/transcript-find.js";
+import { SegmentWindowService } from "./services/segment-window-service.js";
+import { decodeTranscript } from "./services/transcript-decoder.js";
 
 class TranscriptPlayerApp {
   constructor() {
@@ -23,6 +27,8 @@ class TranscriptPlayerApp {
       this.audioPlayer,
       this.transcriptRenderer,
     );
+    this.waveform = new WaveformComponent(this.audioPlayer);
+    this.transcriptFind = new TranscriptFindComponent(this.audioPlayer);
 
     this.init();
   }
@@ -30,6 +36,31 @@ class TranscriptPlayerApp {
   init() {
     if (!document.getElementById("transcript-container")) return;
 
+    // Waveform loads independently of the transcript
+    this.waveform.load(document.body.dataset.peaksUrl).then((peaks) => {
+      if (peaks) {
+        this.audioPlayer.registerTimeUpdateCallback(
+          this.waveform.onTimeUpdate.bind(this.waveform),
+        );
+      }
+    });
+
+    this.transcriptFind.init(document.body.dataset.findUrl);
+
+    // Deep links such as search results open the player at ?t=<seconds>
+    const startAt = parseFloat(
+      new URLSearchParams(window.location.search).get("t"),
+    );
+    if (startAt > 0) {
+      this.seekOnLoad(startAt);
+    }
+
+    // Long recordings are loaded a window at a time when the server supports it
+    if (document.body.dataset.segmentsUrl) {
+      this.initWindowed(startAt > 0 ? startAt * 1000 : 0);
+      return;
+    }
+
     // Fetch transcript data
     this.fetchTranscript()
       .then((data) => {
@@ -80,6 +111,67 @@ class TranscriptPlayerApp {
       });
   }
 
+  seekOnLoad(seconds) {
+    const audioElement = this.audioPlayer.audioElement;
+    if (!audioElement) return;
+    if (audioElement.readyState >= 1) {
+      this.audioPlayer.seekToTime(seconds);
+      return;
+    }
+    audioElement.addEventListener(
+      "loadedmetadata",
+      () => this.audioPlayer.seekToTime(seconds),
+      { once: true },
+    );
+  }
+
+  initWindowed(startMs = 0) {
+    this.windowService = new SegmentWindowService(
+      document.body.dataset.segmentsUrl,
+      parseInt(document.body.dataset.transcriptWindowMs, 10) || undefined,
+    );
+    const firstWindow = this.windowService.windowIndexAt(startMs);
+
+    this.windowService
+      .loadWindow(firstWindow)
+      .then((segments) => {
+        if (this.windowService.segmentCount === 0) {
+          this.transcriptRenderer.showEmpty();
+          return;
+        }
+
+        this.transcriptData = { segments };
+        this.transcriptRenderer.setData(this.transcriptData, {
+          windowed: true,
+        });
+        this.transcriptRenderer.render();
+        this.synchronizer.setData(this.transcriptData);
+        this.eventBindings.bindEvents();
+
+        // Later windows are merged into the rendered transcript as they arrive
+        this.windowService.onSegments((windowSegments) =>
+          this.transcriptRenderer.addSegments(windowSegments),
+        );
+        this.audioPlayer.registerTimeUpdateCallback((currentTime) =>
+          this.windowService.ensureAround(currentTime * 1000),
+        );
+        this.transcriptRenderer.observeEnd(() => {
+          if (this.windowService.hasMore()) {
+            this.windowService.loadNext();
+          }
+        });
+        this.windowService.loadWindow(firstWindow + 1).catch((error) => {
+          console.error("Error prefetching transcript window:", error);
+        });
+      })
+      .catch((error) => {
+        console.error("Error loading transcript:", error);
+        this.transcriptRenderer.showError(
+          `Failed to load transcript: ${error.message}.`,
+        );
+      });
+  }
+
   fetchTranscript() {
     const transcriptUrl = document.body.dataset.transcriptUrl;
 
@@ -88,7 +180,7 @@ class TranscriptPlayerApp {
     }
 
     return window
-      .fetchWithCsrf(transcriptUrl)
+      .fetchWithCsrf(`${transcriptUrl}?format=columnar`)
       .then((response) => {
         if (!response.ok) {
           throw new Error(
@@ -97,6 +189,7 @@ class TranscriptPlayerApp {
         }
         return response.json();
       })
+      .then(decodeTranscript)
       .then((data) => {
         // Process and normalize the transcript data if needed
         if (!data.segments && data.results && data.results.length > 0) {
@@ -0,0 +1,113 @@
+import { decodeTranscript } from "./transcript-decoder.js";
+
+/**
+ * Segment Window Service
+ * Loads transcript segments one time window at a time so long recordings
+ * never have to be fetched or rendered in full
+ */
+export class SegmentWindowService {
+  constructor(segmentsUrl, windowMs = 300000) {
+    this.segmentsUrl = segmentsUrl;
+    this.windowMs = windowMs;
+    this.windows = new Map(); // window index -> Promise of segments
+    this.loadedWindows = new Set();
+    this.durationMs = null;
+    this.segmentCount = null;
+    this.segmentsCallback = null;
+  }
+
+  onSegments(callback) {
+    this.segmentsCallback = callback;
+  }
+
+  windowIndexAt(ms) {
+    return Math.max(0, Math.floor(ms / this.windowMs));
+  }
+
+  windowCount() {
+    if (this.durationMs === null) return null;
+    return Math.max(1, Math.ceil(this.durationMs / this.windowMs));
+  }
+
+  loadWindow(index) {
+    const count = this.windowCount();
+    if (index < 0 || (count !== null && index >= count)) {
+      return Promise.resolve([]);
+    }
+    if (this.windows.has(index)) {
+      return this.windows.get(index);
+    }
+
+    const fromMs = index * this.windowMs;
+    const params = new URLSearchParams({
+      from_ms: fromMs,
+      to_ms: fromMs + this.windowMs,
+      include_words: 1,
+      format: "columnar",
+    });
+    const promise = window
+      .fetchWithCsrf(`${this.segmentsUrl}?${params}`)
+      .then((response) => {
+        if (!response.ok) {
+          throw new Error(
+            `Failed to load transcript segments (HTTP ${response.status})`,
+          );
+        }
+        return response.json();
+      })
+      .then(decodeTranscript)
+      .then((data) => {
+        this.durationMs = data.duration_ms;
+        this.segmentCount = data.segment_count;
+        this.loadedWindows.add(index);
+        if (this.segmentsCallback && data.segments.length > 0) {
+          this.segmentsCallback(data.segments);
+        }
+        return data.segments;
+      })
+      .catch((error) => {
+        // Forget the failed window so it is retried on the next request
+        this.windows.delete(index);
+        throw error;
+      });
+
+    this.windows.set(index, promise);
+    return promise;
+  }
+
+  /**
+   * Make sure the window containing a playback position is loaded and
+   * prefetch the one after it
+   */
+  ensureAround(ms) {
+    const index = this.windowIndexAt(ms);
+    return Promise.all([
+      this.loadWindow(index),
+      this.loadWindow(index + 1),
+    ]).catch((error) => {
+      console.error("Error loading transcript window:", error);
+    });
+  }
+
+  /**
+   * Load the first window after the last loaded one, used when the reader
+   * scrolls past the end of what has been rendered
+   */
+  loadNext() {
+    const loaded = Array.from(this.loadedWindows);
+    const next = loaded.length > 0 ? Math.max(...loaded) + 1 : 0;
+    return this.loadWindow(next).catch((error) => {
+      console.error("Error loading transcript window:", error);
+      return [];
+    });
+  }
+
+  hasMore() {
+    const count = this.windowCount();
+    if (count === null) return true;
+    for (let index = 0; index < count; index++) {
+      if (!this.loadedWindows.has(index)) return true;
+    }
+    return false;
+  }
+}
@@ -0,0 +1,102 @@
+/**
+ * Time Index
+ * Sorted start/end times with a value per entry, so the entry playing at a
+ * given time is found by binary search instead of a scan
+ */
+export class TimeIndex {
+  constructor() {
+    this.starts = [];
+    this.ends = [];
+    this.values = [];
+  }
+
+  get length() {
+    return this.starts.length;
+  }
+
+  /**
+   * Number of entries starting at or before the given time
+   */
+  upperBound(time) {
+    let low = 0;
+    let high = this.starts.length;
+    while (low < high) {
+      const middle = (low + high) >>> 1;
+      if (this.starts[middle] <= time) {
+        low = middle + 1;
+      } else {
+        high = middle;
+      }
+    }
+    return low;
+  }
+
+  /**
+   * Add { start, end, value } entries, such as the segments of a newly
+   * loaded window. The new entries are sorted and then merged with the
+   * existing ones in a single pass
+   */
+  insert(entries) {
+    if (entries.length === 0) return;
+    let added = entries;
+    for (let k = 1; k < added.length; k++) {
+      if (added[k].start < added[k - 1].start) {
+        added = entries.slice().sort((a, b) => a.start - b.start);
+        break;
+      }
+    }
+
+    // Windows usually arrive in playback order, so appending is the norm
+    const count = this.starts.length;
+    if (count === 0 || added[0].start >= this.starts[count - 1]) {
+      added.forEach((entry) => {
+        this.starts.push(entry.start);
+        this.ends.push(entry.end);
+        this.values.push(entry.value);
+      });
+      return;
+    }
+
+    const starts = [];
+    const ends = [];
+    const values = [];
+    let i = 0;
+    let j = 0;
+    while (i < this.starts.length || j < added.length) {
+      if (
+        j >= added.length ||
+        (i < this.starts.length && this.starts[i] <= added[j].start)
+      ) {
+        starts.push(this.starts[i]);
+        ends.push(this.ends[i]);
+        values.push(this.values[i]);
+        i++;
+      } else {
+        starts.push(added[j].start);
+        ends.push(added[j].end);
+        values.push(added[j].value);
+        j++;
+      }
+    }
+    this.starts = starts;
+    this.ends = ends;
+    this.values = values;
+  }
+
+  /**
+   * Value of the entry playing at the given time, or null in a pause
+   */
+  find(time) {
+    const position = this.upperBound(time) - 1;
+    if (position >= 0 && time <= this.ends[position]) {
+      return this.values[position];
+    }
+    return null;
+  }
+
+  clear() {
+    this.starts = [];
+    this.ends = [];
+    this.values = [];
+  }
+}
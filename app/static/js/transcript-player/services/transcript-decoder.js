@@ -0,0 +1,44 @@
+/**
+ * Transcript Decoder
+ * Expands the columnar transcript wire format into the segment objects the
+ * renderer works with. Timestamps are derived from milliseconds here rather
+ * than sent pre-formatted by the server.
+ */
+export const COLUMNAR_FORMAT = "columnar";
+
+export function decodeTranscript(data) {
+  if (!data || data.format !== COLUMNAR_FORMAT) {
+    return data;
+  }
+
+  const scale = data.confidenceScale || 255;
+  const words = data.words || [];
+  const segments = data.segments.map((entry) => {
+    const segment = {
+      offsetMilliseconds: entry.o,
+      durationMilliseconds: entry.d,
+      speaker: entry.s === null ? undefined : entry.s,
+      text: entry.t,
+      confidence: entry.c / scale,
+      words: [],
+    };
+    if (entry.i !== undefined) {
+      segment.index = entry.i;
+    }
+    if (entry.w) {
+      for (let i = 0; i < entry.w.length; i++) {
+        segment.words.push({
+          word: words[entry.w[i]],
+          offsetMilliseconds: entry.o + entry.wo[i],
+          durationMilliseconds: entry.wd[i],
+          confidence: entry.wc[i] / scale,
+        });
+      }
+    }
+    return segment;
+  });
+
+  const decoded = { ...data, segments };
+  delete decoded.words;
+  return decoded;
+}
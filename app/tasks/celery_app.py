@@ -10,6 +10,10 @@ def make_celery(app):
     )
     celery.conf.update(app.config)
     celery.conf.broker_connection_retry_on_startup = True
+    # Flask only loads upper-case config keys, so Celery's own lower-case
+    # settings are mapped explicitly
+    celery.conf.task_routes = app.config.get("CELERY_TASK_ROUTES")
+    celery.conf.beat_schedule = app.config.get("CELERY_BEAT_SCHEDULE", {})
 
     class ContextTask(celery.Task):
 
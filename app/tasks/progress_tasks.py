@@ -0,0 +1,24 @@
+import logging
+from celery import shared_task
+from flask import current_app
+from app.services.progress_store import get_progress_store, flush_progress
+from app.errors.logger import log_exception
+
+logger = logging.getLogger("app.tasks.progress")
+
+
+@shared_task(ignore_result=True)
+def flush_file_progress():
+    """
+    Periodic task that copies live transcription progress into the files
+    table, so the database stays close to the progress store without a
+    commit per poll.
+    """
+    try:
+        flushed = flush_progress(get_progress_store(current_app))
+    except Exception as e:
+        log_exception(e, logger)
+        return {"status": "error", "message": str(e)}
+    if flushed:
+        logger.debug(f"Flushed progress for {flushed} files")
+    return {"status": "success", "flushed": flushed}
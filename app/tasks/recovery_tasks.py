@@ -0,0 +1,123 @@
+import logging
+from datetime import datetime, timedelta
+from celery import shared_task
+from flask import current_app
+from app.models.file import File
+from app.services.db_session import unit_of_work, mark_file_error
+from app.services.file_lease import file_lease, dispatch_registry
+from app.services.fair_scheduler import get_fair_scheduler
+from app.tasks.transcription_tasks import (
+    dispatch_transcription,
+    end_pipeline,
+    get_transcription_service,
+)
+from app.errors.exceptions import TranscriptionError
+from app.errors.logger import log_exception
+
+logger = logging.getLogger("app.tasks.recovery")
+
+
+def orphaned_files(limit):
+    """
+    Files left in processing with no task queued for them, no worker
+    holding their lease and no place in the fair-share queues, oldest
+    first.
+    """
+    with unit_of_work() as session:
+        rows = (
+            session.query(
+                File.id,
+                File.transcription_id,
+                File.upload_time,
+                File.transcription_started_at,
+                File.current_stage,
+            )
+            .filter(File.status == "processing")
+            .order_by(File.upload_time)
+            .limit(limit)
+            .all()
+        )
+    registry = dispatch_registry(current_app)
+    scheduler = get_fair_scheduler(current_app)
+    return [
+        row
+        for row in rows
+        if not registry.pending(row.id)
+        and not file_lease(current_app, row.id).held()
+        and not (scheduler and scheduler.is_pending(row.id))
+    ]
+
+
+def recover_file(row, transcription_service, stale_before):
+    """
+    Resume, resubmit or fail one orphaned file. Returns the action taken.
+
+    The Azure job is checked before the file's age, so a finished job is
+    always collected. Only files whose transcription started before
+    stale_before and that have no usable job are failed as abandoned.
+    """
+    job_status = None
+    if row.transcription_id and transcription_service is not None:
+        try:
+            status_info = transcription_service.get_transcription_status(
+                row.transcription_id
+            )
+        except TranscriptionError as e:
+            if e.payload.get("status_code") != 404:
+                # Azure is unreachable or throttled; try again next scan
+                raise
+            logger.info(f"Job {row.transcription_id} is gone: {str(e)}")
+        else:
+            job_status = status_info["status"]
+            if job_status == "Failed":
+                error = status_info.get("properties", {}).get("error", {})
+                mark_file_error(
+                    row.id,
+                    f"Transcription failed: {error.get('message', 'Unknown error')}",
+                )
+                end_pipeline(row.id)
+                return "failed"
+    started = row.transcription_started_at or row.upload_time
+    if job_status != "Succeeded" and started and started < stale_before:
+        mark_file_error(row.id, "Transcription abandoned after a worker restart")
+        end_pipeline(row.id)
+        return "failed"
+    # transcribe_file attaches to a live or finished job rather than resubmitting
+    dispatch_transcription(row.id)
+    return "resumed" if job_status else "resubmitted"
+
+
+@shared_task(ignore_result=True)
+def recover_transcriptions():
+    """
+    Find transcriptions orphaned by a worker that died mid-poll and put them
+    back in the pipeline. Files with a live or finished Azure job are
+    re-attached, files that never reached Azure are resubmitted, and files
+    whose transcription started more than RECOVERY_STALE_HOURS ago without
+    a usable job are marked failed. Runs at worker startup and on the beat
+    schedule; leases and dispatch keys keep concurrent scans from
+    duplicating work.
+    """
+    config = current_app.config
+    stale_before = datetime.utcnow() - timedelta(hours=config["RECOVERY_STALE_HOURS"])
+    try:
+        rows = orphaned_files(config["RECOVERY_BATCH_SIZE"])
+    except Exception as e:
+        log_exception(e, logger)
+        return {"status": "error", "message": str(e)}
+    if not rows:
+        return {"status": "success", "recovered": {}}
+    transcription_service = None
+    if config["AZURE_SPEECH_KEY"] and config["AZURE_SPEECH_REGION"]:
+        transcription_service = get_transcription_service()
+    recovered = {}
+    for row in rows:
+        try:
+            action = recover_file(row, transcription_service, stale_before)
+        except Exception as e:
+            log_exception(e, logger)
+            action = "error"
+        recovered[action] = recovered.get(action, 0) + 1
+        logger.info(f"Recovery: file {row.id} {action}")
+    logger.info(f"Recovery scan finished: {recovered}")
+    return {"status": "success", "recovered": recovered}
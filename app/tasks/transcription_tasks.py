@@ -4,11 +4,39 @@ import time
 import traceback
 import sys
 import json
+import hashlib
+import uuid
 from celery import shared_task
 from app.extensions import db
 from app.models.file import File
 from app.services.blob_storage import BlobStorageService
 from app.services.batch_transcription_service import BatchTranscriptionService
+from app.services.audio_processing import (
+    SilenceMap,
+    remap_transcript_offsets,
+    compute_waveform_peaks,
+)
+from app.services.transcript_cache import get_transcript_cache
+from app.services.progress_store import get_progress_store
+from app.services.file_lease import file_lease, dispatch_registry
+from app.services.fair_scheduler import get_fair_scheduler
+from app.services.rate_limiter import speech_rate_limiter
+from app.services.circuit_breaker import circuit_open_error
+from app.services.db_session import (
+    unit_of_work,
+    file_unit,
+    update_file,
+    mark_file_error,
+)
+from app.services.transcript_search import ensure_search_index
+from app.services.transcript_segments import replace_transcript_segments
+from app.services.transcript_artifacts import (
+    artifact_blob_path,
+    store_processed_transcript,
+    store_word_index,
+    TRANSCRIPT_ARTIFACT,
+    PEAKS_ARTIFACT,
+)
 from flask import current_app
 from datetime import datetime, timedelta
 from app.errors.exceptions import (
@@ -45,189 +73,511 @@ def get_blob_service():
         )
 
 
-@shared_task
-def transcribe_file(file_id, model_locale=None):
+def dispatch_transcription(file_id, model_locale=None):
     """
-    Main Celery task that orchestrates the batch transcription pipeline
-    using Azure's Speech Service Batch Transcription API.
+    Queue transcribe_file for a file unless a transcription of it is
+    already queued or running. The file id is the idempotency key, so
+    double submits and overlapping upload paths queue a single task.
+
+    Returns:
+        str: the Celery task id, which is the existing task's id when the
+        dispatch was deduplicated
     """
-    logger.info(f"=== Starting transcription pipeline for file {file_id} ===")
-    start_time = time.time()
+    registry = dispatch_registry(current_app)
+    task_id = str(uuid.uuid4())
+    existing = registry.claim(file_id, task_id)
+    if existing:
+        logger.info(f"Transcription of file {file_id} already queued as {existing}")
+        return existing
     try:
-        file = db.session.query(File).filter(File.id == file_id).first()
-        if not file:
-            logger.error(f"File with ID {file_id} not found in DB.")
-            return {"status": "error", "message": f"No File with ID {file_id}"}
-    except Exception as e:
-        log_exception(e, logger)
+        transcribe_file.apply_async(
+            (file_id,), {"model_locale": model_locale}, task_id=task_id
+        )
+    except Exception:
+        registry.forget(file_id)
+        raise
+    return task_id
+
+
+def queue_transcription(file_id, user_id, model_locale=None, estimated_seconds=None):
+    """
+    Queue a file for transcription behind the fair-share scheduler, which
+    dispatches it once its user and the Speech resource both have a free
+    in-flight slot. Dispatches straight away when no scheduler is
+    configured.
+    """
+    scheduler = get_fair_scheduler(current_app)
+    if scheduler is None:
+        return dispatch_transcription(file_id, model_locale=model_locale)
+    scheduler.enqueue(
+        user_id or "anonymous",
+        file_id,
+        model_locale,
+        estimated_seconds=estimated_seconds,
+    )
+    pump_transcriptions(scheduler)
+    return None
+
+
+def pump_transcriptions(scheduler=None):
+    """Dispatch queued files while users and the Speech resource have slots."""
+    scheduler = scheduler or get_fair_scheduler(current_app)
+    if scheduler is None:
+        return 0
+    jobs = scheduler.take()
+    for job in jobs:
+        try:
+            dispatch_transcription(job["file_id"], model_locale=job["model_locale"])
+        except Exception as e:
+            log_exception(e, logger)
+            scheduler.remove(job["file_id"])
+            mark_file_error(job["file_id"], f"Could not start transcription: {str(e)}")
+    return len(jobs)
+
+
+def end_pipeline(file_id, lease=None):
+    """
+    Clean up after a file leaves the pipeline, whatever the outcome: drop
+    its live progress, release its lease and free its fair-share slot for
+    the next queued file.
+    """
+    get_progress_store(current_app).clear(file_id)
+    if lease is not None:
+        lease.release()
+    scheduler = get_fair_scheduler(current_app)
+    if scheduler is not None:
+        try:
+            if scheduler.remove(file_id):
+                pump_transcriptions(scheduler)
+        except Exception as e:
+            log_exception(e, logger)
+
+
+@shared_task(ignore_result=True)
+def schedule_transcriptions():
+    """
+    Periodic pump of the fair-share queues, in case a finishing task could
+    not dispatch the next file or in-flight slots expired.
+    """
+    return {"status": "success", "dispatched": pump_transcriptions()}
+
+
+# Azure job states a retried task can keep following instead of resubmitting
+ATTACHABLE_STATES = ("NotStarted", "Running", "Succeeded")
+
+
+def attachable_transcription(transcription_service, transcription_id):
+    """
+    Return the id of an earlier Azure job if it is still usable, else None.
+    Only a 404 means the job is gone; any other error is raised, since
+    submitting again on a transient failure would pay for a duplicate job.
+    """
+    try:
+        status = transcription_service.get_transcription_status(transcription_id)
+    except TranscriptionError as e:
+        if e.payload.get("status_code") != 404:
+            raise
+        logger.info(f"Earlier transcription {transcription_id} is gone: {str(e)}")
+        return None
+    if status["status"] in ATTACHABLE_STATES:
+        return transcription_id
+    return None
+
+
+def get_transcription_service(locale=None):
+    subscription_key = current_app.config["AZURE_SPEECH_KEY"]
+    region = current_app.config["AZURE_SPEECH_REGION"]
+    if not subscription_key or not region:
+        raise TranscriptionError(
+            "Missing Azure Speech API configuration. Check AZURE_SPEECH_KEY and AZURE_SPEECH_REGION.",
+            service="azure_speech",
+        )
+    return BatchTranscriptionService(
+        subscription_key,
+        region,
+        locale=locale,
+        rate_limiter=speech_rate_limiter(current_app, subscription_key, region),
+        request_deadline=current_app.config["SPEECH_REQUEST_DEADLINE"],
+    )
+
+
+def transcription_failed(file_id, lease, e):
+    """Record a pipeline error on the file and give up its lease."""
+    if isinstance(e, (TranscriptionError, StorageError, DatabaseError)):
+        logger.error(f"{type(e).__name__} in task for file {file_id}: {str(e)}")
+        message = str(e)
+        result = {"status": "error", "message": str(e), "code": e.error_code}
+    else:
+        logger.error(f"Unhandled exception in task for file {file_id}: {str(e)}")
+        logger.error(traceback.format_exc())
+        message = f"Unexpected error: {str(e)}"
+        result = {"status": "error", "message": str(e)}
+    mark_file_error(file_id, message)
+    end_pipeline(file_id, lease)
+    return result
+
+
+@shared_task
+def transcribe_file(file_id, model_locale=None, lease_token=None):
+    """
+    First stage of the batch transcription pipeline: submit a file to
+    Azure's Speech Service, or attach to its live job, then hand the job to
+    poll_transcription.
+
+    Takes the file's lease, so duplicate deliveries skip rather than submit
+    a second Azure job. The lease's token travels with the job through the
+    poll and finalize stages, which renew it and release it at the end.
+    A submission deferred while the Speech circuit is open passes its
+    token back in, keeping the file leased while it waits.
+    """
+    lease = file_lease(current_app, file_id, token=lease_token)
+    acquired = lease.resume() if lease_token else lease.acquire()
+    if not acquired:
+        logger.info(f"File {file_id} is already being transcribed; skipping")
         return {
-            "status": "error",
-            "message": f"Database error looking up file: {str(e)}",
+            "status": "skipped",
+            "file_id": file_id,
+            "message": "Transcription already in progress",
         }
+    # The lease now guards the file, so a key left behind if this worker
+    # dies cannot hide the file from recovery
+    dispatch_registry(current_app).forget(file_id)
+    logger.info(f"=== Starting transcription pipeline for file {file_id} ===")
     try:
-        file.status = "processing"
-        file.current_stage = "transcribing"
-        file.progress_percent = 10
-        db.session.commit()
+        # Database access happens in short units of work that re-load the
+        # file by id, so no connection is held while waiting on Azure
+        with file_unit(file_id) as file:
+            if file.status == "completed":
+                logger.info(f"File {file_id} is already transcribed; skipping")
+                end_pipeline(file_id, lease)
+                return {"status": "skipped", "file_id": file_id}
+            file.status = "processing"
+            file.current_stage = "transcribing"
+            file.progress_percent = 10
+            model_id = file.model_id
+            model_name = file.model_name
+            audio_url = file.submission_blob_url or file.blob_url
+            compacted = bool(file.submission_blob_url and file.silence_map)
+            previous_transcription_id = file.transcription_id
         logger.info(f"File {file_id} set to processing state.")
+    except ResourceNotFoundError:
+        logger.error(f"File with ID {file_id} not found in DB.")
+        end_pipeline(file_id, lease)
+        return {"status": "error", "message": f"No File with ID {file_id}"}
     except Exception as e:
         log_exception(e, logger)
+        end_pipeline(file_id, lease)
         return {
             "status": "error",
             "message": f"Database error updating file status: {str(e)}",
         }
     try:
-        subscription_key = current_app.config["AZURE_SPEECH_KEY"]
-        region = current_app.config["AZURE_SPEECH_REGION"]
-        if not subscription_key or not region:
-            raise TranscriptionError(
-                "Missing Azure Speech API configuration. Check AZURE_SPEECH_KEY and AZURE_SPEECH_REGION.",
-                service="azure_speech",
-            )
-        transcription_service = BatchTranscriptionService(
-            subscription_key, region, locale=model_locale
-        )
-        model_id = file.model_id
+        transcription_service = get_transcription_service(model_locale)
         if model_id:
             logger.info(
-                f"Using specified model: {model_id} ({file.model_name or 'unknown'})"
+                f"Using specified model: {model_id} ({model_name or 'unknown'})"
             )
             if model_locale:
                 logger.info(f"Using locale: {model_locale}")
         else:
             logger.info("Using default model (no specific model requested)")
-        logger.info(f"Submitting batch transcription for blob: {file.blob_url}")
-        result_job = transcription_service.submit_transcription(
-            audio_url=file.blob_url,
-            enable_diarization=True,
-            model_id=model_id,
-            locale=model_locale,
+        transcription_id = None
+        if previous_transcription_id:
+            transcription_id = attachable_transcription(
+                transcription_service, previous_transcription_id
+            )
+        if transcription_id:
+            logger.info(f"Attaching to existing transcription {transcription_id}")
+            update_file(file_id, progress_percent=50)
+        else:
+            if compacted:
+                logger.info("Submitting silence-compacted audio for transcription")
+            logger.info(f"Submitting batch transcription for blob: {audio_url}")
+            result_job = transcription_service.submit_transcription(
+                audio_url=audio_url,
+                enable_diarization=True,
+                model_id=model_id,
+                locale=model_locale,
+            )
+            transcription_id = result_job["id"]
+            update_file(file_id, transcription_id=transcription_id, progress_percent=50)
+        if not lease.renew():
+            logger.error(f"Lease on file {file_id} lost after submission")
+            return {"status": "skipped", "file_id": file_id}
+        poll_transcription.delay(file_id, transcription_id, lease.token)
+        return {
+            "status": "submitted",
+            "file_id": file_id,
+            "transcription_id": transcription_id,
+        }
+    except Exception as e:
+        if not circuit_open_error(e):
+            return transcription_failed(file_id, lease, e)
+        # Azure is failing fast; try again once the circuit may have closed,
+        # holding the lease so recovery does not treat the file as orphaned
+        logger.warning(f"Submission of {file_id} deferred: {str(e)}")
+        lease.hand_off()
+        transcribe_file.apply_async(
+            (file_id, model_locale, lease.token),
+            countdown=current_app.config["CIRCUIT_OPEN_SECONDS"],
+        )
+        return {"status": "deferred", "file_id": file_id}
+
+
+def resume_lease(file_id, transcription_id, lease_token):
+    """
+    Take up the lease a poll or finalize task carries from the stage
+    before it. If it expired while the task sat in a queue it is re-taken
+    with the same token, as long as the file is still processing this job.
+    Returns None when another worker holds the lease or the job is stale.
+    """
+    lease = file_lease(current_app, file_id, token=lease_token)
+    if not lease.resume():
+        logger.error(
+            f"Lease on file {file_id} held by another worker; leaving the job to it"
         )
-        transcription_id = result_job["id"]
-        file.transcription_id = transcription_id
-        db.session.commit()
-        file.progress_percent = 50
-        db.session.commit()
-        max_attempts = 120
-        for attempt in range(max_attempts):
-            status_info = transcription_service.get_transcription_status(
+        return None
+    if not lease.retaken:
+        return lease
+    with unit_of_work() as session:
+        row = (
+            session.query(File.status, File.transcription_id)
+            .filter(File.id == file_id)
+            .first()
+        )
+    if (
+        row is None
+        or row.status != "processing"
+        or row.transcription_id != transcription_id
+    ):
+        logger.info(
+            f"File {file_id} has moved on from job {transcription_id}; skipping"
+        )
+        lease.release()
+        return None
+    logger.warning(f"Lease on file {file_id} expired in the queue; re-taken")
+    return lease
+
+
+@shared_task
+def poll_transcription(file_id, transcription_id, lease_token, attempt=0):
+    """
+    Check an Azure job once and re-schedule itself with a countdown while
+    the job runs, so waiting on Azure occupies a queue entry instead of a
+    worker slot. Hands finished jobs to finalize_transcription.
+    """
+    lease = resume_lease(file_id, transcription_id, lease_token)
+    if lease is None:
+        return {"status": "skipped", "file_id": file_id}
+    config = current_app.config
+    max_attempts = config["TRANSCRIPTION_MAX_POLLS"]
+    progress_store = get_progress_store(current_app)
+    try:
+        status_info = get_transcription_service().get_transcription_status(
+            transcription_id
+        )
+        status = status_info["status"]
+        logger.info(
+            f"Transcription {transcription_id} status: {status} (attempt {attempt + 1}/{max_attempts})"
+        )
+        if status == "Succeeded":
+            logger.info("Transcription succeeded; handing off to finalize.")
+            progress_store.record(file_id, 95, "transcribing")
+            finalize_transcription.delay(file_id, transcription_id, lease_token)
+            return {"status": "succeeded", "file_id": file_id}
+        if status == "Failed":
+            error = status_info.get("properties", {}).get("error", {})
+            error_message = error.get("message", "Unknown error")
+            logger.error(f"Transcription failed for {file_id}: {error_message}")
+            mark_file_error(file_id, f"Transcription failed: {error_message}")
+            end_pipeline(file_id, lease)
+            return {"status": "error", "message": error_message}
+        if status == "Running":
+            progress = min(50 + attempt / max_attempts * 40, 90)
+            progress_store.record(file_id, progress, "transcribing")
+        if attempt + 1 >= max_attempts:
+            logger.error(f"Transcription timed out for {file_id}.")
+            mark_file_error(file_id, "Transcription timed out")
+            end_pipeline(file_id, lease)
+            return {"status": "error", "message": "Transcription timed out"}
+        poll_transcription.apply_async(
+            (file_id, transcription_id, lease_token, attempt + 1),
+            countdown=config["TRANSCRIPTION_POLL_INTERVAL"],
+        )
+        return {"status": "polling", "file_id": file_id, "attempt": attempt + 1}
+    except TranscriptionError as e:
+        throttled = e.payload.get("status_code") == 429 or circuit_open_error(e)
+        if not throttled or attempt + 1 >= max_attempts:
+            return transcription_failed(file_id, lease, e)
+        # Throttled past the request deadline, or the Speech circuit is
+        # open; the job itself is fine
+        logger.warning(f"Status check for {file_id} deferred: {str(e)}")
+        poll_transcription.apply_async(
+            (file_id, transcription_id, lease_token, attempt + 1),
+            countdown=config["TRANSCRIPTION_POLL_INTERVAL"],
+        )
+        return {"status": "throttled", "file_id": file_id, "attempt": attempt + 1}
+    except Exception as e:
+        return transcription_failed(file_id, lease, e)
+
+
+@shared_task
+def finalize_transcription(file_id, transcription_id, lease_token):
+    """
+    Last stage of the pipeline: download a finished job's result, store the
+    transcript artifacts and segments, and mark the file completed.
+    """
+    lease = resume_lease(file_id, transcription_id, lease_token)
+    if lease is None:
+        return {"status": "skipped", "file_id": file_id}
+    start_time = time.time()
+    # Big results can take a while; keep the lease alive until we are done
+    with lease:
+        try:
+            with file_unit(file_id) as file:
+                filename = file.filename
+                silence_map = file.silence_map if file.submission_blob_url else None
+            # Storing the segments below indexes them for search
+            ensure_search_index()
+            logger.info(
+                "Retrieving final transcription JSON for job %s", transcription_id
+            )
+            result_json = get_transcription_service().get_transcription_result(
                 transcription_id
             )
-            status = status_info["status"]
-            logger.info(
-                f"Transcription {transcription_id} status: {status} (attempt {attempt + 1}/{max_attempts})"
+            if silence_map:
+                logger.info("Remapping transcript offsets to original audio time")
+                remap_transcript_offsets(result_json, SilenceMap.from_json(silence_map))
+            logger.info("Uploading final transcription JSON to Azure Blob.")
+            blob_service = get_blob_service()
+            json_blob_path = artifact_blob_path(file_id, TRANSCRIPT_ARTIFACT)
+            text_json = json.dumps(result_json, indent=2).encode("utf-8")
+            transcript_url = blob_service.upload_bytes(
+                text_json, json_blob_path, "application/json"
             )
-            if status == "Running":
-                progress = min(50 + attempt / max_attempts * 40, 90)
-                file.progress_percent = progress
-                db.session.commit()
-            if status == "Succeeded":
-                logger.info("Transcription succeeded; fetching final JSON result.")
-                file.progress_percent = 95
-                db.session.commit()
-                logger.info(
-                    "Retrieving final transcription JSON for job %s", transcription_id
+            get_transcript_cache(current_app).invalidate(file_id)
+            processed = None
+            try:
+                processed = store_processed_transcript(
+                    blob_service, file_id, result_json
                 )
-                result_json = transcription_service.get_transcription_result(
-                    transcription_id
-                )
-                logger.info("Uploading final transcription JSON to Azure Blob.")
-                blob_service = get_blob_service()
-                base_name = os.path.splitext(os.path.basename(file.filename))[0]
-                json_blob_path = f"{base_name}/transcript/final.json"
-                text_json = json.dumps(result_json, indent=2)
-                transcript_url = blob_service.upload_bytes(
-                    text_json.encode("utf-8"), json_blob_path, "application/json"
+                store_word_index(blob_service, file_id, processed)
+            except Exception as e:
+                log_exception(e, logger)
+                logger.warning(
+                    "Processed transcript or word index not stored; they will be rebuilt on first view"
                 )
+            if lease.lost:
+                logger.error(f"Lease on file {file_id} lost before saving result")
+                return {"status": "skipped", "file_id": file_id}
+            metadata = transcript_metadata(result_json)
+            with file_unit(file_id) as file:
+                if processed is not None:
+                    try:
+                        with db.session.begin_nested():
+                            replace_transcript_segments(file_id, json.loads(processed))
+                    except Exception as e:
+                        log_exception(e, logger)
+                        logger.warning(
+                            "Transcript segments not stored; they will be rebuilt on first view"
+                        )
                 file.transcript_url = transcript_url
+                file.transcript_hash = hashlib.sha256(text_json).hexdigest()
                 file.status = "completed"
                 file.progress_percent = 100
-                try:
-                    if "durationInTicks" in result_json:
-                        duration_seconds = result_json["durationInTicks"] / 10000000.0
-                        file.duration_seconds = str(
-                            timedelta(seconds=int(duration_seconds))
-                        )
-                    if "recognizedPhrases" in result_json:
-                        speakers = set()
-                        for phrase in result_json["recognizedPhrases"]:
-                            if "speaker" in phrase:
-                                speakers.add(phrase["speaker"])
-                        if speakers:
-                            file.speaker_count = str(len(speakers))
-                        word_confidences = []
-                        for phrase in result_json["recognizedPhrases"]:
-                            if (
-                                phrase.get("recognitionStatus") == "Success"
-                                and phrase.get("nBest")
-                                and (len(phrase["nBest"]) > 0)
-                            ):
-                                best_result = phrase["nBest"][0]
-                                if "words" in best_result:
-                                    for word in best_result["words"]:
-                                        if "confidence" in word:
-                                            word_confidences.append(
-                                                word.get("confidence", 0)
-                                            )
-                        if word_confidences:
-                            avg_accuracy = (
-                                sum(word_confidences) / len(word_confidences) * 100
-                            )
-                            file.accuracy_percent = round(avg_accuracy, 2)
-                            logger.info(
-                                f"Calculated average accuracy: {file.accuracy_percent}%"
-                            )
-                except Exception as meta_err:
-                    logger.error(f"Metadata extraction error: {str(meta_err)}")
-                db.session.commit()
-                total_time = time.time() - start_time
+                for name, value in metadata.items():
+                    setattr(file, name, value)
+        except Exception as e:
+            if not circuit_open_error(e):
+                return transcription_failed(file_id, lease, e)
+            # Keep the lease for the retry rather than failing a finished job
+            logger.warning(f"Finalizing {file_id} deferred: {str(e)}")
+            lease.hand_off()
+            finalize_transcription.apply_async(
+                (file_id, transcription_id, lease_token),
+                countdown=current_app.config["CIRCUIT_OPEN_SECONDS"],
+            )
+            return {"status": "deferred", "file_id": file_id}
+    end_pipeline(file_id, lease)
+    try:
+        generate_waveform_peaks.delay(file_id)
+    except Exception as e:
+        log_exception(e, logger)
+    total_time = time.time() - start_time
+    logger.info(
+        f"Transcription of file {file_id} finalized in {total_time:.2f} seconds."
+    )
+    return {
+        "status": "success",
+        "file_id": file_id,
+        "transcript_url": transcript_url,
+    }
+
+
+def transcript_metadata(result_json):
+    """
+    Duration, speaker count and average word confidence of a transcription
+    result, as File column values. Missing or malformed fields are skipped.
+    """
+    metadata = {}
+    try:
+        if "durationInTicks" in result_json:
+            duration_seconds = result_json["durationInTicks"] / 10000000.0
+            metadata["duration_seconds"] = str(timedelta(seconds=int(duration_seconds)))
+        if "recognizedPhrases" in result_json:
+            speakers = set()
+            for phrase in result_json["recognizedPhrases"]:
+                if "speaker" in phrase:
+                    speakers.add(phrase["speaker"])
+            if speakers:
+                metadata["speaker_count"] = str(len(speakers))
+            word_confidences = []
+            for phrase in result_json["recognizedPhrases"]:
+                if (
+                    phrase.get("recognitionStatus") == "Success"
+                    and phrase.get("nBest")
+                    and (len(phrase["nBest"]) > 0)
+                ):
+                    best_result = phrase["nBest"][0]
+                    if "words" in best_result:
+                        for word in best_result["words"]:
+                            if "confidence" in word:
+                                word_confidences.append(word.get("confidence", 0))
+            if word_confidences:
+                avg_accuracy = sum(word_confidences) / len(word_confidences) * 100
+                metadata["accuracy_percent"] = round(avg_accuracy, 2)
                 logger.info(
-                    f"Transcription pipeline completed for file {file_id} in {total_time:.2f} seconds."
+                    f"Calculated average accuracy: {metadata['accuracy_percent']}%"
                 )
-                return {
-                    "status": "success",
-                    "file_id": file_id,
-                    "transcript_url": transcript_url,
-                }
-            if status == "Failed":
-                error = status_info.get("properties", {}).get("error", {})
-                error_message = error.get("message", "Unknown error")
-                logger.error(f"Transcription failed for {file_id}: {error_message}")
-                file.status = "error"
-                file.error_message = f"Transcription failed: {error_message}"
-                db.session.commit()
-                return {"status": "error", "message": error_message}
-            time.sleep(60)
-        logger.error(f"Transcription timed out for {file_id} after 2 hours.")
-        file.status = "error"
-        file.error_message = "Transcription timed out after 2 hours"
-        db.session.commit()
-        return {"status": "error", "message": "Transcription timed out"}
-    except TranscriptionError as te:
-        logger.error(f"TranscriptionError in task for file {file_id}: {str(te)}")
-        file.status = "error"
-        file.error_message = str(te)
-        db.session.commit()
-        return {"status": "error", "message": str(te), "code": te.error_code}
-    except StorageError as se:
-        logger.error(f"StorageError in task for file {file_id}: {str(se)}")
-        file.status = "error"
-        file.error_message = str(se)
-        db.session.commit()
-        return {"status": "error", "message": str(se), "code": se.error_code}
-    except DatabaseError as de:
-        logger.error(f"DatabaseError in task for file {file_id}: {str(de)}")
-        try:
-            file.status = "error"
-            file.error_message = str(de)
-            db.session.commit()
-        except:
-            pass
-        return {"status": "error", "message": str(de), "code": de.error_code}
+    except Exception as meta_err:
+        logger.error(f"Metadata extraction error: {str(meta_err)}")
+    return metadata
+
+
+@shared_task
+def generate_waveform_peaks(file_id):
+    """
+    Stream a file's source audio once and store multi-level min/max
+    waveform peaks next to its transcript blob.
+    """
+    with unit_of_work() as session:
+        file = session.get(File, file_id)
+        blob_url = file.blob_url if file else None
+        filename = file.filename if file else None
+    if not blob_url:
+        logger.error(f"Cannot generate peaks: file {file_id} has no audio blob.")
+        return {"status": "error", "message": f"No audio for file {file_id}"}
+    if not filename.lower().endswith(".wav"):
+        logger.info(f"Skipping waveform peaks for non-WAV file {filename}")
+        return {"status": "skipped", "file_id": file_id}
+    try:
+        blob_service = get_blob_service()
+        audio_blob_path = blob_service.blob_path_from_url(blob_url)
+        peaks = compute_waveform_peaks(blob_service.open_blob_stream(audio_blob_path))
+        peaks_blob_path = artifact_blob_path(file_id, PEAKS_ARTIFACT)
+        blob_service.upload_bytes(peaks, peaks_blob_path, "application/octet-stream")
+        logger.info(f"Stored {len(peaks)} bytes of waveform peaks for file {file_id}")
+        return {"status": "success", "file_id": file_id, "bytes": len(peaks)}
     except Exception as e:
-        logger.error(f"Unhandled exception in task for file {file_id}: {str(e)}")
-        logger.error(traceback.format_exc())
-        file.status = "error"
-        file.error_message = f"Unexpected error: {str(e)}"
-        db.session.commit()
+        log_exception(e, logger)
         return {"status": "error", "message": str(e)}
@@ -3,12 +3,15 @@ import time
 import logging
 import traceback
 import uuid
+import threading
+from datetime import datetime
 from celery import shared_task
 from flask import current_app
-from app.extensions import db
+from app.services.db_session import unit_of_work
 from app.models.file import File
 from app.services.blob_storage import BlobStorageService
-from app.tasks.transcription_tasks import transcribe_file
+from app.services.audio_processing import estimate_audio_seconds
+from app.tasks.transcription_tasks import queue_transcription
 from redis import Redis
 import json
 from app.errors.exceptions import (
@@ -21,6 +24,20 @@ from app.errors.logger import log_exception
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("app.tasks.upload")
+_redis_clients = {}
+# Used while Redis is unavailable; only visible within this process
+_fallback_progress_store = {}
+_fallback_batches = {}
+_fallback_lock = threading.Lock()
+BATCH_TTL = 3600
+
+
+def _tracker_redis(host, port, db_index):
+    """One Redis client, and so one connection pool, per server per process"""
+    key = (host, port, db_index)
+    if key not in _redis_clients:
+        _redis_clients[key] = Redis(host=host, port=port, db=db_index)
+    return _redis_clients[key]
 
 
 class UploadProgressTracker:
@@ -38,13 +55,13 @@ class UploadProgressTracker:
                 host = host_port[0] or "localhost"
                 port = int(host_port[1]) if len(host_port) > 1 else 6379
                 db_index = int(parts[1]) if len(parts) > 1 else 0
-                self.redis = Redis(host=host, port=port, db=db_index)
+                self.redis = _tracker_redis(host, port, db_index)
             else:
-                self.redis = Redis(host="localhost", port=6379, db=0)
+                self.redis = _tracker_redis("localhost", 6379, 0)
         except Exception as e:
             log_exception(e, logger)
             logger.error(f"Error initializing Redis connection: {str(e)}")
-            self.redis = Redis(host="localhost", port=6379, db=0)
+            self.redis = _tracker_redis("localhost", 6379, 0)
 
     def update_progress(self, upload_id, progress_data):
         if not upload_id:
@@ -58,10 +75,7 @@ class UploadProgressTracker:
             )
         except Exception as e:
             logger.error(f"Error updating progress in Redis: {str(e)}")
-            self._fallback_progress_store = getattr(
-                self, "_fallback_progress_store", {}
-            )
-            self._fallback_progress_store[upload_id] = progress_data
+            _fallback_progress_store[upload_id] = progress_data
 
     def get_progress(self, upload_id):
         if not upload_id:
@@ -70,13 +84,135 @@ class UploadProgressTracker:
             data = self.redis.get(f"upload_progress:{upload_id}")
             if data:
                 return json.loads(data)
-            fallback_store = getattr(self, "_fallback_progress_store", {})
-            return fallback_store.get(upload_id)
+            return _fallback_progress_store.get(upload_id)
         except Exception as e:
             logger.error(f"Error getting progress from Redis: {str(e)}")
-            fallback_store = getattr(self, "_fallback_progress_store", {})
-            return fallback_store.get(upload_id)
-        return None
+            return _fallback_progress_store.get(upload_id)
+
+    def add_to_batch(self, batch_key, upload_id, filename):
+        """
+        Register an upload as part of a batch started from the upload page.
+        Membership is also kept in this process, so the batch can still be
+        reported from per-upload progress while Redis is unavailable.
+        """
+        now = time.time()
+        with _fallback_lock:
+            for stale in [k for k, v in _fallback_batches.items() if v[1] <= now]:
+                del _fallback_batches[stale]
+            members = _fallback_batches.get(batch_key, ({}, 0))[0]
+            members[upload_id] = filename
+            _fallback_batches[batch_key] = (members, now + BATCH_TTL)
+        key = f"upload_batch:{batch_key}"
+        try:
+            pipe = self.redis.pipeline()
+            pipe.hset(key, upload_id, filename)
+            pipe.expire(key, BATCH_TTL)
+            pipe.execute()
+        except Exception as e:
+            logger.error(f"Error adding upload to batch in Redis: {str(e)}")
+
+    def _fallback_batch_progress(self, batch_key):
+        with _fallback_lock:
+            members, expires = _fallback_batches.get(batch_key, ({}, 0))
+            members = dict(members) if expires > time.time() else {}
+        return [
+            (upload_id, filename, self.get_progress(upload_id))
+            for upload_id, filename in members.items()
+        ]
+
+    def get_batch_progress(self, batch_key):
+        """
+        Return (upload_id, filename, progress) for every upload in a batch,
+        read in two round trips however many files the batch holds.
+        """
+        try:
+            members = self.redis.hgetall(f"upload_batch:{batch_key}")
+            if not members:
+                return self._fallback_batch_progress(batch_key)
+            upload_ids = [upload_id.decode("utf-8") for upload_id in members]
+            values = self.redis.mget(
+                [f"upload_progress:{upload_id}" for upload_id in upload_ids]
+            )
+        except Exception as e:
+            logger.error(f"Error getting batch progress from Redis: {str(e)}")
+            return self._fallback_batch_progress(batch_key)
+        return [
+            (
+                upload_id,
+                filename.decode("utf-8"),
+                (
+                    json.loads(value)
+                    if value
+                    else _fallback_progress_store.get(upload_id)
+                ),
+            )
+            for upload_id, filename, value in zip(upload_ids, members.values(), values)
+        ]
+
+
+def batch_key(user_id, batch_id):
+    """Batches are scoped to their user, so IDs cannot be read across accounts"""
+    return f"{user_id}:{batch_id}"
+
+
+def upload_blob_path(upload_id, filename):
+    """
+    Blob path for an upload's original audio, prefixed with its upload ID so
+    files sharing a name, in one batch or across users, never overwrite
+    each other.
+    """
+    return f"uploads/{upload_id}/{filename}"
+
+
+def compacted_blob_path(upload_id, filename):
+    """Blob path for the silence-compacted copy of an upload's audio."""
+    base_name = os.path.splitext(os.path.basename(filename))[0]
+    return f"uploads/{upload_id}/compacted/{base_name}.wav"
+
+
+def prepare_submission_audio(app, blob_service, tmp_path, filename, upload_id):
+    """
+    Optionally strip long silences from a local WAV before it is submitted
+    for transcription, uploading the compacted copy alongside the original.
+
+    Returns:
+        tuple: (submission_blob_url, silence_map_json), both None when the
+        stage is disabled, not applicable, or found nothing to remove.
+    """
+    if not app.config.get("SILENCE_TRIM_ENABLED"):
+        return None, None
+    if not filename.lower().endswith(".wav"):
+        logger.info(f"Silence trimming skipped for non-WAV upload {filename}")
+        return None, None
+    from app.services.audio_processing import SilenceDetector
+
+    compacted_path = f"{tmp_path}.compacted.wav"
+    try:
+        detector = SilenceDetector(
+            threshold_dbfs=app.config["SILENCE_THRESHOLD_DBFS"],
+            min_silence_ms=app.config["SILENCE_MIN_DURATION_MS"],
+            padding_ms=app.config["SILENCE_PADDING_MS"],
+            mode=app.config["SILENCE_TRIM_MODE"],
+        )
+        silence_map = detector.compact(tmp_path, compacted_path)
+        if silence_map is None:
+            return None, None
+        submission_url = blob_service.upload_file(
+            compacted_path, compacted_blob_path(upload_id, filename)
+        )
+        return submission_url, silence_map.to_json()
+    except Exception as e:
+        log_exception(e, logger)
+        logger.warning(
+            f"Silence trimming failed for {filename}; submitting original audio"
+        )
+        return None, None
+    finally:
+        if os.path.exists(compacted_path):
+            try:
+                os.remove(compacted_path)
+            except Exception as e:
+                logger.error(f"Error removing compacted file: {str(e)}")
 
 
 @shared_task(bind=True)
@@ -105,185 +241,186 @@ def upload_to_azure_task(
     logger.info(
         f"Starting upload task for {filename} (ID: {upload_id}, User: {user_id}, Model: {model_id}, Locale: {model_locale})"
     )
-    from flask import current_app
-    from app import create_app
-
-    env = os.environ.get("FLASK_ENV", "development")
-    app = create_app(env)
-    with app.app_context():
-        progress_tracker = UploadProgressTracker(app)
+    # ContextTask runs every task inside the worker's app context, so the
+    # app, its database engine and its Redis clients are built once per process
+    app = current_app._get_current_object()
+    progress_tracker = UploadProgressTracker(app)
+    try:
+        progress_data = {
+            "status": "starting",
+            "progress": 0,
+            "file_path": tmp_path,
+            "filename": filename,
+            "azure_status": "pending",
+            "stage": "preparing",
+            "start_time": time.time(),
+        }
+        if model_id:
+            progress_data["model_id"] = model_id
+            progress_data["model_name"] = model_name
+            progress_data["model_locale"] = model_locale
+        progress_tracker.update_progress(upload_id, progress_data)
+    except Exception as e:
+        logger.error(f"Error updating progress tracker: {str(e)}")
+    try:
+        if not os.path.exists(tmp_path):
+            raise UploadError(f"File not found at path: {tmp_path}", filename=filename)
+        file_size = os.path.getsize(tmp_path)
+        if file_size == 0:
+            raise UploadError(f"File is empty (0 bytes)", filename=filename)
         try:
-            progress_data = {
-                "status": "starting",
-                "progress": 0,
-                "file_path": tmp_path,
-                "filename": filename,
-                "azure_status": "pending",
-                "stage": "preparing",
-                "start_time": time.time(),
-            }
-            if model_id:
-                progress_data["model_id"] = model_id
-                progress_data["model_name"] = model_name
-                progress_data["model_locale"] = model_locale
-            progress_tracker.update_progress(upload_id, progress_data)
+            progress_tracker.update_progress(
+                upload_id,
+                {
+                    "status": "uploading",
+                    "progress": 0,
+                    "file_path": tmp_path,
+                    "filename": filename,
+                    "azure_status": "in_progress",
+                    "stage": "azure_upload",
+                    "start_time": time.time(),
+                    "file_size": file_size,
+                },
+            )
         except Exception as e:
             logger.error(f"Error updating progress tracker: {str(e)}")
         try:
-            if not os.path.exists(tmp_path):
-                raise UploadError(
-                    f"File not found at path: {tmp_path}", filename=filename
-                )
-            file_size = os.path.getsize(tmp_path)
-            if file_size == 0:
-                raise UploadError(f"File is empty (0 bytes)", filename=filename)
-            try:
-                progress_tracker.update_progress(
-                    upload_id,
-                    {
-                        "status": "uploading",
-                        "progress": 0,
-                        "file_path": tmp_path,
-                        "filename": filename,
-                        "azure_status": "in_progress",
-                        "stage": "azure_upload",
-                        "start_time": time.time(),
-                        "file_size": file_size,
-                    },
-                )
-            except Exception as e:
-                logger.error(f"Error updating progress tracker: {str(e)}")
-            try:
-                blob_service = BlobStorageService(
-                    connection_string=app.config["AZURE_STORAGE_CONNECTION_STRING"],
-                    container_name=app.config["AZURE_STORAGE_CONTAINER"],
-                )
-                blob_url = blob_service.upload_file(
-                    tmp_path, filename, upload_id, progress_tracker
-                )
-            except StorageError as se:
-                raise UploadError(
-                    f"Storage error during upload: {str(se)}",
-                    filename=filename,
-                    original_error=str(se),
-                )
-            try:
-                session = db.session
+            blob_service = BlobStorageService(
+                connection_string=app.config["AZURE_STORAGE_CONNECTION_STRING"],
+                container_name=app.config["AZURE_STORAGE_CONTAINER"],
+            )
+            blob_url = blob_service.upload_file(
+                tmp_path,
+                upload_blob_path(upload_id, filename),
+                upload_id,
+                progress_tracker,
+            )
+        except StorageError as se:
+            raise UploadError(
+                f"Storage error during upload: {str(se)}",
+                filename=filename,
+                original_error=str(se),
+            )
+        submission_blob_url, silence_map = prepare_submission_audio(
+            app, blob_service, tmp_path, filename, upload_id
+        )
+        estimated_seconds = estimate_audio_seconds(tmp_path)
+        try:
+            with unit_of_work() as session:
                 file_record = File(
                     filename=filename,
+                    estimated_seconds=estimated_seconds,
                     blob_url=blob_url,
+                    submission_blob_url=submission_blob_url,
+                    silence_map=silence_map,
                     status="processing",
                     current_stage="queued",
                     progress_percent=0.0,
+                    transcription_started_at=datetime.utcnow(),
                     user_id=user_id,
                     model_id=model_id,
                     model_name=model_name if model_name else "Default",
                 )
                 session.add(file_record)
-                session.commit()
-            except Exception as e:
-                log_exception(e, logger)
-                raise DatabaseError(
-                    f"Database error creating file record: {str(e)}", filename=filename
-                )
-            try:
-                os.remove(tmp_path)
-                logger.info(f"Removed temporary file: {tmp_path}")
-            except Exception as e:
-                logger.error(f"Error removing temporary file: {str(e)}")
-            try:
-                from app.tasks.transcription_tasks import transcribe_file
-
-                transcribe_result = transcribe_file.delay(
-                    file_record.id, model_locale=model_locale
-                )
-            except Exception as e:
-                log_exception(e, logger)
-                raise UploadError(
-                    f"Error starting transcription task: {str(e)}",
-                    filename=filename,
-                    file_id=file_record.id,
-                )
-            try:
-                progress_tracker.update_progress(
-                    upload_id,
-                    {
-                        "status": "completed",
-                        "progress": 100,
-                        "azure_status": "completed",
-                        "file_id": file_record.id,
-                        "transcription_task_id": transcribe_result.id,
-                    },
-                )
-            except Exception as e:
-                logger.error(f"Error updating progress tracker: {str(e)}")
-            return {"status": "success", "file_id": file_record.id, "progress": 100}
-        except UploadError as ue:
-            log_exception(ue, logger)
-            try:
-                progress_tracker.update_progress(
-                    upload_id,
-                    {"status": "error", "azure_status": "error", "error": str(ue)},
-                )
-            except:
-                pass
-            if tmp_path and os.path.exists(tmp_path):
-                try:
-                    os.remove(tmp_path)
-                    logger.info(f"Cleaned up temporary file after error: {tmp_path}")
-                except Exception as cleanup_error:
-                    logger.error(
-                        f"Error cleaning up temporary file: {str(cleanup_error)}"
-                    )
-            return {
-                "status": "error",
-                "error": str(ue),
-                "code": ue.error_code,
-                "filename": filename,
-            }
-        except (StorageError, DatabaseError) as e:
+                session.flush()
+                file_id = file_record.id
+        except Exception as e:
             log_exception(e, logger)
-            try:
-                progress_tracker.update_progress(
-                    upload_id,
-                    {"status": "error", "azure_status": "error", "error": str(e)},
-                )
-            except:
-                pass
-            if tmp_path and os.path.exists(tmp_path):
-                try:
-                    os.remove(tmp_path)
-                    logger.info(f"Cleaned up temporary file after error: {tmp_path}")
-                except Exception as cleanup_error:
-                    logger.error(
-                        f"Error cleaning up temporary file: {str(cleanup_error)}"
-                    )
-            return {
-                "status": "error",
-                "error": str(e),
-                "code": e.error_code,
-                "filename": filename,
-            }
+            raise DatabaseError(
+                f"Database error creating file record: {str(e)}", filename=filename
+            )
+        try:
+            os.remove(tmp_path)
+            logger.info(f"Removed temporary file: {tmp_path}")
+        except Exception as e:
+            logger.error(f"Error removing temporary file: {str(e)}")
+        try:
+            queue_transcription(
+                file_id,
+                user_id,
+                model_locale=model_locale,
+                estimated_seconds=estimated_seconds,
+            )
         except Exception as e:
             log_exception(e, logger)
-            logger.error(traceback.format_exc())
+            raise UploadError(
+                f"Error starting transcription task: {str(e)}",
+                filename=filename,
+                file_id=file_id,
+            )
+        try:
+            progress_tracker.update_progress(
+                upload_id,
+                {
+                    "status": "completed",
+                    "progress": 100,
+                    "azure_status": "completed",
+                    "file_id": file_id,
+                },
+            )
+        except Exception as e:
+            logger.error(f"Error updating progress tracker: {str(e)}")
+        return {"status": "success", "file_id": file_id, "progress": 100}
+    except UploadError as ue:
+        log_exception(ue, logger)
+        try:
+            progress_tracker.update_progress(
+                upload_id,
+                {"status": "error", "azure_status": "error", "error": str(ue)},
+            )
+        except:
+            pass
+        if tmp_path and os.path.exists(tmp_path):
             try:
-                progress_tracker.update_progress(
-                    upload_id,
-                    {"status": "error", "azure_status": "error", "error": str(e)},
-                )
-            except:
-                pass
-            if tmp_path and os.path.exists(tmp_path):
-                try:
-                    os.remove(tmp_path)
-                    logger.info(f"Cleaned up temporary file after error: {tmp_path}")
-                except Exception as cleanup_error:
-                    logger.error(
-                        f"Error cleaning up temporary file: {str(cleanup_error)}"
-                    )
-            return {
-                "status": "error",
-                "error": f"Unexpected error: {str(e)}",
-                "filename": filename,
-            }
+                os.remove(tmp_path)
+                logger.info(f"Cleaned up temporary file after error: {tmp_path}")
+            except Exception as cleanup_error:
+                logger.error(f"Error cleaning up temporary file: {str(cleanup_error)}")
+        return {
+            "status": "error",
+            "error": str(ue),
+            "code": ue.error_code,
+            "filename": filename,
+        }
+    except (StorageError, DatabaseError) as e:
+        log_exception(e, logger)
+        try:
+            progress_tracker.update_progress(
+                upload_id,
+                {"status": "error", "azure_status": "error", "error": str(e)},
+            )
+        except:
+            pass
+        if tmp_path and os.path.exists(tmp_path):
+            try:
+                os.remove(tmp_path)
+                logger.info(f"Cleaned up temporary file after error: {tmp_path}")
+            except Exception as cleanup_error:
+                logger.error(f"Error cleaning up temporary file: {str(cleanup_error)}")
+        return {
+            "status": "error",
+            "error": str(e),
+            "code": e.error_code,
+            "filename": filename,
+        }
+    except Exception as e:
+        log_exception(e, logger)
+        logger.error(traceback.format_exc())
+        try:
+            progress_tracker.update_progress(
+                upload_id,
+                {"status": "error", "azure_status": "error", "error": str(e)},
+            )
+        except:
+            pass
+        if tmp_path and os.path.exists(tmp_path):
+            try:
+                os.remove(tmp_path)
+                logger.info(f"Cleaned up temporary file after error: {tmp_path}")
+            except Exception as cleanup_error:
+                logger.error(f"Error cleaning up temporary file: {str(cleanup_error)}")
+        return {
+            "status": "error",
+            "error": f"Unexpected error: {str(e)}",
+            "filename": filename,
+        }
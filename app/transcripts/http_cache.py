@@ -0,0 +1,49 @@
+import hashlib
+from flask import current_app, request
+from app.services.audio_processing import PEAKS_VERSION
+from app.services.transcript_processing import PROCESSING_VERSION
+
+
+def transcript_etag(file, variant=None):
+    """
+    Strong ETag for a representation of a completed transcript.
+
+    Built from the hash of the stored transcript JSON and the processing
+    version, so it changes only when the transcript or its processing does.
+    Files finalized before hashes were recorded fall back to their
+    transcription ID, which identifies an immutable transcription run.
+    """
+    basis = file.transcript_hash
+    if not basis:
+        identity = file.transcription_id or file.transcript_url or file.id
+        basis = hashlib.sha256(identity.encode("utf-8")).hexdigest()
+    etag = f"{basis[:40]}-v{PROCESSING_VERSION}"
+    if variant:
+        etag = f"{etag}-{variant}"
+    return etag
+
+
+def peaks_etag(file):
+    """Strong ETag for a file's waveform peaks, which never change once built."""
+    return f"{file.id}-peaks-v{PEAKS_VERSION}"
+
+
+def apply_cache_headers(response, etag, max_age, vary=None):
+    """Mark a response as privately cacheable and tag it with a strong ETag."""
+    response.set_etag(etag)
+    response.cache_control.private = True
+    response.cache_control.max_age = max_age
+    if vary:
+        response.vary.add(vary)
+    return response
+
+
+def not_modified(etag, max_age, vary=None):
+    """
+    Return a 304 response when the request already holds the current
+    representation, or None when the full response must be built.
+    """
+    if not request.if_none_match.contains(etag):
+        return None
+    response = current_app.response_class(status=304)
+    return apply_cache_headers(response, etag, max_age, vary=vary)
@@ -1,5 +1,6 @@
 from flask import (
     render_template,
+    stream_with_context,
     jsonify,
     current_app,
     request,
@@ -10,11 +11,45 @@ from flask import (
 from flask_login import login_required, current_user
 from app.extensions import db, csrf
 from app.models.file import File
+import os
 import json
-import requests
-from app.services.blob_storage import BlobStorageService
+import math
+from app.services.blob_storage import BlobStorageService, content_type_for
 import logging
 from app.transcripts import transcripts_bp
+from app.transcripts.http_cache import (
+    apply_cache_headers,
+    not_modified,
+    peaks_etag,
+    transcript_etag,
+)
+from app.services.transcript_artifacts import (
+    artifact_blob_path,
+    legacy_artifact_blob_path,
+    load_processed_transcript,
+    load_word_index,
+    PEAKS_ARTIFACT,
+)
+from app.services.transcript_cache import get_transcript_cache, transcript_cache_key
+from app.services.transcript_encoding import (
+    FORMAT_JSON,
+    MIMETYPES,
+    negotiate_transcript_format,
+    serialize_transcript,
+)
+from app.services.transcript_exports import EXPORT_FORMATS, generate_export
+from app.services.transcript_search import search_transcripts
+from app.services.word_index import word_index_cache
+from app.services.transcript_segments import (
+    ensure_transcript_segments,
+    query_segment_window,
+)
+from app.services.transcript_processing import (
+    process_transcript_data,
+    format_timestamp,
+    format_timestamp_duration,
+    add_time_strings,
+)
 from app.errors.exceptions import (
     ResourceNotFoundError,
     ValidationError,
@@ -44,7 +79,9 @@ def view_transcript(file_id):
             file_id=file_id,
             status=file.status,
         )
-    return render_template("transcript.html", file=file)
+    return render_template(
+        "transcript.html", file=file, audio_type=content_type_for(file.filename)
+    )
 
 
 @transcripts_bp.route("/api/transcript/<file_id>")
@@ -54,7 +91,10 @@ def view_transcript(file_id):
 def api_transcript(file_id):
     """
     API endpoint to get transcript data.
-    This endpoint regenerates a fresh SAS URL before fetching the transcript JSON.
+    Serves the precomputed frontend-ready transcript blob through the
+    transcript cache, rebuilding it from the raw Azure JSON only when the
+    processing version has changed. Completed transcripts are immutable, so
+    a matching If-None-Match is answered with 304 before any blob access.
     """
     file = db.session.query(File).filter(File.id == file_id).first()
     if file is None:
@@ -70,29 +110,29 @@ def api_transcript(file_id):
             file_id=file_id,
             status=file.status,
         )
+    fmt = negotiate_transcript_format(request)
+    etag = transcript_etag(file, fmt)
+    max_age = current_app.config["TRANSCRIPT_HTTP_MAX_AGE"]
+    cached = not_modified(etag, max_age, vary="Accept")
+    if cached is not None:
+        return cached
     try:
-        blob_service = BlobStorageService(
-            connection_string=current_app.config["AZURE_STORAGE_CONNECTION_STRING"],
-            container_name=current_app.config["AZURE_STORAGE_CONTAINER"],
-        )
-        try:
-            response = requests.get(file.transcript_url)
-            response.raise_for_status()
-            transcript_data = response.json()
-        except requests.exceptions.RequestException as e:
-            log_exception(e, logger)
-            raise ServiceError(
-                f"Error fetching transcript from URL: {str(e)}",
-                service="http",
-                url=file.transcript_url,
+        if fmt == FORMAT_JSON:
+            payload = _load_processed_payload(file)
+        else:
+            payload = get_transcript_cache(current_app).get_or_load(
+                f"{transcript_cache_key(file)}:{fmt}",
+                lambda: serialize_transcript(
+                    json.loads(_load_processed_payload(file)), fmt
+                ),
             )
-        except json.JSONDecodeError as e:
-            log_exception(e, logger)
-            raise ServiceError(
-                f"Invalid JSON in transcript response: {str(e)}", service="json"
-            )
-        processed_data = process_transcript_data(transcript_data)
-        return jsonify(processed_data)
+        response = current_app.response_class(payload, mimetype=MIMETYPES[fmt])
+        return apply_cache_headers(response, etag, max_age, vary="Accept")
+    except json.JSONDecodeError as e:
+        log_exception(e, logger)
+        raise ServiceError(
+            f"Invalid JSON in stored transcript: {str(e)}", service="json"
+        )
     except StorageError as e:
         log_exception(e, logger)
         raise ServiceError(
@@ -105,108 +145,330 @@ def api_transcript(file_id):
         )
 
 
-def process_transcript_data(data):
-    """Process transcript data into a frontend-friendly format"""
-    if not data:
-        raise ValidationError("Transcript data is empty or null", field="data")
-    result = {
-        "source": data.get("source", ""),
-        "duration": data.get("duration", ""),
-        "combinedResults": [],
-        "segments": [],
+def _load_processed_payload(file):
+    """Return the processed transcript bytes for a file through the transcript cache."""
+    app = current_app._get_current_object()
+
+    def load():
+        blob_service = BlobStorageService(
+            connection_string=app.config["AZURE_STORAGE_CONNECTION_STRING"],
+            container_name=app.config["AZURE_STORAGE_CONTAINER"],
+        )
+        return load_processed_transcript(blob_service, file)
+
+    return get_transcript_cache(app).get_or_load(transcript_cache_key(file), load)
+
+
+def _window_param(name, default):
+    value = request.args.get(name)
+    if value is None or value == "":
+        return default
+    try:
+        value = int(value)
+    except ValueError:
+        raise ValidationError(f"{name} must be an integer", field=name)
+    if value < 0:
+        raise ValidationError(f"{name} must not be negative", field=name)
+    return value
+
+
+@transcripts_bp.route("/api/transcript/<file_id>/segments")
+@login_required
+@approval_required
+@csrf.exempt
+def api_transcript_segments(file_id):
+    """
+    API endpoint returning the transcript segments overlapping a time window.
+    Lets the player load long recordings a window at a time instead of
+    fetching the whole transcript up front. Segments of transcripts
+    finalized before the segment store existed are backfilled on first use.
+    """
+    file = db.session.query(File).filter(File.id == file_id).first()
+    if file is None:
+        raise ResourceNotFoundError(f"File with ID {file_id} not found")
+    if file.user_id != current_user.id:
+        return (
+            jsonify({"error": "You do not have permission to view this transcript."}),
+            403,
+        )
+    if file.status != "completed" or not file.transcript_url:
+        raise ResourceNotFoundError("Transcript not available for this file")
+    from_ms = _window_param("from_ms", 0)
+    to_ms = _window_param("to_ms", from_ms + current_app.config["TRANSCRIPT_WINDOW_MS"])
+    if to_ms <= from_ms:
+        raise ValidationError("to_ms must be greater than from_ms", field="to_ms")
+    to_ms = min(to_ms, from_ms + current_app.config["TRANSCRIPT_MAX_WINDOW_MS"])
+    include_words = request.args.get("include_words", "0").lower() in (
+        "1",
+        "true",
+        "yes",
+    )
+    fmt = negotiate_transcript_format(request)
+    etag = transcript_etag(file, f"segments-{fmt}")
+    max_age = current_app.config["TRANSCRIPT_HTTP_MAX_AGE"]
+    cached = not_modified(etag, max_age, vary="Accept")
+    if cached is not None:
+        return cached
+    try:
+        count, duration_ms, longest_ms = ensure_transcript_segments(
+            file, lambda: json.loads(_load_processed_payload(file))
+        )
+        segments = query_segment_window(
+            file.id, from_ms, to_ms, longest_ms, include_words=include_words
+        )
+    except json.JSONDecodeError as e:
+        log_exception(e, logger)
+        raise ServiceError(
+            f"Invalid JSON in stored transcript: {str(e)}", service="json"
+        )
+    except StorageError as e:
+        log_exception(e, logger)
+        raise ServiceError(
+            f"Storage error accessing transcript: {str(e)}", service="azure_storage"
+        )
+    window = {
+        "from_ms": from_ms,
+        "to_ms": to_ms,
+        "duration_ms": duration_ms,
+        "segment_count": count,
+        "next_from_ms": to_ms if to_ms < duration_ms else None,
+        "segments": segments,
     }
-    if "combinedRecognizedPhrases" in data:
-        result["combinedResults"] = [
-            {
-                "channel": item.get("channel", 0),
-                "text": item.get("display", ""),
-                "lexical": item.get("lexical", ""),
-            }
-            for item in data["combinedRecognizedPhrases"]
-        ]
-    if "recognizedPhrases" in data:
-        segments = []
-        for phrase in data["recognizedPhrases"]:
-            if (
-                phrase.get("recognitionStatus") != "Success"
-                or not phrase.get("nBest")
-                or len(phrase["nBest"]) == 0
-            ):
-                continue
-            best_result = phrase["nBest"][0]
-            offset_str = format_timestamp(phrase.get("offsetMilliseconds", 0))
-            end_offset = phrase.get("offsetMilliseconds", 0) + phrase.get(
-                "durationMilliseconds", 0
-            )
-            end_str = format_timestamp(end_offset)
-            segment = {
-                "start": offset_str,
-                "end": end_str,
-                "offsetMilliseconds": phrase.get("offsetMilliseconds", 0),
-                "durationMilliseconds": phrase.get("durationMilliseconds", 0),
-                "speaker": phrase.get("speaker", 0),
-                "text": best_result.get("display", ""),
-                "confidence": best_result.get("confidence", 0),
-                "words": [],
-            }
-            if "words" in best_result:
-                segment["words"] = [
-                    {
-                        "word": word.get("word", ""),
-                        "start": format_timestamp(word.get("offsetMilliseconds", 0)),
-                        "duration": format_timestamp_duration(
-                            word.get("durationMilliseconds", 0)
-                        ),
-                        "offsetMilliseconds": word.get("offsetMilliseconds", 0),
-                        "durationMilliseconds": word.get("durationMilliseconds", 0),
-                        "confidence": word.get("confidence", 0),
-                    }
-                    for word in best_result["words"]
-                ]
-            segments.append(segment)
-        result["segments"] = sorted(segments, key=lambda x: x["offsetMilliseconds"])
-    return result
-
-
-def format_timestamp(milliseconds):
-    """Convert milliseconds to a user-friendly timestamp format (MM:SS.mmm)"""
-    seconds = milliseconds / 1000
-    minutes = int(seconds // 60)
-    seconds_remainder = seconds % 60
-    return f"{minutes:02d}:{seconds_remainder:06.3f}"
-
-
-def format_timestamp_duration(milliseconds):
-    """Format a duration in milliseconds to a user-friendly format"""
-    seconds = milliseconds / 1000
-    return f"{seconds:.3f}s"
-
-
-def add_time_strings(time1, time2):
+    response = current_app.response_class(
+        serialize_transcript(window, fmt), mimetype=MIMETYPES[fmt]
+    )
+    return apply_cache_headers(response, etag, max_age, vary="Accept")
+
+
+def _word_index(file):
+    """Return the parsed word/time index for a file."""
+    app = current_app._get_current_object()
+
+    def load():
+        blob_service = BlobStorageService(
+            connection_string=app.config["AZURE_STORAGE_CONNECTION_STRING"],
+            container_name=app.config["AZURE_STORAGE_CONTAINER"],
+        )
+        return load_word_index(blob_service, file)
+
+    return word_index_cache.get_or_load(f"{transcript_cache_key(file)}:words", load)
+
+
+def _parse_time_ms(value):
+    """Parse seconds ("83.5") or a clock time ("01:23:45.5") into milliseconds."""
+    try:
+        seconds = 0.0
+        for part in value.split(":"):
+            seconds = seconds * 60 + float(part)
+    except ValueError:
+        raise ValidationError("t must be seconds or a time such as 01:23:45", field="t")
+    # float() accepts "nan", "inf" and overflowing values like "1e400"
+    if not math.isfinite(seconds):
+        raise ValidationError("t must be a finite number of seconds", field="t")
+    if seconds < 0:
+        raise ValidationError("t must not be negative", field="t")
+    return int(round(seconds * 1000))
+
+
+@transcripts_bp.route("/api/transcript/<file_id>/lookup")
+@login_required
+@approval_required
+@csrf.exempt
+def api_transcript_lookup(file_id):
     """
-    Add two time strings in HH:MM:SS, HH:MM:SS.msec, or ISO 8601 duration format (PT1.5S)
+    API endpoint returning the word spoken at a playback time, found by
+    binary search over the transcript's precomputed word index.
     """
+    file = db.session.query(File).filter(File.id == file_id).first()
+    if file is None:
+        raise ResourceNotFoundError(f"File with ID {file_id} not found")
+    if file.user_id != current_user.id:
+        return (
+            jsonify({"error": "You do not have permission to view this transcript."}),
+            403,
+        )
+    if file.status != "completed" or not file.transcript_url:
+        raise ResourceNotFoundError("Transcript not available for this file")
+    value = request.args.get("t", "").strip()
+    if not value:
+        raise ValidationError("t is required", field="t")
+    offset_ms = _parse_time_ms(value)
+    etag = transcript_etag(file, "lookup")
+    max_age = current_app.config["TRANSCRIPT_HTTP_MAX_AGE"]
+    cached = not_modified(etag, max_age)
+    if cached is not None:
+        return cached
+    index = _word_index(file)
+    position = index.word_at(offset_ms)
+    word = None
+    if position is not None:
+        word = index.describe(position)
+        word["exact"] = offset_ms < word["end_ms"]
+    response = jsonify({"t_ms": offset_ms, "word": word})
+    return apply_cache_headers(response, etag, max_age)
+
+
+@transcripts_bp.route("/api/transcript/<file_id>/find")
+@login_required
+@approval_required
+@csrf.exempt
+def api_transcript_find(file_id):
+    """
+    API endpoint returning every occurrence of a word or phrase in one
+    transcript, using the token-to-positions map of its word index.
+    """
+    file = db.session.query(File).filter(File.id == file_id).first()
+    if file is None:
+        raise ResourceNotFoundError(f"File with ID {file_id} not found")
+    if file.user_id != current_user.id:
+        return (
+            jsonify({"error": "You do not have permission to view this transcript."}),
+            403,
+        )
+    if file.status != "completed" or not file.transcript_url:
+        raise ResourceNotFoundError("Transcript not available for this file")
+    query = request.args.get("q", "").strip()
+    if not query:
+        raise ValidationError("Search query is required", field="q")
+    limit = min(_window_param("limit", 100), 1000)
+    etag = transcript_etag(file, "find")
+    max_age = current_app.config["TRANSCRIPT_HTTP_MAX_AGE"]
+    cached = not_modified(etag, max_age)
+    if cached is not None:
+        return cached
+    index = _word_index(file)
+    positions, length = index.find(query, limit=limit)
+    response = jsonify(
+        {
+            "query": query,
+            "count": len(positions),
+            "matches": [index.describe(position, length) for position in positions],
+        }
+    )
+    return apply_cache_headers(response, etag, max_age)
 
-    def to_seconds(time_str):
-        if time_str.startswith("PT") and time_str.endswith("S"):
-            try:
-                return float(time_str[2:-1])
-            except ValueError:
-                return 0
-        parts = time_str.split(":")
-        if len(parts) == 3:
-            h, m, s = parts
-            return int(h) * 3600 + int(m) * 60 + float(s)
-        elif len(parts) == 2:
-            m, s = parts
-            return int(m) * 60 + float(s)
-        return 0
-
-    def to_string(seconds):
-        h = int(seconds // 3600)
-        m = int(seconds % 3600 // 60)
-        s = seconds % 60
-        return f"{h:02d}:{m:02d}:{s:06.3f}"
-
-    total_seconds = to_seconds(time1) + to_seconds(time2)
-    return to_string(total_seconds)
+
+@transcripts_bp.route("/api/transcript/<file_id>/export/<fmt>")
+@login_required
+@approval_required
+@csrf.exempt
+def api_transcript_export(file_id, fmt):
+    """
+    Stream a transcript export as SRT, WebVTT, plain text or JSON Lines.
+    Segments are read from the segment store in batches and written as
+    they arrive, so large exports start immediately in bounded memory.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValidationError(f"Unsupported export format: {fmt}", field="fmt")
+    file = db.session.query(File).filter(File.id == file_id).first()
+    if file is None:
+        raise ResourceNotFoundError(f"File with ID {file_id} not found")
+    if file.user_id != current_user.id:
+        return (
+            jsonify({"error": "You do not have permission to view this transcript."}),
+            403,
+        )
+    if file.status != "completed" or not file.transcript_url:
+        raise ResourceNotFoundError("Transcript not available for this file")
+    etag = transcript_etag(file, f"export-{fmt}")
+    max_age = current_app.config["TRANSCRIPT_HTTP_MAX_AGE"]
+    cached = not_modified(etag, max_age)
+    if cached is not None:
+        return cached
+    ensure_transcript_segments(file, lambda: json.loads(_load_processed_payload(file)))
+    mimetype, extension = EXPORT_FORMATS[fmt]
+    base_name = os.path.splitext(os.path.basename(file.filename))[0]
+    response = current_app.response_class(
+        stream_with_context(generate_export(file.id, fmt)),
+        mimetype=mimetype,
+    )
+    response.headers["Content-Disposition"] = (
+        f'attachment; filename="{base_name}.{extension}"'
+    )
+    return apply_cache_headers(response, etag, max_age)
+
+
+def _search_results(query, limit):
+    """Run a transcript search for the current user, shaped for display."""
+    hits = search_transcripts(current_user.id, query, limit=limit)
+    return [
+        {
+            "file_id": hit["file_id"],
+            "filename": hit["filename"],
+            "speaker": hit["speaker"],
+            "text": hit["text"],
+            "offset_ms": hit["offset_ms"],
+            "duration_ms": hit["duration_ms"],
+            "start": format_timestamp(hit["offset_ms"]),
+            "url": url_for(
+                "transcripts.view_transcript",
+                file_id=hit["file_id"],
+                t=hit["offset_ms"] / 1000,
+            ),
+        }
+        for hit in hits
+    ]
+
+
+@transcripts_bp.route("/transcripts/search")
+@login_required
+@approval_required
+def search_page():
+    """Search across the current user's transcripts"""
+    query = request.args.get("q", "").strip()
+    results = _search_results(query, 50) if query else []
+    return render_template("search.html", query=query, results=results)
+
+
+@transcripts_bp.route("/api/transcripts/search")
+@login_required
+@approval_required
+@csrf.exempt
+def api_search_transcripts():
+    """
+    API endpoint for full-text search across the current user's transcripts.
+    Returns ranked phrase hits with timestamps and player deep links.
+    """
+    query = request.args.get("q", "").strip()
+    if not query:
+        raise ValidationError("Search query is required", field="q")
+    limit = min(_window_param("limit", 20), 100)
+    return jsonify({"query": query, "results": _search_results(query, limit)})
+
+
+@transcripts_bp.route("/api/transcript/<file_id>/peaks")
+@login_required
+@approval_required
+@csrf.exempt
+def api_transcript_peaks(file_id):
+    """
+    API endpoint serving precomputed binary waveform peaks for the player.
+    Peaks never change once generated, so the response is cacheable.
+    """
+    file = db.session.query(File).filter(File.id == file_id).first()
+    if file is None:
+        raise ResourceNotFoundError(f"File with ID {file_id} not found")
+    if file.user_id != current_user.id:
+        return (
+            jsonify({"error": "You do not have permission to view this file."}),
+            403,
+        )
+    etag = peaks_etag(file)
+    max_age = current_app.config["PEAKS_CACHE_MAX_AGE"]
+    cached = not_modified(etag, max_age)
+    if cached is not None:
+        return cached
+    blob_service = BlobStorageService(
+        connection_string=current_app.config["AZURE_STORAGE_CONNECTION_STRING"],
+        container_name=current_app.config["AZURE_STORAGE_CONTAINER"],
+    )
+    peaks = blob_service.download_bytes(artifact_blob_path(file.id, PEAKS_ARTIFACT))
+    if peaks is None:
+        # Files processed before artifacts were keyed by id
+        peaks = blob_service.download_bytes(
+            legacy_artifact_blob_path(file.filename, PEAKS_ARTIFACT)
+        )
+    if peaks is None:
+        raise ResourceNotFoundError("Waveform peaks not available for this file")
+    response = current_app.response_class(peaks, mimetype="application/octet-stream")
+    return apply_cache_headers(response, etag, max_age)
@@ -1,11 +1,123 @@
+"""
+Celery worker entry point.
+
+Each pipeline stage runs on its own queue (see CELERY_TASK_ROUTES in config.py),
+so a burst of uploads cannot hold up polling or finalization. Start one
+worker per role, scaling each separately:
+
+    python celery_worker.py uploads      # Azure blob uploads: bandwidth-bound, threads
+    python celery_worker.py submit       # job submission: short HTTP calls, threads
+    python celery_worker.py poll         # status checks: mostly idle, many threads
+    python celery_worker.py finalize     # result processing: CPU and memory heavy, prefork
+    python celery_worker.py maintenance  # beat scheduler plus progress flush and recovery
+    python celery_worker.py all          # every queue in one worker, for development
+
+Concurrency and pool defaults come from WORKER_ROLES and can be overridden
+with CELERY_<ROLE>_CONCURRENCY and CELERY_<ROLE>_POOL; any further
+arguments are passed to "celery worker". The plain celery CLI still works,
+e.g. celery -A celery_worker.celery worker -Q poll -P threads -c 32.
+"""
+
 import app.models
 import os
 from dotenv import load_dotenv
+from celery.signals import worker_process_init, worker_ready
 from app import create_app
+from app.extensions import db
+from app.services.pool_metrics import instrument_pool
+from app.services.file_lease import check_lease_ttl
+from app.services.redis_client import get_redis
 
+RECOVERY_STARTUP_KEY = "recovery:startup"
 load_dotenv()
 env = os.environ.get("FLASK_ENV", "development")
 flask_app = create_app(env)
 celery = flask_app.celery
 import app.tasks.transcription_tasks
 import app.tasks.upload_tasks
+import app.tasks.progress_tasks
+import app.tasks.recovery_tasks
+
+with flask_app.app_context():
+    instrument_pool(
+        db.engine, warn_seconds=flask_app.config["DB_CHECKOUT_WARN_SECONDS"]
+    )
+check_lease_ttl(flask_app.config)
+
+
+@worker_process_init.connect
+def reset_connection_pools(**kwargs):
+    """Forked pool processes reuse the app but must open their own connections"""
+    with flask_app.app_context():
+        db.engine.dispose(close=False)
+
+
+@worker_ready.connect
+def recover_on_startup(sender=None, **kwargs):
+    """
+    Pick up transcriptions orphaned by the previous worker's shutdown. Every
+    role's worker gets this signal, so a short Redis lock lets only the
+    first one of a deploy enqueue the scan.
+    """
+    redis = get_redis(flask_app)
+    if redis is not None:
+        hostname = getattr(sender, "hostname", None) or "worker"
+        if not redis.set(
+            RECOVERY_STARTUP_KEY,
+            hostname,
+            nx=True,
+            ex=flask_app.config["RECOVERY_SCAN_INTERVAL"],
+        ):
+            return
+    app.tasks.recovery_tasks.recover_transcriptions.delay()
+
+
+# Prefetch stays at 1 for long or heavy tasks so one busy worker cannot sit
+# on queued work another could start; status checks are quick enough to
+# batch a few.
+WORKER_ROLES = {
+    "uploads": {"queues": ["uploads"], "pool": "threads", "concurrency": 8},
+    "submit": {"queues": ["submit"], "pool": "threads", "concurrency": 8},
+    "poll": {"queues": ["poll"], "pool": "threads", "concurrency": 32, "prefetch": 4},
+    "finalize": {"queues": ["finalize"], "pool": "prefork", "concurrency": 2},
+    "maintenance": {
+        "queues": ["celery"],
+        "pool": "solo",
+        "concurrency": 1,
+        "beat": True,
+    },
+    "all": {
+        "queues": ["celery", "uploads", "submit", "poll", "finalize"],
+        "pool": "threads",
+        "concurrency": 8,
+        "beat": True,
+    },
+}
+
+
+def worker_argv(role, extra_args=()):
+    """Build the "celery worker" arguments for a role."""
+    settings = WORKER_ROLES[role]
+    prefix = f"CELERY_{role.upper()}_"
+    argv = [
+        "worker",
+        f"--hostname={role}@%h",
+        f"--queues={','.join(settings['queues'])}",
+        f"--pool={os.environ.get(prefix + 'POOL', settings['pool'])}",
+        f"--concurrency={os.environ.get(prefix + 'CONCURRENCY', settings['concurrency'])}",
+        f"--prefetch-multiplier={settings.get('prefetch', 1)}",
+        "--loglevel=info",
+    ]
+    if settings.get("beat"):
+        argv.append("--beat")
+    return argv + list(extra_args)
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 2 or sys.argv[1] not in WORKER_ROLES:
+        sys.exit(
+            f"Usage: python celery_worker.py {{{'|'.join(WORKER_ROLES)}}} [celery options]"
+        )
+    celery.worker_main(worker_argv(sys.argv[1], sys.argv[2:]))
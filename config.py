@@ -12,6 +12,7 @@ class Config:
     )
     UPLOAD_FOLDER = os.environ.get("UPLOAD_FOLDER", os.path.join(basedir, "uploads"))
     MAX_CONTENT_LENGTH = 5 * 1024 * 1024 * 1024
+    UPLOAD_CONCURRENCY = int(os.environ.get("UPLOAD_CONCURRENCY", 3))
     AZURE_STORAGE_CONNECTION_STRING = os.environ.get("AZURE_STORAGE_CONNECTION_STRING")
     AZURE_STORAGE_CONTAINER = os.environ.get(
         "AZURE_STORAGE_CONTAINER", "transcriptions"
@@ -21,8 +22,108 @@ class Config:
     broker_url = os.environ.get("CELERY_BROKER_URL", "redis://localhost:6379/0")
     result_backend = os.environ.get("CELERY_RESULT_BACKEND", "redis://localhost:6379/0")
     broker_connection_retry_on_startup = True
+    REDIS_URL = os.environ.get("REDIS_URL", broker_url)
+    TRANSCRIPT_CACHE_MAX_BYTES = int(
+        os.environ.get("TRANSCRIPT_CACHE_MAX_BYTES", 128 * 1024 * 1024)
+    )
+    TRANSCRIPT_CACHE_REDIS_MAX_BYTES = int(
+        os.environ.get("TRANSCRIPT_CACHE_REDIS_MAX_BYTES", 32 * 1024 * 1024)
+    )
+    TRANSCRIPT_CACHE_TTL = int(os.environ.get("TRANSCRIPT_CACHE_TTL", 86400))
+    DB_CHECKOUT_WARN_SECONDS = float(os.environ.get("DB_CHECKOUT_WARN_SECONDS", 5))
+    TRANSCRIPTION_DISPATCH_TTL = int(
+        os.environ.get("TRANSCRIPTION_DISPATCH_TTL", 3 * 3600)
+    )
+    TRANSCRIPTION_POLL_INTERVAL = int(os.environ.get("TRANSCRIPTION_POLL_INTERVAL", 60))
+    # Longest a stage is expected to wait in its queue before a worker runs it
+    TRANSCRIPTION_QUEUE_LATENCY = int(
+        os.environ.get("TRANSCRIPTION_QUEUE_LATENCY", 600)
+    )
+    # The lease has no heartbeat between stages, so it must outlast a poll
+    # countdown plus the queue wait; see check_lease_ttl
+    TRANSCRIPTION_LEASE_TTL = int(
+        os.environ.get(
+            "TRANSCRIPTION_LEASE_TTL",
+            TRANSCRIPTION_POLL_INTERVAL + TRANSCRIPTION_QUEUE_LATENCY,
+        )
+    )
+    TRANSCRIPTION_MAX_POLLS = int(os.environ.get("TRANSCRIPTION_MAX_POLLS", 120))
+    # Shared request budget per Speech key and region; S0 allows 300 REST
+    # calls a minute
+    SPEECH_RATE_LIMIT = float(os.environ.get("SPEECH_RATE_LIMIT", 5))
+    SPEECH_RATE_BURST = int(os.environ.get("SPEECH_RATE_BURST", 10))
+    SPEECH_RATE_JITTER = float(os.environ.get("SPEECH_RATE_JITTER", 0.2))
+    SPEECH_REQUEST_DEADLINE = int(os.environ.get("SPEECH_REQUEST_DEADLINE", 120))
+    # Circuit breakers for Azure Storage and Speech, shared through Redis
+    CIRCUIT_WINDOW_SECONDS = int(os.environ.get("CIRCUIT_WINDOW_SECONDS", 60))
+    CIRCUIT_MIN_CALLS = int(os.environ.get("CIRCUIT_MIN_CALLS", 10))
+    CIRCUIT_FAILURE_RATIO = float(os.environ.get("CIRCUIT_FAILURE_RATIO", 0.5))
+    CIRCUIT_OPEN_SECONDS = int(os.environ.get("CIRCUIT_OPEN_SECONDS", 30))
+    CIRCUIT_HALF_OPEN_PROBES = int(os.environ.get("CIRCUIT_HALF_OPEN_PROBES", 1))
+    # Each pipeline stage has its own queue so it can be scaled on its own;
+    # see WORKER_ROLES in celery_worker.py. Periodic maintenance tasks stay
+    # on the default "celery" queue.
+    CELERY_TASK_ROUTES = {
+        "app.tasks.upload_tasks.upload_to_azure_task": {"queue": "uploads"},
+        "app.tasks.transcription_tasks.transcribe_file": {"queue": "submit"},
+        "app.tasks.transcription_tasks.poll_transcription": {"queue": "poll"},
+        "app.tasks.transcription_tasks.finalize_transcription": {"queue": "finalize"},
+        "app.tasks.transcription_tasks.generate_waveform_peaks": {"queue": "finalize"},
+    }
+    PROGRESS_FLUSH_INTERVAL = int(os.environ.get("PROGRESS_FLUSH_INTERVAL", 15))
+    FAIR_SHARE_USER_INFLIGHT = int(os.environ.get("FAIR_SHARE_USER_INFLIGHT", 3))
+    FAIR_SHARE_INFLIGHT_TTL = int(os.environ.get("FAIR_SHARE_INFLIGHT_TTL", 4 * 3600))
+    FAIR_SHARE_PUMP_INTERVAL = int(os.environ.get("FAIR_SHARE_PUMP_INTERVAL", 30))
+    AZURE_SPEECH_RESOURCE = os.environ.get("AZURE_SPEECH_RESOURCE")
+    AZURE_SPEECH_MAX_INFLIGHT = int(os.environ.get("AZURE_SPEECH_MAX_INFLIGHT", 20))
+    ADMISSION_DURATION_WEIGHT = float(os.environ.get("ADMISSION_DURATION_WEIGHT", 1.0))
+    ADMISSION_DEFAULT_SECONDS = int(os.environ.get("ADMISSION_DEFAULT_SECONDS", 600))
+    RECOVERY_SCAN_INTERVAL = int(os.environ.get("RECOVERY_SCAN_INTERVAL", 300))
+    RECOVERY_STALE_HOURS = int(os.environ.get("RECOVERY_STALE_HOURS", 24))
+    RECOVERY_BATCH_SIZE = int(os.environ.get("RECOVERY_BATCH_SIZE", 200))
+    CELERY_BEAT_SCHEDULE = {
+        "flush-file-progress": {
+            "task": "app.tasks.progress_tasks.flush_file_progress",
+            "schedule": PROGRESS_FLUSH_INTERVAL,
+        },
+        "schedule-transcriptions": {
+            "task": "app.tasks.transcription_tasks.schedule_transcriptions",
+            "schedule": FAIR_SHARE_PUMP_INTERVAL,
+        },
+        "recover-transcriptions": {
+            "task": "app.tasks.recovery_tasks.recover_transcriptions",
+            "schedule": RECOVERY_SCAN_INTERVAL,
+        },
+    }
     CHUNK_SIZE_SECONDS = int(os.environ.get("CHUNK_SIZE_SECONDS", 30))
     CHUNK_OVERLAP_SECONDS = int(os.environ.get("CHUNK_OVERLAP_SECONDS", 5))
+    SILENCE_TRIM_ENABLED = (
+        os.environ.get("SILENCE_TRIM_ENABLED", "false").lower() == "true"
+    )
+    SILENCE_TRIM_MODE = os.environ.get("SILENCE_TRIM_MODE", "compact")
+    SILENCE_THRESHOLD_DBFS = float(os.environ.get("SILENCE_THRESHOLD_DBFS", -45))
+    SILENCE_MIN_DURATION_MS = int(os.environ.get("SILENCE_MIN_DURATION_MS", 2000))
+    SILENCE_PADDING_MS = int(os.environ.get("SILENCE_PADDING_MS", 250))
+    AUDIO_CACHE_DIR = os.environ.get(
+        "AUDIO_CACHE_DIR", os.path.join(basedir, "instance", "audio_cache")
+    )
+    AUDIO_CACHE_MAX_BYTES = int(os.environ.get("AUDIO_CACHE_MAX_BYTES", 2 * 1024**3))
+    AUDIO_SEGMENT_BYTES = int(os.environ.get("AUDIO_SEGMENT_BYTES", 1024 * 1024))
+    AUDIO_MAX_RANGE_BYTES = int(
+        os.environ.get("AUDIO_MAX_RANGE_BYTES", 8 * 1024 * 1024)
+    )
+    AUDIO_CACHE_MAX_AGE = int(os.environ.get("AUDIO_CACHE_MAX_AGE", 3600))
+    AUDIO_GRANT_TTL = int(os.environ.get("AUDIO_GRANT_TTL", 300))
+    PEAKS_CACHE_MAX_AGE = int(os.environ.get("PEAKS_CACHE_MAX_AGE", 86400))
+    TRANSCRIPT_HTTP_MAX_AGE = int(os.environ.get("TRANSCRIPT_HTTP_MAX_AGE", 86400))
+    BULK_EXPORT_WORKERS = int(os.environ.get("BULK_EXPORT_WORKERS", 8))
+    BULK_EXPORT_CHUNK_BYTES = int(
+        os.environ.get("BULK_EXPORT_CHUNK_BYTES", 4 * 1024 * 1024)
+    )
+    TRANSCRIPT_WINDOW_MS = int(os.environ.get("TRANSCRIPT_WINDOW_MS", 5 * 60 * 1000))
+    TRANSCRIPT_MAX_WINDOW_MS = int(
+        os.environ.get("TRANSCRIPT_MAX_WINDOW_MS", 30 * 60 * 1000)
+    )
     PYANNOTE_AUTH_TOKEN = os.environ.get("PYANNOTE_AUTH_TOKEN")
     LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO")
     LOG_FILE = os.environ.get("LOG_FILE", os.path.join(basedir, "logs", "app.log"))
@@ -48,6 +149,7 @@ class TestingConfig(Config):
     SERVER_NAME = "localhost.localdomain"
     broker_url = "memory://"
     result_backend = "memory://"
+    REDIS_URL = None
 
 
 config = {
@@ -36,7 +36,9 @@ check_redis() {
 # Function to start the Celery worker
 start_celery() {
     echo "Starting Celery worker..."
-    celery -A celery_worker.celery worker --loglevel=info -P threads &
+    # The "all" role consumes every queue and runs the beat scheduler;
+    # production runs one worker per role (see celery_worker.py)
+    python celery_worker.py all &
     CELERY_PID=$!
     echo "Celery worker started with PID: $CELERY_PID"
 }
@@ -0,0 +1,23 @@
+import fakeredis
+import pytest
+from app import create_app
+from app.extensions import db
+
+
+@pytest.fixture
+def app():
+    """The testing app with a fresh in-memory database."""
+    app = create_app("testing")
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def redis():
+    """A fresh in-memory Redis, with Lua scripting, for each test."""
+    client = fakeredis.FakeRedis()
+    yield client
+    client.flushall()
@@ -0,0 +1,116 @@
+import pytest
+from app.extensions import db
+from app.files import audio
+from app.models.file import File
+from app.models.user import User
+from app.services import audio_cache
+from app.services.audio_cache import SegmentCache
+
+AUDIO = bytes(range(256)) * 40
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return SegmentCache(str(tmp_path), max_bytes=1 << 20, segment_size=1024)
+
+
+def test_segments_are_kept_per_blob_version(cache):
+    cache.put("a.wav", 0, b"old", version="etag-1")
+    assert cache.get("a.wav", 0, version="etag-1") == b"old"
+    assert cache.get("a.wav", 0, version="etag-2") is None
+
+
+def test_invalidate_drops_every_version(cache):
+    cache.put("a.wav", 0, b"old", version="etag-1")
+    cache.put("a.wav", 0, b"new", version="etag-2")
+    cache.put_meta("a.wav", {"size": 3, "etag": "etag-2"})
+    cache.invalidate("a.wav")
+    assert cache.get("a.wav", 0, version="etag-1") is None
+    assert cache.get("a.wav", 0, version="etag-2") is None
+    assert cache.get_meta("a.wav") is None
+
+
+def test_meta_expires_after_max_age(cache, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(audio_cache.time, "time", lambda: now[0])
+    cache.put_meta("a.wav", {"size": 3, "etag": "etag-1"})
+    now[0] += cache.meta_max_age
+    assert cache.get_meta("a.wav") == {"size": 3, "etag": "etag-1"}
+    now[0] += 1
+    assert cache.get_meta("a.wav") is None
+
+
+class MemoryBlobs:
+    """Serves blob properties and ranges from memory."""
+
+    blobs = {}
+
+    def __init__(self, connection_string=None, container_name=None):
+        pass
+
+    def get_blob_properties(self, blob_path):
+        data, etag = self.blobs[blob_path]
+        return {"size": len(data), "content_type": "audio/wav", "etag": etag}
+
+    def download_range(self, blob_path, offset, length):
+        return self.blobs[blob_path][0][offset : offset + length]
+
+
+@pytest.fixture
+def client(app, tmp_path, monkeypatch):
+    app.config.update(
+        AUDIO_CACHE_DIR=str(tmp_path / "audio"),
+        AUDIO_SEGMENT_BYTES=1024,
+        AZURE_STORAGE_CONTAINER="audio",
+    )
+    monkeypatch.setattr(audio, "BlobStorageService", MemoryBlobs)
+    monkeypatch.setattr(audio, "_local_grants", {})
+    monkeypatch.setattr(MemoryBlobs, "blobs", {"talk.wav": (AUDIO, "etag-1")})
+    user = User("listener", "listener@example.com", "pw", is_approved=True)
+    db.session.add(user)
+    db.session.commit()
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session["_user_id"] = str(user.id)
+        session["_fresh"] = True
+    file = File(
+        filename="talk.wav",
+        user_id=user.id,
+        blob_url="https://example.blob.core.windows.net/audio/talk.wav?sig=x",
+    )
+    db.session.add(file)
+    db.session.commit()
+    client.url = f"/files/{file.id}/audio"
+    return client
+
+
+def test_single_range_is_served_partially(client):
+    response = client.get(client.url, headers={"Range": "bytes=1000-1099"})
+    assert response.status_code == 206
+    assert response.headers["Content-Range"] == f"bytes 1000-1099/{len(AUDIO)}"
+    assert response.data == AUDIO[1000:1100]
+
+
+def test_unsatisfiable_range_is_refused(client):
+    response = client.get(client.url, headers={"Range": f"bytes={len(AUDIO)}-"})
+    assert response.status_code == 416
+    assert response.headers["Content-Range"] == f"bytes */{len(AUDIO)}"
+
+
+def test_multi_range_request_gets_the_whole_body(client):
+    response = client.get(client.url, headers={"Range": "bytes=0-1,5-9"})
+    assert response.status_code == 200
+    assert "Content-Range" not in response.headers
+    assert response.data == AUDIO
+
+
+def test_overwritten_blob_is_not_served_from_old_segments(client, app):
+    assert client.get(client.url).data == AUDIO
+    replaced = bytes(reversed(AUDIO))
+    MemoryBlobs.blobs["talk.wav"] = (replaced, "etag-2")
+    # Cached properties are trusted until they expire
+    assert client.get(client.url).data == AUDIO
+    audio_cache.get_segment_cache(app).meta_max_age = -1
+    response = client.get(client.url)
+    assert response.headers["ETag"] == '"etag-2"'
+    assert response.data == replaced
@@ -0,0 +1,247 @@
+import struct
+import wave
+import numpy as np
+import pytest
+from app.services.audio_processing import (
+    PEAKS_MAGIC,
+    PEAKS_VERSION,
+    PeaksBuilder,
+    SilenceDetector,
+    SilenceMap,
+    TICKS_PER_MS,
+    compute_waveform_peaks,
+    estimate_audio_seconds,
+    remap_transcript_offsets,
+)
+
+SAMPLE_RATE = 8000
+
+
+def write_wav(path, pattern):
+    """Write 16-bit mono audio from (milliseconds, is_tone) spans."""
+    chunks = []
+    for milliseconds, is_tone in pattern:
+        frames = SAMPLE_RATE * milliseconds // 1000
+        if is_tone:
+            t = np.arange(frames) / SAMPLE_RATE
+            chunks.append((np.sin(2 * np.pi * 440 * t) * 16000).astype("<i2"))
+        else:
+            chunks.append(np.zeros(frames, dtype="<i2"))
+    with wave.open(str(path), "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(SAMPLE_RATE)
+        wav_file.writeframes(np.concatenate(chunks).tobytes())
+
+
+def read_samples(path):
+    with wave.open(str(path), "rb") as wav_file:
+        return np.frombuffer(wav_file.readframes(wav_file.getnframes()), dtype="<i2")
+
+
+def ms(milliseconds):
+    return SAMPLE_RATE * milliseconds // 1000
+
+
+@pytest.fixture
+def speech_wav(tmp_path):
+    path = tmp_path / "speech.wav"
+    write_wav(path, [(1000, True), (3000, False), (1000, True), (3000, False)])
+    return path
+
+
+def make_detector(**kwargs):
+    kwargs.setdefault("min_silence_ms", 2000)
+    kwargs.setdefault("padding_ms", 250)
+    kwargs.setdefault("frame_ms", 10)
+    return SilenceDetector(**kwargs)
+
+
+def test_detect_keeps_padding_around_speech(speech_wav):
+    cuts, duration_ms = make_detector().detect(str(speech_wav))
+    assert duration_ms == 8000
+    assert cuts == [(1250, 3750), (5250, 8000)]
+
+
+def test_trim_mode_only_cuts_leading_and_trailing_silence(tmp_path):
+    path = tmp_path / "padded.wav"
+    write_wav(path, [(3000, False), (1000, True), (3000, False), (1000, True)])
+    cuts, _ = make_detector(mode="trim").detect(str(path))
+    assert cuts == [(0, 2750)]
+
+
+def test_short_silences_are_kept(speech_wav):
+    cuts, _ = make_detector(min_silence_ms=5000).detect(str(speech_wav))
+    assert cuts == []
+
+
+def test_compact_writes_kept_regions(speech_wav, tmp_path):
+    output = tmp_path / "compacted.wav"
+    silence_map = make_detector().compact(str(speech_wav), str(output))
+    assert silence_map.regions == [(0, 0, 1250), (1250, 3750, 1500)]
+    assert silence_map.kept_ms == 2750
+    assert silence_map.removed_ms == 5250
+    original = read_samples(speech_wav)
+    compacted = read_samples(output)
+    assert compacted.size == ms(2750)
+    assert np.array_equal(compacted[: ms(1250)], original[: ms(1250)])
+    assert np.array_equal(compacted[ms(1250) :], original[ms(3750) : ms(5250)])
+
+
+def test_compact_returns_none_without_cuts(speech_wav, tmp_path):
+    output = tmp_path / "compacted.wav"
+    detector = make_detector(min_silence_ms=5000)
+    assert detector.compact(str(speech_wav), str(output)) is None
+    assert not output.exists()
+
+
+def test_to_original_maps_compacted_speech_back(speech_wav, tmp_path):
+    silence_map = make_detector().compact(
+        str(speech_wav), str(tmp_path / "compacted.wav")
+    )
+    assert silence_map.to_original(0) == 0
+    assert silence_map.to_original(1000) == 1000
+    # The second tone starts 250ms into the second kept region
+    assert silence_map.to_original(1500) == 4000
+    assert silence_map.to_original(1250) == 3750
+    assert silence_map.to_original(1250, is_end=True) == 1250
+    assert silence_map.to_original(2750, is_end=True) == 5250
+
+
+def test_silence_map_json_round_trip():
+    silence_map = SilenceMap([(0, 0, 1250), (1250, 3750, 1500)], 8000)
+    restored = SilenceMap.from_json(silence_map.to_json())
+    assert restored.regions == silence_map.regions
+    assert restored.original_duration_ms == 8000
+
+
+def test_remap_transcript_offsets():
+    silence_map = SilenceMap([(0, 0, 1250), (1250, 3750, 1500)], 8000)
+
+    def timed(start_ms, end_ms):
+        return {
+            "offsetInTicks": float(start_ms * TICKS_PER_MS),
+            "durationInTicks": float((end_ms - start_ms) * TICKS_PER_MS),
+            "offset": "",
+            "duration": "",
+        }
+
+    result = {
+        "durationMilliseconds": 2750,
+        "recognizedPhrases": [
+            {
+                **timed(1000, 1500),
+                "nBest": [{"words": [timed(1000, 1200), timed(1300, 1500)]}],
+            },
+            {"offsetMilliseconds": 2000, "durationMilliseconds": 750, "nBest": []},
+        ],
+    }
+    remap_transcript_offsets(result, silence_map)
+    phrase, second = result["recognizedPhrases"]
+    assert phrase["offsetInTicks"] == 1000 * TICKS_PER_MS
+    assert phrase["durationInTicks"] == 3000 * TICKS_PER_MS
+    assert phrase["offset"] == "PT1.00S"
+    assert phrase["duration"] == "PT3.00S"
+    first_word, second_word = phrase["nBest"][0]["words"]
+    assert first_word["offsetInTicks"] == 1000 * TICKS_PER_MS
+    assert first_word["durationInTicks"] == 200 * TICKS_PER_MS
+    assert second_word["offsetInTicks"] == 3800 * TICKS_PER_MS
+    assert second_word["durationInTicks"] == 200 * TICKS_PER_MS
+    assert second["offsetMilliseconds"] == 4500
+    assert second["durationMilliseconds"] == 750
+    assert result["durationMilliseconds"] == 8000
+
+
+def parse_peaks(data):
+    """Decode the binary peaks format into its header and per-level pairs."""
+    magic, version, sample_rate, total_samples, count = struct.unpack_from(
+        "<4sHIQH", data
+    )
+    offset = struct.calcsize("<4sHIQH")
+    levels = []
+    for _ in range(count):
+        levels.append(struct.unpack_from("<II", data, offset))
+        offset += 8
+    pairs = []
+    for samples_per_peak, peaks in levels:
+        values = np.frombuffer(data, dtype=np.int8, count=peaks * 2, offset=offset)
+        pairs.append((samples_per_peak, values.reshape(-1, 2).tolist()))
+        offset += peaks * 2
+    assert offset == len(data)
+    return magic, version, sample_rate, total_samples, pairs
+
+
+def test_peaks_binary_format():
+    samples = np.array([0, 10, -20, 127, -127, 30, 0, 0, 5, -5], dtype=np.float32)
+    builder = PeaksBuilder(8000, base_samples=4, factor=2, levels=4)
+    builder.add(samples[:3] / 127)
+    builder.add(samples[3:] / 127)
+    magic, version, sample_rate, total_samples, levels = parse_peaks(builder.to_bytes())
+    assert (magic, version, sample_rate, total_samples) == (
+        PEAKS_MAGIC,
+        PEAKS_VERSION,
+        8000,
+        10,
+    )
+    # Coarser levels stop once a single peak covers the audio
+    assert levels == [
+        (4, [[-20, 127], [-127, 30], [-5, 5]]),
+        (8, [[-127, 127], [-5, 5]]),
+        (16, [[-127, 127]]),
+    ]
+
+
+def test_peaks_of_empty_audio():
+    _, _, _, total_samples, levels = parse_peaks(PeaksBuilder(8000).to_bytes())
+    assert total_samples == 0
+    assert levels == [(512, [])]
+
+
+def test_compute_waveform_peaks_reads_wav(speech_wav):
+    _, _, sample_rate, total_samples, levels = parse_peaks(
+        compute_waveform_peaks(str(speech_wav))
+    )
+    assert sample_rate == SAMPLE_RATE
+    assert total_samples == ms(8000)
+    samples_per_peak, pairs = levels[0]
+    assert len(pairs) == -(-ms(8000) // samples_per_peak)
+    assert max(high for _, high in pairs) >= 60
+    assert pairs[-1] == [0, 0]
+
+
+def test_estimate_audio_seconds(speech_wav, tmp_path):
+    assert estimate_audio_seconds(str(speech_wav)) == 8.0
+    compressed = tmp_path / "talk.mp3"
+    compressed.write_bytes(b"\0" * 32000)
+    assert estimate_audio_seconds(str(compressed)) == 2.0
+    broken = tmp_path / "broken.wav"
+    broken.write_bytes(b"not a wav")
+    assert estimate_audio_seconds(str(broken)) is None
+    assert estimate_audio_seconds(str(tmp_path / "missing.mp3")) is None
+
+
+def test_same_named_uploads_get_separate_blobs(app, speech_wav):
+    from app.tasks.upload_tasks import prepare_submission_audio, upload_blob_path
+
+    class RecordingBlobs:
+        def __init__(self):
+            self.paths = []
+
+        def upload_file(self, file_path, blob_path, *args):
+            self.paths.append(blob_path)
+            return f"https://blob/{blob_path}"
+
+    app.config["SILENCE_TRIM_ENABLED"] = True
+    blobs = RecordingBlobs()
+    for upload_id in ("first", "second"):
+        url, silence_map = prepare_submission_audio(
+            app, blobs, str(speech_wav), "talk.wav", upload_id
+        )
+        assert url and silence_map
+    assert blobs.paths == [
+        "uploads/first/compacted/talk.wav",
+        "uploads/second/compacted/talk.wav",
+    ]
+    assert upload_blob_path("first", "talk.wav") != upload_blob_path(
+        "second", "talk.wav"
+    )
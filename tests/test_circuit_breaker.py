@@ -0,0 +1,115 @@
+import pytest
+from app.errors.exceptions import ResourceNotFoundError, ServiceError
+from app.services import circuit_breaker
+from app.services.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    is_dependency_failure,
+)
+
+
+@pytest.fixture(params=["redis", "local"])
+def make_breaker(request, monkeypatch):
+    """Build breakers backed by Redis or by process-local state."""
+    monkeypatch.setattr(circuit_breaker, "_local_state", {})
+    store = None if request.param == "local" else request.getfixturevalue("redis")
+
+    def make(**kwargs):
+        kwargs.setdefault("min_calls", 4)
+        kwargs.setdefault("failure_ratio", 0.5)
+        kwargs.setdefault("open_seconds", 30)
+        return CircuitBreaker(store, "speech", **kwargs)
+
+    return make
+
+
+def age(breaker, seconds):
+    """Move the time the circuit opened back by seconds."""
+    if breaker.redis is None:
+        circuit_breaker._local_state[breaker.name]["opened_at"] -= seconds
+    else:
+        opened_at = float(breaker.redis.hget(breaker.state_key, "opened_at"))
+        breaker.redis.hset(breaker.state_key, "opened_at", opened_at - seconds)
+
+
+def trip(breaker):
+    for _ in range(breaker.min_calls):
+        state = breaker.record(False)
+    assert state == OPEN
+
+
+def test_stays_closed_below_min_calls(make_breaker):
+    breaker = make_breaker()
+    for _ in range(3):
+        assert breaker.record(False) == CLOSED
+    assert breaker.allow() == (CLOSED, True, 0.0)
+
+
+def test_opens_at_failure_ratio(make_breaker):
+    breaker = make_breaker()
+    assert breaker.record(True) == CLOSED
+    assert breaker.record(True) == CLOSED
+    assert breaker.record(False) == CLOSED
+    assert breaker.record(False) == OPEN
+    state, allowed, retry_after = breaker.allow()
+    assert (state, allowed) == (OPEN, False)
+    assert 0 < retry_after <= 30
+
+
+def test_check_raises_503_while_open(make_breaker):
+    breaker = make_breaker()
+    trip(breaker)
+    with pytest.raises(ServiceError) as excinfo:
+        breaker.check()
+    assert excinfo.value.status_code == 503
+    assert excinfo.value.payload["circuit"] == OPEN
+    assert breaker.snapshot()["rejected"] == 1
+
+
+def test_half_open_limits_probes(make_breaker):
+    breaker = make_breaker(half_open_probes=2)
+    trip(breaker)
+    age(breaker, 31)
+    assert breaker.allow()[:2] == (HALF_OPEN, True)
+    assert breaker.allow()[:2] == (HALF_OPEN, True)
+    assert breaker.allow()[:2] == (HALF_OPEN, False)
+
+
+def test_successful_probe_closes(make_breaker):
+    breaker = make_breaker()
+    trip(breaker)
+    age(breaker, 31)
+    breaker.allow()
+    assert breaker.record(True) == CLOSED
+    assert breaker.allow() == (CLOSED, True, 0.0)
+    assert breaker.snapshot()["window_calls"] == 0
+
+
+def test_failed_probe_reopens(make_breaker):
+    breaker = make_breaker()
+    trip(breaker)
+    age(breaker, 31)
+    breaker.allow()
+    assert breaker.record(False) == OPEN
+    assert breaker.allow()[:2] == (OPEN, False)
+    assert breaker.snapshot()["opened_count"] == 2
+
+
+def test_lost_probe_is_replaced_after_open_seconds(make_breaker):
+    breaker = make_breaker()
+    trip(breaker)
+    age(breaker, 31)
+    assert breaker.allow()[:2] == (HALF_OPEN, True)
+    assert breaker.allow()[:2] == (HALF_OPEN, False)
+    age(breaker, 31)
+    assert breaker.allow()[:2] == (HALF_OPEN, True)
+
+
+def test_client_errors_are_not_dependency_failures():
+    assert not is_dependency_failure(ResourceNotFoundError("gone"))
+    assert not is_dependency_failure(ServiceError("bad", status_code=400))
+    assert is_dependency_failure(ServiceError("throttled", status_code=429))
+    assert is_dependency_failure(ServiceError("down", status_code=503))
+    assert is_dependency_failure(ConnectionError())
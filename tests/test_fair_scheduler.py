@@ -0,0 +1,221 @@
+import pytest
+from app.services import fair_scheduler
+from app.services.fair_scheduler import FairScheduler, KEY_PREFIX
+
+
+class Clock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(fair_scheduler.time, "time", clock)
+    return clock
+
+
+def make_scheduler(redis, **kwargs):
+    kwargs.setdefault("max_inflight", 3)
+    kwargs.setdefault("resource", "eastus")
+    return FairScheduler(redis, **kwargs)
+
+
+def taken_ids(jobs):
+    return [job["file_id"] for job in jobs]
+
+
+def ring(redis):
+    return [user.decode() for user in redis.lrange(f"{KEY_PREFIX}:ring", 0, -1)]
+
+
+def test_enqueue_ignores_duplicates(redis, clock):
+    scheduler = make_scheduler(redis)
+    assert scheduler.enqueue(1, 10)
+    assert not scheduler.enqueue(1, 10)
+    assert ring(redis) == ["1"]
+
+
+def test_take_round_robins_across_users(redis, clock):
+    scheduler = make_scheduler(redis, max_inflight=10)
+    for file_id in (10, 11, 12):
+        scheduler.enqueue(1, file_id)
+        clock.now += 1
+    for file_id in (20, 21):
+        scheduler.enqueue(2, file_id)
+        clock.now += 1
+    assert taken_ids(scheduler.take()) == [10, 20, 11, 21, 12]
+    assert ring(redis) == []
+
+
+def test_take_rotates_ring_between_calls(redis, clock):
+    scheduler = make_scheduler(redis, max_inflight=10)
+    for file_id in (10, 11):
+        scheduler.enqueue(1, file_id)
+    for file_id in (20, 21):
+        scheduler.enqueue(2, file_id)
+    assert taken_ids(scheduler.take(limit=1)) == [10]
+    assert ring(redis) == ["2", "1"]
+    assert taken_ids(scheduler.take(limit=1)) == [20]
+
+
+def test_user_cap_skips_user_until_a_job_finishes(redis, clock):
+    scheduler = make_scheduler(redis, max_inflight=2)
+    for file_id in (10, 11, 12):
+        scheduler.enqueue(1, file_id)
+        clock.now += 1
+    scheduler.enqueue(2, 20)
+    assert taken_ids(scheduler.take()) == [10, 20, 11]
+    assert scheduler.take() == []
+    assert ring(redis) == ["1"]
+    assert scheduler.remove(10)
+    assert taken_ids(scheduler.take()) == [12]
+
+
+def test_stale_inflight_slots_expire(redis, clock):
+    scheduler = make_scheduler(redis, max_inflight=1, inflight_ttl=100)
+    scheduler.enqueue(1, 10)
+    scheduler.enqueue(1, 11)
+    assert taken_ids(scheduler.take()) == [10]
+    clock.now += 50
+    assert scheduler.take() == []
+    clock.now += 51
+    assert taken_ids(scheduler.take()) == [11]
+    assert redis.hget(f"{KEY_PREFIX}:jobs", 10) is None
+    assert redis.zscore(f"{KEY_PREFIX}:resource:eastus", 10) is None
+
+
+def test_remove_pending_job_leaves_ring_when_queue_empties(redis, clock):
+    scheduler = make_scheduler(redis)
+    scheduler.enqueue(1, 10)
+    scheduler.enqueue(1, 11)
+    scheduler.enqueue(2, 20)
+    assert scheduler.remove(10)
+    assert ring(redis) == ["1", "2"]
+    assert scheduler.remove(11)
+    assert ring(redis) == ["2"]
+    assert not scheduler.is_pending(11)
+    assert not scheduler.remove(11)
+    assert taken_ids(scheduler.take()) == [20]
+
+
+def test_remove_inflight_job_frees_its_slots(redis, clock):
+    scheduler = make_scheduler(redis, max_inflight=1)
+    scheduler.enqueue(1, 10)
+    scheduler.enqueue(1, 11)
+    scheduler.take()
+    assert not scheduler.is_pending(10)
+    assert scheduler.is_pending(11)
+    assert scheduler.remove(10)
+    assert redis.zcard(f"{KEY_PREFIX}:inflight:1") == 0
+    assert redis.zcard(f"{KEY_PREFIX}:resource:eastus") == 0
+    assert ring(redis) == ["1"]
+    assert taken_ids(scheduler.take()) == [11]
+
+
+def test_take_prefers_shorter_audio_within_a_user(redis, clock):
+    scheduler = make_scheduler(redis, max_inflight=10)
+    scheduler.enqueue(1, 10, estimated_seconds=3600)
+    clock.now += 60
+    scheduler.enqueue(1, 11, estimated_seconds=30)
+    assert taken_ids(scheduler.take()) == [11, 10]
+
+
+def test_each_turn_serves_the_shortest_next_job_first(redis, clock):
+    scheduler = make_scheduler(redis, max_inflight=10)
+    scheduler.enqueue(1, 10, estimated_seconds=3600)
+    clock.now += 60
+    scheduler.enqueue(2, 20, estimated_seconds=30)
+    assert taken_ids(scheduler.take(limit=1)) == [20]
+    assert taken_ids(scheduler.take(limit=1)) == [10]
+
+
+def test_short_jobs_do_not_take_a_second_turn_early(redis, clock):
+    scheduler = make_scheduler(redis, max_inflight=10)
+    scheduler.enqueue(1, 10, estimated_seconds=3600)
+    for file_id in (20, 21, 22):
+        scheduler.enqueue(2, file_id, estimated_seconds=30)
+    assert taken_ids(scheduler.take(limit=1)) == [20]
+    assert taken_ids(scheduler.take(limit=1)) == [10]
+    scheduler.enqueue(1, 11, estimated_seconds=3600)
+    assert taken_ids(scheduler.take()) == [21, 11, 22]
+
+
+def test_long_audio_is_not_overtaken_by_much_later_jobs(redis, clock):
+    scheduler = make_scheduler(redis, max_inflight=10, duration_weight=1.0)
+    scheduler.enqueue(1, 10, estimated_seconds=600)
+    clock.now += 700
+    scheduler.enqueue(1, 11, estimated_seconds=30)
+    assert taken_ids(scheduler.take()) == [10, 11]
+
+
+def test_unknown_duration_uses_the_default(redis, clock):
+    scheduler = make_scheduler(redis, max_inflight=10, default_seconds=600)
+    scheduler.enqueue(1, 10)
+    scheduler.enqueue(1, 11, estimated_seconds=900)
+    scheduler.enqueue(1, 12, estimated_seconds=300)
+    jobs = scheduler.take()
+    assert taken_ids(jobs) == [12, 10, 11]
+    assert jobs[1]["estimated_seconds"] == 600
+
+
+def test_resource_cap_limits_jobs_across_users(redis, clock):
+    scheduler = make_scheduler(redis, max_inflight=10, resource_max_inflight=3)
+    for user_id in (1, 2):
+        for index in range(3):
+            scheduler.enqueue(user_id, user_id * 10 + index)
+            clock.now += 1
+    assert taken_ids(scheduler.take()) == [10, 20, 11]
+    assert scheduler.take() == []
+    scheduler.remove(20)
+    assert taken_ids(scheduler.take()) == [21]
+
+
+def test_stale_resource_slots_expire(redis, clock):
+    scheduler = make_scheduler(
+        redis, max_inflight=10, resource_max_inflight=1, inflight_ttl=100
+    )
+    scheduler.enqueue(1, 10)
+    scheduler.enqueue(2, 20)
+    assert taken_ids(scheduler.take()) == [10]
+    clock.now += 101
+    assert taken_ids(scheduler.take()) == [20]
+
+
+def test_remove_unknown_job_still_frees_resource_slot(redis, clock):
+    scheduler = make_scheduler(redis)
+    redis.zadd(f"{KEY_PREFIX}:resource:eastus", {"10": clock.now})
+    assert not scheduler.remove(10)
+    assert redis.zcard(f"{KEY_PREFIX}:resource:eastus") == 0
+
+
+def test_capacity_reports_slots_and_queue_depth(redis, clock):
+    scheduler = make_scheduler(redis, max_inflight=1, resource_max_inflight=5)
+    scheduler.enqueue(1, 10)
+    scheduler.enqueue(1, 11)
+    scheduler.enqueue(2, 20)
+    scheduler.take()
+    assert scheduler.capacity() == {
+        "resource": "eastus",
+        "max_inflight": 5,
+        "inflight": 2,
+        "available": 3,
+        "queue_depth": 1,
+        "users_waiting": 1,
+        "user_max_inflight": 1,
+    }
+
+
+def test_queue_positions_count_other_users_turns(redis, clock):
+    scheduler = make_scheduler(redis)
+    for file_id in (10, 11, 12):
+        scheduler.enqueue(1, file_id)
+        clock.now += 1
+    scheduler.enqueue(2, 20)
+    scheduler.enqueue(2, 21)
+    assert scheduler.queue_positions(1) == {"10": 2, "11": 4, "12": 5}
+    assert scheduler.queue_positions(2) == {"20": 2, "21": 4}
+    assert scheduler.queue_positions(3) == {}
@@ -0,0 +1,130 @@
+import pytest
+from app.services import file_lease
+from app.services.file_lease import DispatchRegistry, FileLease, check_lease_ttl
+
+
+@pytest.fixture(params=["redis", "local"])
+def store(request, monkeypatch):
+    """Run each test against Redis and the process-local fallback."""
+    monkeypatch.setattr(file_lease, "_local_keys", {})
+    if request.param == "local":
+        return None
+    return request.getfixturevalue("redis")
+
+
+def test_acquire_is_exclusive(store):
+    first = FileLease(store, 1)
+    assert first.acquire()
+    assert not FileLease(store, 1).acquire()
+    assert FileLease(store, 2).acquire()
+    assert FileLease(store, 1).held()
+    assert not FileLease(store, 3).held()
+
+
+def test_only_holder_renews_and_releases(store):
+    holder = FileLease(store, 1)
+    other = FileLease(store, 1)
+    holder.acquire()
+    assert not other.renew()
+    assert other.lost
+    other.release()
+    assert not FileLease(store, 1).acquire()
+    assert holder.renew()
+    holder.release()
+    assert other.acquire()
+
+
+def test_context_manager_releases(store):
+    with FileLease(store, 1) as lease:
+        assert lease.acquire()
+        assert not FileLease(store, 1).acquire()
+    assert FileLease(store, 1).acquire()
+
+
+def test_local_lease_expires_after_ttl(monkeypatch):
+    monkeypatch.setattr(file_lease, "_local_keys", {})
+    now = [100.0]
+    monkeypatch.setattr(file_lease.time, "monotonic", lambda: now[0])
+    lease = FileLease(None, 1, ttl=10)
+    assert lease.acquire()
+    now[0] += 9
+    assert not FileLease(None, 1).acquire()
+    now[0] += 2
+    assert not lease.renew()
+    assert FileLease(None, 1).acquire()
+
+
+def test_dispatch_registry_returns_first_task_id(store):
+    registry = DispatchRegistry(store)
+    assert registry.claim("file:1", "task-a") is None
+    assert registry.claim("file:1", "task-b") == "task-a"
+    assert registry.pending("file:1")
+    registry.forget("file:1")
+    assert not registry.pending("file:1")
+    assert registry.claim("file:1", "task-b") is None
+
+
+def test_carried_token_acts_as_the_holder(store):
+    holder = FileLease(store, 1)
+    holder.acquire()
+    carried = FileLease(store, 1, token=holder.token)
+    assert carried.renew()
+    carried.release()
+    assert not holder.held()
+
+
+def test_hand_off_keeps_the_lease(store):
+    with FileLease(store, 1) as lease:
+        lease.acquire()
+        lease.hand_off()
+    assert lease.held()
+    with FileLease(store, 1, token=lease.token) as carried:
+        assert carried.renew()
+    assert not lease.held()
+
+
+def expire(lease):
+    """Let a lease run out without waiting for its TTL."""
+    if lease.redis is None:
+        file_lease._local_keys.pop(lease.key, None)
+    else:
+        lease.redis.delete(lease.key)
+
+
+def test_resume_renews_a_live_lease(store):
+    holder = FileLease(store, 1)
+    holder.acquire()
+    carried = FileLease(store, 1, token=holder.token)
+    assert carried.resume()
+    assert not carried.retaken
+    assert not carried.lost
+
+
+def test_resume_retakes_an_expired_lease(store):
+    holder = FileLease(store, 1)
+    holder.acquire()
+    expire(holder)
+    carried = FileLease(store, 1, token=holder.token)
+    assert carried.resume()
+    assert carried.retaken
+    assert not carried.lost
+    assert not FileLease(store, 1).acquire()
+
+
+def test_resume_fails_when_another_token_holds_the_lease(store):
+    holder = FileLease(store, 1)
+    holder.acquire()
+    expire(holder)
+    assert FileLease(store, 1).acquire()
+    assert not FileLease(store, 1, token=holder.token).resume()
+
+
+def test_check_lease_ttl():
+    config = {
+        "TRANSCRIPTION_POLL_INTERVAL": 60,
+        "TRANSCRIPTION_QUEUE_LATENCY": 600,
+        "TRANSCRIPTION_LEASE_TTL": 660,
+    }
+    assert check_lease_ttl(config)
+    config["TRANSCRIPTION_LEASE_TTL"] = 300
+    assert not check_lease_ttl(config)
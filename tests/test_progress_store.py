@@ -0,0 +1,95 @@
+import pytest
+from app.extensions import db
+from app.models.file import File
+from app.services.progress_store import (
+    ProgressStore,
+    flush_progress,
+    merge_live_progress,
+)
+
+
+@pytest.fixture(params=["redis", "local"])
+def store(request):
+    """Run each test against Redis and the process-local fallback."""
+    if request.param == "local":
+        return ProgressStore()
+    return ProgressStore(redis=request.getfixturevalue("redis"))
+
+
+def add_file(status, progress=0.0, stage=None):
+    file = File(
+        filename=f"{status}.wav",
+        status=status,
+        progress_percent=progress,
+        current_stage=stage,
+    )
+    db.session.add(file)
+    db.session.commit()
+    return file.id
+
+
+def test_flush_updates_processing_files_only(app, store):
+    processing = add_file("processing", 10.0, "polling")
+    other = add_file("processing", 5.0, "submitting")
+    finished = add_file("completed", 100.0, "done")
+    store.record(processing, 40.0, current_stage="transcribing")
+    store.record(other, 20.0)
+    store.record(finished, 50.0, current_stage="transcribing")
+    assert flush_progress(store) == 3
+    db.session.expire_all()
+    assert db.session.get(File, processing).progress_percent == 40.0
+    assert db.session.get(File, processing).current_stage == "transcribing"
+    # A missing stage keeps the one already on the row
+    assert db.session.get(File, other).progress_percent == 20.0
+    assert db.session.get(File, other).current_stage == "submitting"
+    assert db.session.get(File, finished).progress_percent == 100.0
+    assert db.session.get(File, finished).current_stage == "done"
+
+
+def test_flush_only_writes_files_updated_since_the_last_flush(app, store):
+    file_id = add_file("processing")
+    store.record(file_id, 30.0)
+    assert flush_progress(store) == 1
+    assert flush_progress(store) == 0
+    store.record(file_id, 35.0)
+    assert flush_progress(store) == 1
+
+
+def test_cleared_files_are_not_flushed(app, store):
+    file_id = add_file("processing")
+    store.record(file_id, 30.0)
+    store.clear(file_id)
+    assert flush_progress(store) == 0
+    assert store.get(file_id) is None
+
+
+def test_failed_flush_keeps_files_pending(app, store, monkeypatch):
+    file_id = add_file("processing")
+    store.record(file_id, 30.0, current_stage="transcribing")
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("database unavailable")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(db.session, "execute", fail)
+        with pytest.raises(RuntimeError):
+            flush_progress(store)
+    assert flush_progress(store) == 1
+    db.session.expire_all()
+    assert db.session.get(File, file_id).current_stage == "transcribing"
+
+
+def test_merge_live_progress_overlays_processing_files(store):
+    store.record("a", 60.0, current_stage="transcribing", stage_progress=0.5)
+    store.record("b", 70.0)
+    files = [
+        {"id": "a", "status": "processing", "progress_percent": 10.0},
+        {"id": "b", "status": "completed", "progress_percent": 100.0},
+        {"id": "c", "status": "processing", "progress_percent": 5.0},
+    ]
+    merge_live_progress(store, files)
+    assert files[0]["progress_percent"] == 60.0
+    assert files[0]["current_stage"] == "transcribing"
+    assert files[0]["stage_progress"] == 0.5
+    assert files[1]["progress_percent"] == 100.0
+    assert files[2]["progress_percent"] == 5.0
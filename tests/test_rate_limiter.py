@@ -0,0 +1,90 @@
+import time
+from email.utils import formatdate
+import pytest
+from app.errors.exceptions import RateLimitError
+from app.services import rate_limiter
+from app.services.rate_limiter import RateLimiter, parse_retry_after
+
+
+@pytest.fixture(params=["redis", "local"])
+def make_limiter(request, monkeypatch):
+    """Build limiters backed by Redis or by process-local buckets."""
+    monkeypatch.setattr(rate_limiter, "_local_buckets", {})
+    monkeypatch.setattr(rate_limiter, "_local_metrics", {})
+    store = None if request.param == "local" else request.getfixturevalue("redis")
+
+    def make(**kwargs):
+        kwargs.setdefault("rate", 1.0)
+        kwargs.setdefault("burst", 2)
+        kwargs.setdefault("jitter", 0)
+        return RateLimiter(store, "speech", **kwargs)
+
+    return make
+
+
+def test_burst_then_wait_for_refill(make_limiter):
+    limiter = make_limiter(rate=2.0, burst=2)
+    assert limiter._take() == 0
+    assert limiter._take() == 0
+    assert 0.4 < limiter._take() <= 0.5
+
+
+def test_tokens_refill_over_time(make_limiter):
+    limiter = make_limiter(rate=20.0, burst=1)
+    assert limiter._take() == 0
+    assert limiter._take() > 0
+    time.sleep(0.1)
+    assert limiter._take() == 0
+
+
+def test_acquire_raises_when_the_wait_passes_the_deadline(make_limiter):
+    limiter = make_limiter(rate=0.1, burst=1)
+    assert limiter.acquire() < 0.05
+    with pytest.raises(RateLimitError) as excinfo:
+        limiter.acquire(deadline=time.monotonic() + 1)
+    assert excinfo.value.payload["retry_after"] > 9
+    metrics = limiter.metrics()
+    assert metrics["requests"] == 1
+    assert metrics["deadline_exceeded"] == 1
+
+
+def test_acquire_sleeps_until_a_token_is_free(make_limiter):
+    limiter = make_limiter(rate=20.0, burst=1)
+    limiter.acquire()
+    assert 0.02 < limiter.acquire(deadline=time.monotonic() + 1) < 0.5
+
+
+def test_throttle_blocks_every_caller(make_limiter):
+    make_limiter(burst=10).throttle(5)
+    other = make_limiter(burst=10)
+    assert 4.5 < other._take() <= 5
+    metrics = other.metrics()
+    assert metrics["throttled_responses"] == 1
+    assert metrics["throttled_seconds"] == 5
+
+
+def test_shorter_throttle_does_not_cut_a_longer_one(make_limiter):
+    limiter = make_limiter(burst=10)
+    limiter.throttle(5)
+    limiter.throttle(1)
+    assert limiter._take() > 4
+
+
+def test_zero_throttle_does_not_block(make_limiter, caplog):
+    limiter = make_limiter(burst=10)
+    limiter.throttle(0)
+    assert "Could not share throttle" not in caplog.text
+    assert limiter._take() == 0
+    if limiter.redis is not None:
+        assert limiter.redis.get(limiter.blocked_key) is None
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("1.5") == 1.5
+    assert parse_retry_after("-2") == 0.0
+    assert parse_retry_after("") is None
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    assert 25 < parse_retry_after(formatdate(time.time() + 30, usegmt=True)) <= 30
+    assert parse_retry_after(formatdate(time.time() - 30, usegmt=True)) == 0.0
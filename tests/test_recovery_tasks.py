@@ -0,0 +1,123 @@
+from datetime import datetime, timedelta
+import pytest
+from app.errors.exceptions import TranscriptionError
+from app.extensions import db
+from app.models.file import File
+from app.services.file_lease import dispatch_registry, file_lease
+from app.tasks import recovery_tasks
+from app.tasks.recovery_tasks import orphaned_files, recover_file
+
+NOW = datetime(2026, 1, 1, 12, 0)
+STALE_BEFORE = NOW - timedelta(hours=24)
+
+
+class Speech:
+    """Answers job status queries with a fixed status or error."""
+
+    def __init__(self, status=None, error=None):
+        self.status = status
+        self.error = error
+        self.queried = []
+
+    def get_transcription_status(self, transcription_id):
+        self.queried.append(transcription_id)
+        if self.error is not None:
+            raise self.error
+        return {
+            "status": self.status,
+            "properties": {"error": {"message": "bad audio"}},
+        }
+
+
+@pytest.fixture
+def dispatched(app, monkeypatch):
+    dispatched = []
+    monkeypatch.setattr(recovery_tasks, "dispatch_transcription", dispatched.append)
+    return dispatched
+
+
+def add_file(status="processing", transcription_id="job-1", started=NOW):
+    file = File(
+        filename="meeting.wav",
+        status=status,
+        transcription_id=transcription_id,
+        upload_time=started,
+        transcription_started_at=started,
+    )
+    db.session.add(file)
+    db.session.commit()
+    return file.id
+
+
+def orphan(file_id):
+    (row,) = [row for row in orphaned_files(100) if row.id == file_id]
+    return row
+
+
+def status_of(file_id):
+    db.session.expire_all()
+    return db.session.get(File, file_id).status
+
+
+def test_orphaned_files_skip_leased_queued_and_finished_files(app):
+    orphaned = add_file()
+    leased = add_file()
+    queued = add_file()
+    add_file(status="completed")
+    assert file_lease(app, leased).acquire()
+    dispatch_registry(app).claim(queued, "task-1")
+    assert [row.id for row in orphaned_files(100)] == [orphaned]
+
+
+def test_gone_job_is_resubmitted(dispatched):
+    file_id = add_file()
+    speech = Speech(error=TranscriptionError("missing", status_code=404))
+    assert recover_file(orphan(file_id), speech, STALE_BEFORE) == "resubmitted"
+    assert dispatched == [file_id]
+
+
+@pytest.mark.parametrize("status_code", [None, 429, 500, 503])
+def test_unreachable_job_is_left_for_the_next_scan(dispatched, status_code):
+    file_id = add_file()
+    speech = Speech(error=TranscriptionError("unavailable", status_code=status_code))
+    with pytest.raises(TranscriptionError):
+        recover_file(orphan(file_id), speech, STALE_BEFORE)
+    assert dispatched == []
+    assert status_of(file_id) == "processing"
+
+
+def test_failed_job_fails_the_file(dispatched):
+    file_id = add_file()
+    assert recover_file(orphan(file_id), Speech("Failed"), STALE_BEFORE) == "failed"
+    assert dispatched == []
+    assert status_of(file_id) == "error"
+    assert "bad audio" in db.session.get(File, file_id).error_message
+
+
+@pytest.mark.parametrize("status", ["Running", "NotStarted", "Succeeded"])
+def test_live_or_finished_job_is_resumed(dispatched, status):
+    file_id = add_file()
+    assert recover_file(orphan(file_id), Speech(status), STALE_BEFORE) == "resumed"
+    assert dispatched == [file_id]
+
+
+def test_stale_file_is_failed_unless_its_job_succeeded(dispatched):
+    old = NOW - timedelta(days=3)
+    running = add_file(started=old)
+    succeeded = add_file(started=old)
+    never_submitted = add_file(transcription_id=None, started=old)
+    assert recover_file(orphan(running), Speech("Running"), STALE_BEFORE) == "failed"
+    assert (
+        recover_file(orphan(succeeded), Speech("Succeeded"), STALE_BEFORE) == "resumed"
+    )
+    assert recover_file(orphan(never_submitted), Speech(), STALE_BEFORE) == "failed"
+    assert dispatched == [succeeded]
+    assert status_of(running) == "error"
+
+
+def test_file_without_a_job_is_resubmitted(dispatched):
+    file_id = add_file(transcription_id=None)
+    speech = Speech()
+    assert recover_file(orphan(file_id), speech, STALE_BEFORE) == "resubmitted"
+    assert speech.queried == []
+    assert dispatched == [file_id]
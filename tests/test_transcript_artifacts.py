@@ -0,0 +1,192 @@
+import json
+from types import SimpleNamespace
+import pytest
+from app.errors.exceptions import StorageError, ValidationError
+from app.services.transcript_artifacts import (
+    artifact_blob_path,
+    legacy_artifact_blob_path,
+    load_processed_transcript,
+    load_word_index,
+    processed_artifact_name,
+    word_index_artifact_name,
+)
+from app.services.transcript_processing import (
+    build_processed_transcript,
+    format_timestamp,
+    process_transcript_data,
+)
+from app.services.word_index import WordIndex
+
+RAW_TRANSCRIPT = {
+    "source": "https://example.blob.core.windows.net/c/meeting.wav",
+    "duration": "PT5S",
+    "combinedRecognizedPhrases": [
+        {"channel": 0, "display": "Hello there. Bye.", "lexical": "hello there bye"}
+    ],
+    "recognizedPhrases": [
+        {
+            "recognitionStatus": "Success",
+            "offsetMilliseconds": 3000,
+            "durationMilliseconds": 1500,
+            "speaker": 2,
+            "nBest": [{"display": "Bye.", "confidence": 0.8, "words": []}],
+        },
+        {"recognitionStatus": "NoMatch", "offsetMilliseconds": 2000, "nBest": []},
+        {
+            "recognitionStatus": "Success",
+            "offsetMilliseconds": 500,
+            "durationMilliseconds": 1250,
+            "speaker": 1,
+            "nBest": [
+                {
+                    "display": "Hello there.",
+                    "confidence": 0.9,
+                    "words": [
+                        {
+                            "word": "hello",
+                            "offsetMilliseconds": 500,
+                            "durationMilliseconds": 400,
+                            "confidence": 0.95,
+                        },
+                        {
+                            "word": "there",
+                            "offsetMilliseconds": 1000,
+                            "durationMilliseconds": 750,
+                            "confidence": 0.85,
+                        },
+                    ],
+                }
+            ],
+        },
+    ],
+}
+
+
+class MemoryBlobs:
+    """Just enough of BlobStorageService to store and read artifacts."""
+
+    def __init__(self, blobs=None, fail_uploads=False):
+        self.blobs = dict(blobs or {})
+        self.fail_uploads = fail_uploads
+
+    def upload_bytes(self, data, blob_path, content_type=None):
+        if self.fail_uploads:
+            raise StorageError("upload failed", service="azure_storage")
+        self.blobs[blob_path] = data
+
+    def download_bytes(self, blob_path):
+        return self.blobs.get(blob_path)
+
+    def blob_path_from_url(self, blob_url):
+        return blob_url.rsplit("/", 1)[-1]
+
+
+def make_file(**kwargs):
+    kwargs.setdefault("id", 7)
+    kwargs.setdefault("filename", "uploads/meeting.wav")
+    kwargs.setdefault("transcript_url", "https://blob/meeting.json")
+    return SimpleNamespace(**kwargs)
+
+
+def test_process_transcript_data_orders_successful_phrases():
+    processed = process_transcript_data(RAW_TRANSCRIPT)
+    assert processed["combinedResults"] == [
+        {"channel": 0, "text": "Hello there. Bye.", "lexical": "hello there bye"}
+    ]
+    first, second = processed["segments"]
+    assert [first["text"], second["text"]] == ["Hello there.", "Bye."]
+    assert (first["start"], first["end"], first["speaker"]) == (
+        "00:00.500",
+        "00:01.750",
+        1,
+    )
+    assert first["words"][1] == {
+        "word": "there",
+        "start": "00:01.000",
+        "duration": "0.750s",
+        "offsetMilliseconds": 1000,
+        "durationMilliseconds": 750,
+        "confidence": 0.85,
+    }
+
+
+def test_process_transcript_data_rejects_empty_data():
+    with pytest.raises(ValidationError):
+        process_transcript_data({})
+
+
+def test_format_timestamp():
+    assert format_timestamp(0) == "00:00.000"
+    assert format_timestamp(61_234) == "01:01.234"
+    assert format_timestamp(3_600_000) == "60:00.000"
+
+
+def test_build_processed_transcript_is_compact_json():
+    payload = build_processed_transcript(RAW_TRANSCRIPT)
+    assert b": " not in payload and b", " not in payload
+    assert json.loads(payload) == process_transcript_data(RAW_TRANSCRIPT)
+
+
+def test_artifact_blob_path_is_keyed_by_file_id():
+    assert artifact_blob_path(7, "peaks.bin") == "transcripts/7/peaks.bin"
+    assert artifact_blob_path(7, "peaks.bin") != artifact_blob_path(8, "peaks.bin")
+
+
+def test_legacy_artifact_blob_path_uses_the_file_base_name():
+    assert (
+        legacy_artifact_blob_path("uploads/meeting.wav", "peaks.bin")
+        == "meeting/transcript/peaks.bin"
+    )
+
+
+def test_load_serves_the_stored_artifact():
+    path = artifact_blob_path(7, processed_artifact_name())
+    blobs = MemoryBlobs({path: b"stored"})
+    assert load_processed_transcript(blobs, make_file()) == b"stored"
+
+
+def test_load_regenerates_and_stores_a_missing_artifact():
+    blobs = MemoryBlobs({"meeting.json": json.dumps(RAW_TRANSCRIPT).encode()})
+    payload = load_processed_transcript(blobs, make_file())
+    assert payload == build_processed_transcript(RAW_TRANSCRIPT)
+    path = artifact_blob_path(7, processed_artifact_name())
+    assert blobs.blobs[path] == payload
+
+
+def test_load_still_serves_when_the_artifact_cannot_be_stored():
+    blobs = MemoryBlobs(
+        {"meeting.json": json.dumps(RAW_TRANSCRIPT).encode()}, fail_uploads=True
+    )
+    payload = load_processed_transcript(blobs, make_file())
+    assert payload == build_processed_transcript(RAW_TRANSCRIPT)
+
+
+def test_load_without_a_raw_transcript_raises():
+    with pytest.raises(StorageError):
+        load_processed_transcript(MemoryBlobs(), make_file())
+
+
+def test_word_index_is_built_from_the_processed_transcript():
+    blobs = MemoryBlobs({"meeting.json": json.dumps(RAW_TRANSCRIPT).encode()})
+    payload = load_word_index(blobs, make_file())
+    index = WordIndex.from_bytes(payload)
+    assert index.words == ["hello", "there"]
+    assert index.find("hello there") == ([0], 2)
+    path = artifact_blob_path(7, word_index_artifact_name())
+    assert blobs.blobs[path] == payload
+    assert load_word_index(MemoryBlobs({path: b"stored"}), make_file()) == b"stored"
+
+
+def test_legacy_artifacts_are_kept_while_another_file_shares_them(app):
+    from app.extensions import db
+    from app.files.routes import _shares_legacy_artifacts
+    from app.models.file import File
+
+    first = File(filename="meeting.wav", user_id=1)
+    db.session.add(first)
+    db.session.commit()
+    assert not _shares_legacy_artifacts(first)
+    db.session.add(File(filename="meeting.mp3", user_id=2))
+    db.session.add(File(filename="meeting-notes.wav", user_id=1))
+    db.session.commit()
+    assert _shares_legacy_artifacts(first)
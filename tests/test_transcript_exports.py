@@ -0,0 +1,87 @@
+import json
+import pytest
+from app.extensions import db
+from app.models.file import File
+from app.services import transcript_exports
+from app.services.transcript_exports import buffered, clock_time, generate_export
+from app.services.transcript_segments import replace_transcript_segments
+
+
+@pytest.fixture
+def file_id(app):
+    file = File(filename="meeting.wav", status="completed")
+    db.session.add(file)
+    db.session.commit()
+    segments = [
+        (3_725_004, 1_996, 2, "Later."),
+        (0, 1_500, 1, "Hello."),
+        (1_500, 999, 1, "Still me."),
+    ]
+    replace_transcript_segments(
+        file.id,
+        {
+            "segments": [
+                {
+                    "offsetMilliseconds": offset_ms,
+                    "durationMilliseconds": duration_ms,
+                    "speaker": speaker,
+                    "text": text,
+                    "confidence": 0.5,
+                    "words": [{"word": text}] if speaker == 2 else [],
+                }
+                for offset_ms, duration_ms, speaker, text in segments
+            ]
+        },
+    )
+    db.session.commit()
+    return file.id
+
+
+def export(file_id, fmt):
+    return "".join(generate_export(file_id, fmt))
+
+
+def test_clock_time():
+    assert clock_time(0) == "00:00:00.000"
+    assert clock_time(3_725_004) == "01:02:05.004"
+    assert clock_time(3_725_004, ",") == "01:02:05,004"
+    assert clock_time(360_000_000) == "100:00:00.000"
+    assert clock_time(1_499.9) == "00:00:01.499"
+
+
+def test_srt_export(file_id):
+    assert export(file_id, "srt") == (
+        "1\n00:00:00,000 --> 00:00:01,500\nSpeaker 1: Hello.\n\n"
+        "2\n00:00:01,500 --> 00:00:02,499\nSpeaker 1: Still me.\n\n"
+        "3\n01:02:05,004 --> 01:02:07,000\nSpeaker 2: Later.\n\n"
+    )
+
+
+def test_vtt_export(file_id):
+    assert export(file_id, "vtt") == (
+        "WEBVTT\n\n"
+        "00:00:00.000 --> 00:00:01.500\n<v Speaker 1>Hello.\n\n"
+        "00:00:01.500 --> 00:00:02.499\n<v Speaker 1>Still me.\n\n"
+        "01:02:05.004 --> 01:02:07.000\n<v Speaker 2>Later.\n\n"
+    )
+
+
+def test_txt_export_groups_speaker_turns(file_id):
+    assert export(file_id, "txt") == (
+        "Speaker 1 [00:00:00.000]\nHello. Still me.\n\n"
+        "Speaker 2 [01:02:05.004]\nLater.\n"
+    )
+
+
+def test_jsonl_export_includes_words(file_id):
+    records = [json.loads(line) for line in export(file_id, "jsonl").splitlines()]
+    assert [record["text"] for record in records] == ["Hello.", "Still me.", "Later."]
+    assert records[0]["words"] == []
+    assert records[2]["words"] == [{"word": "Later."}]
+    assert records[2]["index"] == 0
+
+
+def test_buffered_joins_chunks_up_to_flush_size(monkeypatch):
+    monkeypatch.setattr(transcript_exports, "FLUSH_BYTES", 5)
+    assert list(buffered(["ab", "cd", "ef", "g"])) == ["abcdef", "g"]
+    assert list(buffered([])) == []
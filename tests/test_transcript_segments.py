@@ -0,0 +1,149 @@
+import pytest
+from app.extensions import db
+from app.models.file import File
+from app.services.transcript_segments import (
+    ensure_transcript_segments,
+    query_segment_window,
+    replace_transcript_segments,
+    segment_summary,
+)
+
+
+def segment(offset_ms, duration_ms, text, words=None):
+    return {
+        "offsetMilliseconds": offset_ms,
+        "durationMilliseconds": duration_ms,
+        "speaker": 1,
+        "text": text,
+        "confidence": 0.9,
+        "words": words or [],
+    }
+
+
+@pytest.fixture
+def file_id(app):
+    file = File(filename="meeting.wav", status="completed")
+    db.session.add(file)
+    db.session.commit()
+    replace_transcript_segments(
+        file.id,
+        {
+            "segments": [
+                segment(0, 1000, "a"),
+                segment(1000, 9000, "long", words=[{"word": "long"}]),
+                segment(4000, 1000, "b"),
+                segment(6000, 1000, "c"),
+                segment(12000, 500, "d"),
+            ]
+        },
+    )
+    db.session.commit()
+    return file.id
+
+
+def texts(segments):
+    return [segment["text"] for segment in segments]
+
+
+def test_segment_summary(file_id):
+    assert segment_summary(file_id) == (5, 12500, 9000)
+    assert segment_summary("missing") == (0, 0, 0)
+
+
+def test_window_includes_segments_overlapping_its_start(file_id):
+    segments = query_segment_window(file_id, 5000, 7000, longest_ms=9000)
+    assert texts(segments) == ["long", "c"]
+
+
+def test_window_excludes_segments_ending_at_its_start(file_id):
+    segments = query_segment_window(file_id, 11000, 20000, longest_ms=9000)
+    assert texts(segments) == ["d"]
+    segments = query_segment_window(file_id, 1000, 1500, longest_ms=9000)
+    assert texts(segments) == ["long"]
+
+
+def test_window_end_is_exclusive(file_id):
+    segments = query_segment_window(file_id, 0, 4000, longest_ms=9000)
+    assert texts(segments) == ["a", "long"]
+
+
+def test_window_keeps_zero_length_segments_at_its_start(app, file_id):
+    replace_transcript_segments(file_id, {"segments": [segment(3000, 0, "blip")]})
+    segments = query_segment_window(file_id, 3000, 4000, longest_ms=0)
+    assert texts(segments) == ["blip"]
+
+
+def test_window_segments_match_processed_shape(file_id):
+    (without_words,) = query_segment_window(file_id, 1000, 1001, longest_ms=9000)
+    assert without_words == {
+        "index": 1,
+        "start": "00:01.000",
+        "end": "00:10.000",
+        "offsetMilliseconds": 1000,
+        "durationMilliseconds": 9000,
+        "speaker": 1,
+        "text": "long",
+        "confidence": 0.9,
+        "words": [],
+    }
+    (with_words,) = query_segment_window(
+        file_id, 1000, 1001, longest_ms=9000, include_words=True
+    )
+    assert with_words["words"] == [{"word": "long"}]
+
+
+def test_replace_discards_previous_segments(file_id):
+    assert replace_transcript_segments(file_id, {"segments": []}) == 0
+    assert query_segment_window(file_id, 0, 20000, longest_ms=9000) == []
+
+
+def test_replace_records_the_summary_on_the_file(file_id):
+    file = db.session.get(File, file_id)
+    db.session.refresh(file)
+    assert (file.segment_count, file.segment_duration_ms, file.segment_longest_ms) == (
+        5,
+        12500,
+        9000,
+    )
+
+
+def test_ensure_reads_the_summary_from_the_file_row(file_id):
+    file = db.session.get(File, file_id)
+    db.session.refresh(file)
+
+    def load_processed():
+        raise AssertionError("segments are already stored")
+
+    assert ensure_transcript_segments(file, load_processed) == (5, 12500, 9000)
+
+
+def test_ensure_backfills_a_file_once(app):
+    file = File(filename="old.wav", status="completed")
+    db.session.add(file)
+    db.session.commit()
+    loads = []
+
+    def load_processed():
+        loads.append(1)
+        return {"segments": [segment(0, 1000, "a"), segment(2000, 3000, "b")]}
+
+    assert ensure_transcript_segments(file, load_processed) == (2, 5000, 3000)
+    db.session.refresh(file)
+    assert ensure_transcript_segments(file, load_processed) == (2, 5000, 3000)
+    assert len(loads) == 1
+
+
+def test_ensure_records_an_empty_transcript(app):
+    file = File(filename="silent.wav", status="completed")
+    db.session.add(file)
+    db.session.commit()
+    loads = []
+
+    def load_processed():
+        loads.append(1)
+        return {"segments": []}
+
+    assert ensure_transcript_segments(file, load_processed) == (0, 0, 0)
+    db.session.refresh(file)
+    assert ensure_transcript_segments(file, load_processed) == (0, 0, 0)
+    assert len(loads) == 1
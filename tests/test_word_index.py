@@ -0,0 +1,120 @@
+import pytest
+from app.errors.exceptions import ValidationError
+from app.services.word_index import WordIndex, WordIndexCache, normalize_token
+from app.transcripts.routes import _parse_time_ms
+
+
+def word(text, offset_ms, duration_ms=200):
+    return {
+        "word": text,
+        "offsetMilliseconds": offset_ms,
+        "durationMilliseconds": duration_ms,
+    }
+
+
+PROCESSED = {
+    "segments": [
+        {"words": [word("The", 0), word("cat", 300), word("sat,", 600)]},
+        {"words": [word("the", 1500), word("Cat's", 1800), word("hat", 2100)]},
+        {"words": []},
+        {"words": [word("the", 3000), word("cat", 3300), word("sat", 3600)]},
+    ]
+}
+
+
+def test_normalize_token_ignores_case_and_punctuation():
+    assert normalize_token("Sat,") == "sat"
+    assert normalize_token("'Cat's'") == "cat's"
+    assert normalize_token("--") == ""
+
+
+def test_build_orders_words_by_time():
+    index = WordIndex.build(
+        {"segments": [{"words": [word("b", 500)]}, {"words": [word("a", 100)]}]}
+    )
+    assert index.words == ["a", "b"]
+    assert index.segments == [1, 0]
+
+
+def test_word_at_finds_the_word_spoken_or_last_before_a_pause():
+    index = WordIndex.build(PROCESSED)
+    assert index.word_at(-1) is None
+    assert index.word_at(0) == 0
+    assert index.word_at(650) == 2
+    assert index.word_at(1200) == 2
+    assert index.word_at(1500) == 3
+    assert index.word_at(99_000) == len(index) - 1
+
+
+def test_describe_spans_a_run_of_words():
+    index = WordIndex.build(PROCESSED)
+    assert index.describe(3, 3) == {
+        "index": 3,
+        "text": "the Cat's hat",
+        "offset_ms": 1500,
+        "end_ms": 2300,
+        "segment_index": 1,
+    }
+
+
+def test_find_single_term():
+    index = WordIndex.build(PROCESSED)
+    assert index.find("THE") == ([0, 3, 6], 1)
+    assert index.find("dog") == ([], 1)
+    assert index.find(" ,, ") == ([], 0)
+
+
+def test_find_phrase_matches_consecutive_words_only():
+    index = WordIndex.build(PROCESSED)
+    assert index.find("the cat") == ([0, 6], 2)
+    assert index.find("cat sat") == ([1, 7], 2)
+    assert index.find("sat the") == ([2], 2)
+    assert index.find("the hat") == ([], 2)
+
+
+def test_find_respects_limit():
+    index = WordIndex.build(PROCESSED)
+    assert index.find("the", limit=2) == ([0, 3], 1)
+    assert index.find("the cat sat", limit=1) == ([0], 3)
+
+
+def test_bytes_round_trip():
+    index = WordIndex.build(PROCESSED)
+    restored = WordIndex.from_bytes(index.to_bytes())
+    assert restored.starts == index.starts
+    assert restored.words == index.words
+    assert restored.find("the cat") == index.find("the cat")
+
+
+def test_cache_loads_once_and_evicts_least_recent():
+    cache = WordIndexCache(max_entries=2)
+    payload = WordIndex.build(PROCESSED).to_bytes()
+    loads = []
+
+    def loader():
+        loads.append(1)
+        return payload
+
+    first = cache.get_or_load("a", loader)
+    assert cache.get_or_load("a", loader) is first
+    cache.get_or_load("b", loader)
+    cache.get_or_load("a", loader)
+    cache.get_or_load("c", loader)
+    cache.get_or_load("a", loader)
+    assert len(loads) == 3
+    cache.get_or_load("b", loader)
+    assert len(loads) == 4
+
+
+def test_parse_lookup_time():
+    assert _parse_time_ms("83.5") == 83_500
+    assert _parse_time_ms("01:23:45.5") == 5_025_500
+    assert _parse_time_ms("2:05") == 125_000
+
+
+@pytest.mark.parametrize(
+    "value", ["soon", "-1", "nan", "inf", "-inf", "1e400", "1:nan"]
+)
+def test_parse_lookup_time_rejects_bad_values(value):
+    with pytest.raises(ValidationError):
+        _parse_time_ms(value)
@@ -0,0 +1,68 @@
+import os
+import sys
+import time
+import argparse
+import statistics
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(script_dir)
+sys.path.insert(0, project_root)
+from app import create_app
+
+
+def timed(setup, iterations):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        setup()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def report(label, samples):
+    samples = sorted(samples)
+    p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    print(
+        f"{label:<32} mean {statistics.mean(samples):8.3f} ms  "
+        f"median {statistics.median(samples):8.3f} ms  p95 {p95:8.3f} ms"
+    )
+
+
+def benchmark_task_startup():
+    """
+    Compare the per-task overhead of building a Flask app inside each task
+    with entering the app context of one app built per worker process.
+    """
+    parser = argparse.ArgumentParser(description=benchmark_task_startup.__doc__)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--env", default=os.environ.get("FLASK_ENV", "development"))
+    args = parser.parse_args()
+    print("\n===== Celery Task Startup Overhead =====\n")
+
+    def rebuild_app():
+        app = create_app(args.env)
+        with app.app_context():
+            pass
+
+    worker_app = create_app(args.env)
+
+    def reuse_app():
+        with worker_app.app_context():
+            pass
+
+    # Warm imports so neither side pays for first-time module loading
+    rebuild_app()
+    reuse_app()
+    before = timed(rebuild_app, args.iterations)
+    after = timed(reuse_app, args.iterations)
+    report("create_app per task (before)", before)
+    report("shared app context (after)", after)
+    print(
+        f"\nSaved {statistics.mean(before) - statistics.mean(after):.3f} ms per task "
+        f"over {args.iterations} iterations"
+    )
+    return True
+
+
+if __name__ == "__main__":
+    benchmark_task_startup()
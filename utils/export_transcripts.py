@@ -0,0 +1,64 @@
+import os
+import sys
+import argparse
+from datetime import datetime, timedelta
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(script_dir)
+sys.path.insert(0, project_root)
+from app import create_app
+from app.services.blob_storage import BlobStorageService
+from app.services.bulk_export import bulk_export_query, stream_transcript_archive
+
+
+def parse_date(value):
+    return datetime.strptime(value, "%Y-%m-%d")
+
+
+def export_transcripts():
+    """Write a ZIP archive of transcripts matching the filters"""
+    parser = argparse.ArgumentParser(description="Bulk export transcripts to a ZIP")
+    parser.add_argument("output", help="Archive path, or - for stdout")
+    parser.add_argument("--from", dest="date_from", type=parse_date)
+    parser.add_argument("--to", dest="date_to", type=parse_date)
+    parser.add_argument("--status", default="completed", help="Empty for any")
+    parser.add_argument("--model", help="Model name or ID")
+    parser.add_argument("--user", dest="user_id", help="Only this user's files")
+    parser.add_argument("--include-audio", action="store_true")
+    parser.add_argument("--workers", type=int)
+    args = parser.parse_args()
+    app = create_app()
+    with app.app_context():
+        files = bulk_export_query(
+            date_from=args.date_from,
+            date_to=args.date_to + timedelta(days=1) if args.date_to else None,
+            status=args.status or None,
+            model=args.model,
+            user_id=args.user_id,
+        ).yield_per(100)
+        blob_service = BlobStorageService(
+            connection_string=app.config["AZURE_STORAGE_CONNECTION_STRING"],
+            container_name=app.config["AZURE_STORAGE_CONTAINER"],
+        )
+        archive = stream_transcript_archive(
+            blob_service,
+            files,
+            include_audio=args.include_audio,
+            workers=args.workers or app.config["BULK_EXPORT_WORKERS"],
+            chunk_size=app.config["BULK_EXPORT_CHUNK_BYTES"],
+        )
+        output = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+        written = 0
+        try:
+            for chunk in archive:
+                output.write(chunk)
+                written += len(chunk)
+        finally:
+            if output is not sys.stdout.buffer:
+                output.close()
+        print(f"Wrote {written} bytes to {args.output}", file=sys.stderr)
+        return True
+
+
+if __name__ == "__main__":
+    export_transcripts()
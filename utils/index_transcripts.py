@@ -0,0 +1,53 @@
+import os
+import sys
+import json
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(script_dir)
+sys.path.insert(0, project_root)
+from app import create_app, db
+from app.models.file import File
+from app.models.transcript_segment import TranscriptSegment
+from app.services.blob_storage import BlobStorageService
+from app.services.transcript_artifacts import load_processed_transcript
+from app.services.transcript_search import ensure_search_index
+from app.services.transcript_segments import backfill_transcript_segments
+
+
+def index_transcripts():
+    """Store and index the segments of completed transcripts not yet searchable"""
+    print("\n===== Index Transcripts for Search =====\n")
+    app = create_app()
+    with app.app_context():
+        print(f"Search backend: {ensure_search_index()}")
+        blob_service = BlobStorageService(
+            connection_string=app.config["AZURE_STORAGE_CONNECTION_STRING"],
+            container_name=app.config["AZURE_STORAGE_CONTAINER"],
+        )
+        indexed_ids = db.session.query(TranscriptSegment.file_id).distinct()
+        files = (
+            db.session.query(File)
+            .filter(
+                File.status == "completed",
+                File.transcript_url.isnot(None),
+                File.id.notin_(indexed_ids),
+            )
+            .all()
+        )
+        print(f"{len(files)} transcripts to index")
+        failed = 0
+        for file in files:
+            try:
+                processed = json.loads(load_processed_transcript(blob_service, file))
+                backfill_transcript_segments(file.id, processed)
+                print(f"Indexed {file.filename}")
+            except Exception as e:
+                db.session.rollback()
+                failed += 1
+                print(f"Error indexing {file.filename}: {str(e)}")
+        print(f"\nDone. {len(files) - failed} indexed, {failed} failed.")
+        return failed == 0
+
+
+if __name__ == "__main__":
+    index_transcripts()